@@ -1,34 +1,410 @@
 import json
+import re
+from array import array
+
+import numpy as np
+
 from lib.StarType import StarType
 from lib.Star import Star
 from lib.PlanetType import PlanetType
 from lib.Planet import Planet
-from lib.EllipticalOrbit import EllipticalOrbit
+from lib.EllipticalOrbit import EllipticalOrbit, ORBITAL_ELEMENTS
+from lib.Catalog import Catalog, COLUMN_TYPES, PLANET_TYPES
+from lib import Instrumentation
+
+BINARY_MAGIC = b"ERDCAT02"
+BINARY_ALIGNMENT = 64
+_SECTION = re.compile(r'"(stars|planets)"\s*:\s*\[')
+_ARRAY_TYPECODES = {np.float64: 'd', np.int8: 'b', np.int32: 'i'}
+
 
+def _star_from_data(star):
+    return Star(star['name'], star['mass'], StarType[star['type']], star['AU'])
+
+
+@Instrumentation.timed("load_from_json")
 def load_from_json(config_path):
     with open(config_path, 'r') as file:
         data = json.load(file)
 
-    stars = {star['name']: Star(star['name'], star['mass'], StarType[star['type']], star['AU']) for star in data['stars']}
-    planets = []
+    stars = {star['name']: _star_from_data(star) for star in data['stars']}
+    records = {planet_data['name']: planet_data for planet_data in data['planets']}
+    planets = {}
+
+    def build(planet_data, children=()):
+        # Moons name their parent body as "primary"; parents are built first, whatever the file order
+        name = planet_data['name']
+        if name in planets:
+            return planets[name]
+        primary = planet_data['orbit'].get('primary')
+        if primary is None:
+            primary = stars[planet_data['orbit']['star']]
+        elif primary in children or primary == name:
+            raise ValueError(f"The orbit of {name} forms a cycle.")
+        else:
+            primary = build(records[primary], children + (name,))
 
-    for planet_data in data['planets']:
-        star = stars[planet_data['orbit']['star']]
         orbit = EllipticalOrbit(
             planet_data['orbit']['eccentricity'],
             planet_data['orbit']['semi_major_axis'],
             planet_data['orbit']['perihelion_day'],
             planet_data['orbit']['perihelion_year'],
             planet_data['orbit']['period'],
-            star
+            primary,
+            planet_data['orbit'].get('inclination', 0.0),
+            planet_data['orbit'].get('ascending_node', 0.0),
+            planet_data['orbit'].get('argument_of_perihelion', 0.0)
         )
-        planet = Planet(
+        planets[name] = Planet(
             planet_data['name'],
             planet_data['mass'],
             planet_data['radius'],
             PlanetType[planet_data['type']],
             orbit
         )
-        planets.append(planet)
+        return planets[name]
+
+    return stars, [build(planet_data) for planet_data in data['planets']]
+
+
+@Instrumentation.timed("load_catalog")
+def load_catalog(config_path):
+    """
+    Loads a configuration file into a struct-of-arrays Catalog without building per-body objects.
+
+    :param config_path: Path to a configuration file in the solarsystem.json schema.
+    :return: Tuple (stars, catalog) with stars keyed by name.
+    """
+    with open(config_path, 'r') as file:
+        data = json.load(file)
+
+    stars = {star['name']: _star_from_data(star) for star in data['stars']}
+    star_rows = {name: row for row, name in enumerate(stars)}
+    type_rows = {planet_type.name: row for row, planet_type in enumerate(PLANET_TYPES)}
+    bodies = data['planets']
+
+    columns = {
+        'mass': [planet_data['mass'] for planet_data in bodies],
+        'radius': [planet_data['radius'] for planet_data in bodies],
+        'type': [type_rows[planet_data['type']] for planet_data in bodies],
+    }
+    for name in ORBITAL_ELEMENTS:
+        columns[name] = [planet_data['orbit'].get(name, 0.0) for planet_data in bodies]
+
+    names = [planet_data['name'] for planet_data in bodies]
+    primaries = [planet_data['orbit'].get('primary') for planet_data in bodies]
+    columns['parent'] = _parent_rows(names, primaries)
+    # Moons orbit their parent's star, as in load_from_json, whatever their own record says
+    columns['star'] = _star_rows([None if primary is not None else star_rows[planet_data['orbit']['star']]
+                                  for primary, planet_data in zip(primaries, bodies)], columns['parent'])
+    return stars, Catalog(list(stars.values()), names, columns)
+
+
+def _parent_rows(names, primaries):
+    """
+    Resolves the "primary" names of moons into catalog rows, -1 for bodies orbiting their star.
+    """
+    rows = {name: row for row, name in enumerate(names)}
+    try:
+        return np.array([-1 if primary is None else rows[primary] for primary in primaries], dtype=np.int32)
+    except KeyError as error:
+        raise ValueError(f"Primary {error.args[0]} is not in the catalog.") from None
+
+
+def _star_rows(own_rows, parents):
+    """
+    Resolves the star row of every body: bodies orbiting a star carry their own, moons take their parent's.
+
+    :param own_rows: Star row of each body, None for moons.
+    :param parents: Parent rows as returned by _parent_rows.
+    """
+    rows = np.array([-1 if row is None else row for row in own_rows], dtype=np.int32)
+    moons = np.flatnonzero(parents >= 0)
+    # One level of moons per pass, top-down
+    while moons.size:
+        rows[moons] = rows[parents[moons]]
+        unresolved = moons[rows[moons] < 0]
+        if unresolved.size == moons.size:
+            raise ValueError("The orbits of some bodies form a cycle.")
+        moons = unresolved
+    return rows
+
+
+def _iter_json_records(file, chunk_size):
+    """
+    Incrementally yields ("star" | "planet", record) from a document in the solarsystem.json schema.
+
+    Only one chunk plus the record being decoded is held in memory at a time.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    position = 0
+    section = None
+    exhausted = False
+
+    def fill():
+        nonlocal buffer, position, exhausted
+        chunk = file.read(chunk_size)
+        if not chunk:
+            exhausted = True
+        buffer = buffer[position:] + chunk
+        position = 0
+
+    while True:
+        if section is None:
+            match = _SECTION.search(buffer, position)
+            if match is None:
+                if exhausted:
+                    return
+                # Keep a short tail in case the section key straddles two chunks
+                position = max(len(buffer) - 32, position)
+                fill()
+                continue
+            section = "star" if match.group(1) == "stars" else "planet"
+            position = match.end()
+            continue
+
+        while position < len(buffer) and buffer[position] in " \t\r\n,":
+            position += 1
+        if position >= len(buffer):
+            if exhausted:
+                return
+            fill()
+            continue
+        if buffer[position] == "]":
+            section = None
+            position += 1
+            continue
+
+        try:
+            record, end = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError:
+            if exhausted:
+                raise
+            fill()
+            continue
+        if end == len(buffer) and not exhausted:
+            # A number at the very end of the buffer may continue in the next chunk
+            fill()
+            continue
+        position = end
+        yield section, record
+
+
+def _iter_jsonl_records(file):
+    """
+    Yields ("star" | "planet", record) from a JSON Lines catalog, where star lines carry "kind": "star".
+    """
+    for line in file:
+        line = line.strip()
+        if not line:
+            continue
+        record = json.loads(line)
+        yield ("star" if record.get('kind') == "star" else "planet"), record
+
+
+def iter_records(config_path, chunk_size: int = 1 << 16):
+    """
+    Streams the star and planet records of a JSON (solarsystem.json schema) or JSON Lines (.jsonl) catalog.
+
+    :param config_path: Path to the catalog.
+    :param chunk_size: Characters read per chunk from JSON documents.
+    :return: Generator of ("star" | "planet", record) tuples in file order.
+    """
+    with open(config_path, 'r') as file:
+        if config_path.endswith('.jsonl'):
+            yield from _iter_jsonl_records(file)
+        else:
+            yield from _iter_json_records(file, chunk_size)
+
+
+def iter_bodies(config_path, star=None, planet_type=None):
+    """
+    Streams planet records, filtered while reading.
+
+    :param config_path: Path to a JSON or JSON Lines catalog.
+    :param star: Only yield bodies orbiting the star with this name.
+    :param planet_type: Only yield bodies of this PlanetType.
+    :return: Generator of planet records (dicts).
+    """
+    for kind, record in iter_records(config_path):
+        if kind != "planet":
+            continue
+        if star is not None and record['orbit']['star'] != star:
+            continue
+        if planet_type is not None and record['type'] != planet_type.name:
+            continue
+        yield record
+
+
+@Instrumentation.timed("load_streaming")
+def load_streaming(config_path, star=None, planet_type=None):
+    """
+    Loads a catalog incrementally into a Catalog, keeping peak memory close to the final column size.
+
+    :param config_path: Path to a JSON or JSON Lines catalog.
+    :param star: Only load bodies orbiting the star with this name.
+    :param planet_type: Only load bodies of this PlanetType, together with the bodies they orbit (a moon is
+        positioned relative to its parent). Parents may follow their moons in the file, so the other bodies
+        of the selected systems are read and dropped once the file is done.
+    :return: Tuple (stars, catalog) with stars keyed by name.
+    """
+    stars = {}
+    star_rows = {}
+    type_rows = {planet_type.name: row for row, planet_type in enumerate(PLANET_TYPES)}
+    names = []
+    primaries = []
+    own_stars = []
+    columns = {name: array(_ARRAY_TYPECODES[dtype]) for name, dtype in COLUMN_TYPES.items()
+               if name not in ('parent', 'star')}
+
+    for kind, record in iter_records(config_path):
+        if kind == "star":
+            stars[record['name']] = _star_from_data(record)
+            continue
+
+        orbit = record['orbit']
+        primary = orbit.get('primary')
+        # Moons take their parent's star, known only once the file is done
+        if star is not None and primary is None and orbit['star'] != star:
+            continue
+        names.append(record['name'])
+        columns['mass'].append(record['mass'])
+        columns['radius'].append(record['radius'])
+        columns['type'].append(type_rows[record['type']])
+        # Stars may follow the planets in the file, so rows are assigned on first sight
+        own_stars.append(None if primary is not None else star_rows.setdefault(orbit['star'], len(star_rows)))
+        primaries.append(primary)
+        for name in ORBITAL_ELEMENTS:
+            columns[name].append(orbit.get(name, 0.0))
+
+    ordered_stars = [None] * len(star_rows)
+    for name, row in star_rows.items():
+        ordered_stars[row] = stars[name]
+    arrays = {name: np.frombuffer(column, dtype=COLUMN_TYPES[name]) for name, column in columns.items()}
+    selected = None
+    if star is not None:
+        # Moons of the other systems were read; keep those whose parents are in the selected one
+        selected = _with_ancestors(names, primaries)
+        arrays = {name: column[selected] for name, column in arrays.items()}
+        names = [name for name, keep in zip(names, selected) if keep]
+        primaries = [primary for primary, keep in zip(primaries, selected) if keep]
+        own_stars = [row for row, keep in zip(own_stars, selected) if keep]
+    # Parents may follow their moons in the file, so they are resolved once every name is known
+    arrays['parent'] = _parent_rows(names, primaries)
+    arrays['star'] = _star_rows(own_stars, arrays['parent'])
+    catalog = Catalog(ordered_stars, np.array(names), arrays)
+    if planet_type is not None:
+        catalog = catalog.select(_with_parents(arrays['type'] == type_rows[planet_type.name], arrays['parent']))
+    return stars, catalog
+
+
+def _with_ancestors(names, primaries):
+    """
+    Returns a boolean mask of the bodies whose chain of primaries is loaded, up to a body orbiting a star.
+    """
+    rows = {name: row for row, name in enumerate(names)}
+    resolved = {}
+
+    def keep(row, seen=()):
+        if row not in resolved:
+            primary = primaries[row]
+            resolved[row] = primary is None or (primary in rows and rows[primary] not in seen and
+                                                keep(rows[primary], seen + (row,)))
+        return resolved[row]
+
+    return np.array([keep(row) for row in range(len(names))], dtype=bool)
+
+
+def _with_parents(selected, parents):
+    """
+    Extends a boolean row selection with the parents of every selected row, up to the bodies orbiting a star.
+    """
+    selected = selected.copy()
+    rows = np.flatnonzero(selected)
+    while rows.size:
+        rows = parents[rows]
+        rows = rows[rows >= 0]
+        rows = rows[~selected[rows]]
+        selected[rows] = True
+    return selected
+
+
+def _binary_dtype(name_width):
+    return np.dtype([('name', f'<U{max(name_width, 1)}')] +
+                    [(name, np.dtype(dtype).newbyteorder('<')) for name, dtype in COLUMN_TYPES.items()])
+
+
+def save_binary_catalog(stars, catalog, binary_path):
+    """
+    Writes a catalog in the compact binary format: a JSON header (stars, dtype, row count) followed by
+    one aligned structured array that load_binary_catalog memory-maps.
+
+    :param stars: Dict of Star instances keyed by name.
+    :param catalog: The Catalog to write.
+    :param binary_path: Destination path.
+    """
+    width = max((len(str(name)) for name in catalog.names), default=1)
+    dtype = _binary_dtype(width)
+    rows = np.empty(len(catalog), dtype=dtype)
+    rows['name'] = catalog.names
+    for name, column in catalog.columns.items():
+        rows[name] = column
+
+    star_rows = {star.name: row for row, star in enumerate(catalog.stars)}
+    header = {
+        'stars': [
+            {'name': star.name, 'mass': star.mass, 'type': star.type.name, 'AU': star.au_in_km}
+            for star in sorted(stars.values(), key=lambda star: star_rows.get(star.name, len(star_rows)))
+        ],
+        'catalog_stars': len(catalog.stars),
+        'name_width': width,
+        'count': len(catalog),
+    }
+    encoded = json.dumps(header).encode()
+    offset = len(BINARY_MAGIC) + 8 + len(encoded)
+    padding = -offset % BINARY_ALIGNMENT
+
+    with open(binary_path, 'wb') as file:
+        file.write(BINARY_MAGIC)
+        file.write(np.uint64(len(encoded) + padding).tobytes())
+        file.write(encoded + b" " * padding)
+        file.write(rows.tobytes())
+
+
+@Instrumentation.timed("load_binary_catalog")
+def load_binary_catalog(binary_path):
+    """
+    Memory-maps a catalog written by save_binary_catalog; columns are read lazily from the file.
+
+    :param binary_path: Path to the binary catalog.
+    :return: Tuple (stars, catalog) with stars keyed by name.
+    """
+    with open(binary_path, 'rb') as file:
+        if file.read(len(BINARY_MAGIC)) != BINARY_MAGIC:
+            raise ValueError(f"{binary_path} is not a binary catalog.")
+        header_size = int(np.frombuffer(file.read(8), dtype='<u8')[0])
+        header = json.loads(file.read(header_size))
+
+    offset = len(BINARY_MAGIC) + 8 + header_size
+    dtype = _binary_dtype(header['name_width'])
+    if header['count']:
+        rows = np.memmap(binary_path, dtype=dtype, mode='r', offset=offset, shape=(header['count'],))
+    else:
+        rows = np.empty(0, dtype=dtype)
+
+    star_list = [_star_from_data(star) for star in header['stars']]
+    stars = {star.name: star for star in star_list}
+    columns = {name: rows[name] for name in COLUMN_TYPES}
+    return stars, Catalog(star_list[:header['catalog_stars']], rows['name'], columns)
+
+
+def convert_to_binary(config_path, binary_path):
+    """
+    Converts a JSON or JSON Lines catalog into the binary format by streaming it.
 
-    return stars, planets
+    :param config_path: Source catalog in the solarsystem.json schema (or JSON Lines).
+    :param binary_path: Destination path.
+    """
+    stars, catalog = load_streaming(config_path)
+    save_binary_catalog(stars, catalog, binary_path)
@@ -0,0 +1,228 @@
+"""
+Reproducible benchmarks for the orbit, approach-search, catalog-loading and mission hot paths.
+
+    python benchmarks/run.py                          # run and write benchmarks/results.json
+    python benchmarks/run.py --save-baseline          # also store the run as the baseline
+    python benchmarks/run.py --baseline benchmarks/baseline.json --threshold 0.15
+
+With a baseline, every case slower than baseline * (1 + threshold) is reported as a regression and the
+script exits with status 1.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import Config  # noqa: E402
+from lib import Epoch  # noqa: E402
+from lib.Rocket import MissionCalculator  # noqa: E402
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CONFIG_PATH = os.path.join(ROOT, "config", "solarsystem.json")
+DEFAULT_OUTPUT = os.path.join(ROOT, "benchmarks", "results.json")
+DEFAULT_BASELINE = os.path.join(ROOT, "benchmarks", "baseline.json")
+
+
+def measure(function, repeat):
+    """
+    Returns (best_seconds, peak_bytes): the fastest of several timed runs and the peak traced
+    allocation of one extra run.
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    function()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return min(timings), peak
+
+
+def write_synthetic_catalog(path, count, seed=0):
+    """
+    Writes a catalog of count bodies in the solarsystem.json schema with random main-belt-like orbits.
+    """
+    rng = np.random.default_rng(seed)
+    semi_major_axis = rng.uniform(2.0, 3.3, count)
+    with open(CONFIG_PATH, 'r') as file:
+        stars = json.load(file)['stars']
+
+    with open(path, 'w') as file:
+        file.write('{"stars": ' + json.dumps(stars) + ', "planets": [')
+        for i in range(count):
+            body = {
+                "name": f"Body{i}",
+                "mass": 1e-9,
+                "radius": 0.001,
+                "type": "DWARF_PLANET",
+                "orbit": {
+                    "eccentricity": float(rng.uniform(0.0, 0.3)),
+                    "semi_major_axis": float(semi_major_axis[i]),
+                    "perihelion_day": float(rng.uniform(0, 365)),
+                    "perihelion_year": 2024,
+                    "period": float(365.25 * semi_major_axis[i] ** 1.5),
+                    "inclination": float(rng.uniform(0, 20)),
+                    "ascending_node": float(rng.uniform(0, 360)),
+                    "argument_of_perihelion": float(rng.uniform(0, 360)),
+                    "star": stars[0]['name'],
+                },
+            }
+            file.write(("," if i else "") + json.dumps(body))
+        file.write("]}")
+
+
+def build_cases(catalog_sizes, workdir):
+    """
+    Returns a list of (name, function, operations_per_call, unit, prepare). prepare is None or a callable
+    run once, untimed, before the case is measured, so inputs such as synthetic catalogs are only built
+    for the cases that are selected.
+    """
+    stars, planets = Config.load_from_json(CONFIG_PATH)
+    bodies = {planet.name: planet for planet in planets}
+    earth = bodies["Earth"]
+
+    scalar_calls = 10_000
+    batch_days, batch_years = Epoch.from_days(Epoch.to_days(1, 2025) + np.linspace(0, 100_000, 1_000_000))
+
+    def scalar_distance():
+        orbit = earth.orbit
+        for step in range(scalar_calls):
+            orbit.get_distance(step % 365, 2025)
+
+    cases = [
+        ("orbit.get_distance[scalar]", scalar_distance, scalar_calls, "calls"),
+        ("orbit.get_distances[batch]", lambda: earth.orbit.get_distances(batch_days, batch_years), batch_days.size, "epochs"),
+    ]
+
+    # The searches of find_closest_distance (the longer period at one-minute tolerance), from a fixed epoch
+    # rather than today so that every run measures the same workload
+    for first, second in (("Earth", "Mars"), ("Earth", "Neptune"), ("Uranus", "Neptune")):
+        span = max(bodies[first].period, bodies[second].period)
+        cases.append((f"planet.find_closest_approach[{first}-{second}]",
+                      lambda first=bodies[first], second=bodies[second], span=span:
+                      first.find_closest_approach(second, 1, 2025, span, 1.0 / 1440), 1, "searches"))
+
+    # A long, finely sampled window, searched in-process and sharded across every core
+    uranus, neptune = bodies["Uranus"], bodies["Neptune"]
+    long_window = 10 * neptune.period
+    workers = os.cpu_count() or 1
+    cases += [
+        ("planet.find_local_minima[Uranus-Neptune,serial]",
+         lambda: uranus.find_local_minima(neptune, 1, 2025, long_window, coarse_steps_per_orbit=8192), 1, "searches"),
+        (f"planet.find_local_minima[Uranus-Neptune,workers={workers}]",
+         lambda: uranus.find_local_minima(neptune, 1, 2025, long_window, coarse_steps_per_orbit=8192, workers=workers),
+         1, "searches"),
+    ]
+
+    cases = [case + (None,) for case in cases]
+
+    for count in catalog_sizes:
+        path = os.path.join(workdir, f"catalog_{count}.json")
+
+        def prepare(path=path, count=count):
+            if not os.path.exists(path):
+                write_synthetic_catalog(path, count)
+
+        cases.append((f"config.load_from_json[{count}]", lambda path=path: Config.load_from_json(path), count, "bodies",
+                       prepare))
+
+    mission = MissionCalculator(distance_au=0.524, fuel_mass_kg=8000, dry_mass_kg=15500, fuel_type="liquid", sustained_accel=0.2)
+    mission_calls = 10_000
+
+    def mission_time():
+        for _ in range(mission_calls):
+            mission.calculate_mission_time()
+
+    cases.append(("mission.calculate_mission_time", mission_time, mission_calls, "missions", None))
+    return cases
+
+
+def compare(results, baseline, threshold):
+    """
+    Returns the list of (name, ratio) for cases slower than the baseline by more than the threshold.
+    """
+    regressions = []
+    for name, result in results.items():
+        reference = baseline.get("results", {}).get(name)
+        if reference is None:
+            continue
+        ratio = result["seconds"] / reference["seconds"]
+        result["baseline_ratio"] = ratio
+        if ratio > 1.0 + threshold:
+            regressions.append((name, ratio))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the calculation hot paths.")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="Where to write the JSON results.")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline results to compare against.")
+    parser.add_argument("--save-baseline", action="store_true", help="Store this run as the baseline.")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Allowed slowdown before failing (0.10 = 10%%).")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per case; the fastest is kept.")
+    parser.add_argument("--catalog-sizes", type=int, nargs="*", default=[10, 10_000, 1_000_000],
+                        help="Synthetic catalog sizes for the loader benchmark.")
+    parser.add_argument("--workdir", default=os.path.join(tempfile.gettempdir(), "expanse_benchmarks"),
+                        help="Directory for generated synthetic catalogs (reused across runs).")
+    parser.add_argument("--filter", default=None, help="Only run cases whose name contains this text.")
+    args = parser.parse_args(argv)
+
+    os.makedirs(args.workdir, exist_ok=True)
+    results = {}
+    for name, function, operations, unit, prepare in build_cases(args.catalog_sizes, args.workdir):
+        if args.filter and args.filter not in name:
+            continue
+        if prepare is not None:
+            prepare()
+        seconds, peak = measure(function, args.repeat)
+        results[name] = {
+            "seconds": seconds,
+            "throughput": operations / seconds if seconds else float("inf"),
+            "unit": f"{unit}/s",
+            "peak_bytes": peak,
+        }
+        print(f"{name:<48} {seconds * 1000:10.3f} ms {results[name]['throughput']:14,.0f} {unit}/s "
+              f"{peak / 1e6:10.2f} MB peak")
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+
+    status = 0
+    if not args.save_baseline and os.path.exists(args.baseline):
+        with open(args.baseline, 'r') as file:
+            regressions = compare(results, json.load(file), args.threshold)
+        for name, ratio in regressions:
+            print(f"REGRESSION {name}: {ratio:.2f}x baseline (threshold {1 + args.threshold:.2f}x)")
+        report["regressions"] = [name for name, _ in regressions]
+        status = 1 if regressions else 0
+
+    with open(args.output, 'w') as file:
+        json.dump(report, file, indent=4)
+    if args.save_baseline:
+        with open(args.baseline, 'w') as file:
+            json.dump(report, file, indent=4)
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
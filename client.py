@@ -0,0 +1,34 @@
+import json
+import sys
+from urllib.error import HTTPError
+from urllib.parse import urlencode
+from urllib.request import urlopen
+
+from server import DEFAULT_HOST, DEFAULT_PORT
+
+
+def query(endpoint: str, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, timeout: float = 600, **params) -> dict:
+    """
+    Sends one query to a running server.py.
+
+        query("closest", origin="Earth", destination="Mars")
+
+    :param endpoint: "distance", "closest", "mission", "bodies", "systems" or "stats".
+    :param params: Query parameters, e.g. origin, destination, start_day, span_days.
+    :return: The decoded JSON result.
+    """
+    url = f"http://{host}:{port}/{endpoint}"
+    if params:
+        url += "?" + urlencode(params)
+    try:
+        with urlopen(url, timeout=timeout) as response:
+            return json.load(response)
+    except HTTPError as error:
+        raise ValueError(json.load(error).get("error", str(error))) from None
+
+
+if __name__ == "__main__":
+    # python client.py closest origin=Earth destination=Mars
+    if len(sys.argv) < 2:
+        sys.exit("usage: client.py <endpoint> [name=value ...]")
+    print(json.dumps(query(sys.argv[1], **dict(argument.split("=", 1) for argument in sys.argv[2:])), indent=4))
@@ -0,0 +1,119 @@
+import math
+
+import numpy as np
+
+INV_PHI = (math.sqrt(5) - 1) / 2
+
+
+def golden_section_minimize(f, lo, hi, tolerance):
+    """
+    Refines many brackets at once with golden-section search.
+
+    Every bracket advances together, so each iteration costs a single vectorized call to f. A bracket
+    stops moving once it is narrower than the tolerance, so its result does not depend on the others.
+
+    :param f: Function taking an array of times and returning an array of values.
+    :param lo: Array of bracket lower bounds.
+    :param hi: Array of bracket upper bounds.
+    :param tolerance: Width below which a bracket is considered converged.
+    :return: Tuple (x, f(x)) of arrays with the refined minima.
+    """
+    lo = np.array(lo, dtype=np.float64)
+    hi = np.array(hi, dtype=np.float64)
+    c = hi - INV_PHI * (hi - lo)
+    d = lo + INV_PHI * (hi - lo)
+    fc = f(c)
+    fd = f(d)
+
+    active = (hi - lo) > tolerance
+    while active.any():
+        left = fc < fd
+        step_left = active & left
+        step_right = active & ~left
+        hi = np.where(step_left, d, hi)
+        lo = np.where(step_right, c, lo)
+
+        # Only one new point per bracket: the other interior point is reused
+        x_new = np.where(left, hi - INV_PHI * (hi - lo), lo + INV_PHI * (hi - lo))
+        f_new = f(x_new)
+        c, d, fc, fd = (
+            np.where(step_left, x_new, np.where(step_right, d, c)),
+            np.where(step_left, c, np.where(step_right, x_new, d)),
+            np.where(step_left, f_new, np.where(step_right, fd, fc)),
+            np.where(step_left, fc, np.where(step_right, f_new, fd)),
+        )
+        active = (hi - lo) > tolerance
+
+    best_left = fc < fd
+    return np.where(best_left, c, d), np.where(best_left, fc, fd)
+
+
+def bracket_minima(values):
+    """
+    Returns the indices of local minima on a sampled grid, including minima at either end.
+
+    :param values: 1-D array of sampled values.
+    :return: Array of indices i where values[i] is a local minimum.
+    """
+    values = np.asarray(values)
+    if values.size < 2:
+        return np.arange(values.size)
+
+    interior = np.flatnonzero((values[1:-1] <= values[:-2]) & (values[1:-1] < values[2:])) + 1
+    edges = []
+    if values[0] < values[1]:
+        edges.append(0)
+    if values[-1] < values[-2]:
+        edges.append(values.size - 1)
+    return np.sort(np.concatenate([interior, np.array(edges, dtype=interior.dtype)]))
+
+
+def coarse_grid(start, stop, coarse_step):
+    """
+    Returns the coarse grid find_local_minima brackets on: evenly spaced, no coarser than coarse_step.
+    """
+    count = max(int(math.ceil((stop - start) / coarse_step)), 1)
+    return np.linspace(start, stop, count + 1)
+
+
+def shard_minima(f, grid, first, last, tolerance):
+    """
+    Finds the local minima of f whose coarse-grid index lies in [first, last).
+
+    Only the owned points and one neighbour on each side are sampled, so shards covering a grid
+    find every minimum exactly once (including minima on shard boundaries), with the same result as
+    searching the whole grid.
+
+    :param f: Function taking an array of times and returning an array of values.
+    :param grid: The coarse grid, or a slice of it holding the owned points and their neighbours.
+    :param first: First owned index into grid.
+    :param last: End (exclusive) of the owned indices.
+    :param tolerance: Time tolerance of the refined minima.
+    :return: Tuple (times, values) of arrays, ordered by time.
+    """
+    low, high = max(first - 1, 0), min(last + 1, grid.size)
+    indices = bracket_minima(f(grid[low:high])) + low
+    # The neighbours only decide the owned points; the grid's own ends are still candidates
+    indices = indices[(indices >= first) & (indices < last)]
+
+    lo = grid[np.maximum(indices - 1, 0)]
+    hi = grid[np.minimum(indices + 1, grid.size - 1)]
+    return golden_section_minimize(f, lo, hi, tolerance)
+
+
+def find_local_minima(f, start, stop, coarse_step, tolerance):
+    """
+    Finds every local minimum of f in [start, stop].
+
+    f is sampled on a coarse grid to bracket the minima, then each bracket is refined with
+    golden-section search to the requested tolerance.
+
+    :param f: Function taking an array of times and returning an array of values.
+    :param start: Start of the search window.
+    :param stop: End of the search window.
+    :param coarse_step: Grid spacing used to bracket the minima.
+    :param tolerance: Time tolerance of the refined minima.
+    :return: Tuple (times, values) of arrays, ordered by time.
+    """
+    grid = coarse_grid(start, stop, coarse_step)
+    return shard_minima(f, grid, 0, grid.size, tolerance)
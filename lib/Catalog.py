@@ -0,0 +1,349 @@
+import numpy as np
+
+from lib.PlanetType import PlanetType
+from lib.Planet import Body
+from lib.EllipticalOrbit import Orbit, ORBITAL_ELEMENTS, orbital_positions, orbital_states
+from lib import Instrumentation
+
+PLANET_TYPES = list(PlanetType)
+
+# Typed column layout of a catalog; "name" is stored as a fixed-width unicode column
+COLUMN_TYPES = {
+    "mass": np.float64,
+    "radius": np.float64,
+    "type": np.int8,
+    "star": np.int32,
+    # Row of the parent body for moons, -1 for bodies orbiting their star
+    "parent": np.int32,
+    **{name: np.float64 for name in ORBITAL_ELEMENTS},
+}
+
+
+class CatalogOrbit(Orbit):
+    __slots__ = ("_catalog", "_index")
+
+    def __init__(self, catalog, index: int):
+        """
+        A lightweight view of one orbit stored in a Catalog.
+
+        :param catalog: The Catalog holding the orbital elements.
+        :param index: Row of the body in the catalog.
+        """
+        self._catalog = catalog
+        self._index = index
+
+    @property
+    def eccentricity(self): return float(self._catalog.columns["eccentricity"][self._index])
+
+    @property
+    def semi_major_axis(self): return float(self._catalog.columns["semi_major_axis"][self._index])
+
+    @property
+    def star(self): return self._catalog.stars[self._catalog.columns["star"][self._index]]
+
+    @property
+    def parent(self):
+        row = self._catalog.columns["parent"][self._index]
+        return None if row < 0 else CatalogPlanet(self._catalog, int(row))
+
+    @property
+    def primary(self):
+        parent = self.parent
+        return self.star if parent is None else parent
+
+    @property
+    def perihelion_day(self): return float(self._catalog.columns["perihelion_day"][self._index])
+
+    @property
+    def perihelion_year(self): return float(self._catalog.columns["perihelion_year"][self._index])
+
+    @property
+    def period(self): return float(self._catalog.columns["period"][self._index])
+
+    @property
+    def inclination(self): return float(self._catalog.columns["inclination"][self._index])
+
+    @property
+    def ascending_node(self): return float(self._catalog.columns["ascending_node"][self._index])
+
+    @property
+    def argument_of_perihelion(self): return float(self._catalog.columns["argument_of_perihelion"][self._index])
+
+
+class CatalogPlanet(Body):
+    __slots__ = ("_catalog", "_index")
+
+    def __init__(self, catalog, index: int):
+        """
+        A lightweight view of one body stored in a Catalog.
+
+        :param catalog: The Catalog holding the body.
+        :param index: Row of the body in the catalog.
+        """
+        self._catalog = catalog
+        self._index = index
+
+    @property
+    def index(self): return self._index
+
+    @property
+    def name(self): return str(self._catalog.names[self._index])
+
+    @property
+    def mass(self): return float(self._catalog.columns["mass"][self._index])
+
+    @property
+    def radius(self): return float(self._catalog.columns["radius"][self._index])
+
+    @property
+    def star(self): return self._catalog.stars[self._catalog.columns["star"][self._index]]
+
+    @property
+    def type(self): return PLANET_TYPES[self._catalog.columns["type"][self._index]]
+
+    @property
+    def orbit(self): return CatalogOrbit(self._catalog, self._index)
+
+
+class Catalog:
+    def __init__(self, stars: list, names, columns: dict):
+        """
+        Initializes a struct-of-arrays catalog of bodies.
+
+        Every attribute lives in one contiguous typed array; indexing the catalog returns CatalogPlanet
+        views, so the Planet API keeps working without one Python object per body.
+
+        :param stars: List of Star instances referenced by the "star" column.
+        :param names: Array of body names.
+        :param columns: Dict of arrays keyed like COLUMN_TYPES, one entry per body.
+        """
+        self._stars = list(stars)
+        self._names = np.asarray(names)
+        self._columns = {name: np.asarray(columns[name], dtype=dtype) for name, dtype in COLUMN_TYPES.items()}
+        self._index = None
+        self._depths = None
+        self._systems = None
+
+    def __len__(self):
+        return len(self._names)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [CatalogPlanet(self, i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("Catalog index out of range.")
+        return CatalogPlanet(self, index)
+
+    def __iter__(self):
+        return (CatalogPlanet(self, i) for i in range(len(self)))
+
+    def __repr__(self):
+        return f"Catalog({len(self)} bodies, {len(self._stars)} stars)"
+
+    @property
+    def stars(self): return self._stars
+
+    @property
+    def names(self): return self._names
+
+    @property
+    def columns(self): return self._columns
+
+    @property
+    def elements(self):
+        """
+        Orbital element arrays in the argument order of orbital_positions.
+        """
+        return tuple(self._columns[name] for name in ORBITAL_ELEMENTS)
+
+    @property
+    def depths(self):
+        """
+        Nesting depth of every body: 0 for bodies orbiting their star, 1 for their moons, and so on.
+        """
+        if self._depths is None:
+            parents = self._columns["parent"]
+            depths = np.zeros(len(self), dtype=np.int32)
+            current = parents.astype(np.int64)
+            nested = current >= 0
+            while nested.any():
+                depths[nested] += 1
+                if depths.max() > len(self):
+                    raise ValueError("Catalog parents form a cycle.")
+                current[nested] = parents[current[nested]]
+                nested = current >= 0
+            self._depths = depths
+        return self._depths
+
+    @property
+    def nbytes(self):
+        return self._names.nbytes + sum(column.nbytes for column in self._columns.values())
+
+    def index_of(self, name: str) -> int:
+        """
+        Returns the row of a body by name.
+        """
+        if self._index is None:
+            self._index = {str(body): i for i, body in enumerate(self._names)}
+        return self._index[name]
+
+    def find(self, name: str) -> CatalogPlanet:
+        """
+        Returns the view of a body by name.
+        """
+        return CatalogPlanet(self, self.index_of(name))
+
+    def select(self, rows) -> "Catalog":
+        """
+        Returns a new catalog holding only the given rows (indices or boolean mask).
+
+        Moons must be selected together with their parents.
+        """
+        rows = np.arange(len(self))[rows]
+        remap = np.full(len(self), -1, dtype=np.int64)
+        remap[rows] = np.arange(rows.size)
+        parents = self._columns["parent"][rows]
+        nested = parents >= 0
+        if np.any(remap[parents[nested]] < 0):
+            raise ValueError("Moons must be selected together with their parents.")
+
+        columns = {name: column[rows] for name, column in self._columns.items()}
+        columns["parent"] = np.where(nested, remap[parents], -1)
+        return Catalog(self._stars, self._names[rows], columns)
+
+    def partition(self) -> dict:
+        """
+        Splits the catalog into one catalog per star system, so each system can be evaluated on its own.
+
+        Moons orbit their parent's star, so every system is closed under parents.
+
+        :return: Dict of Catalogs keyed by star name, in star order; stars without bodies are left out.
+        """
+        if self._systems is None:
+            star_rows = self._columns["star"]
+            self._systems = {star.name: self.select(star_rows == row) for row, star in enumerate(self._stars)
+                             if np.any(star_rows == row)}
+        return self._systems
+
+    def compose(self, positions) -> np.ndarray:
+        """
+        Turns positions relative to each body's primary into positions relative to the star, in place.
+
+        Levels are added top-down, so every parent is already absolute when its moons read it and is
+        evaluated once for all of them.
+
+        :param positions: Array of shape (len(catalog), ..., 3) with primary-relative positions.
+        :return: The same array, now relative to the star.
+        """
+        depths = self.depths
+        parents = self._columns["parent"]
+        for depth in range(1, int(depths.max(initial=0)) + 1):
+            rows = np.flatnonzero(depths == depth)
+            positions[rows] += positions[parents[rows]]
+        return positions
+
+    def get_positions(self, days_of_year, years) -> np.ndarray:
+        """
+        Returns the positions of every body for arrays of epochs in one vectorized pass.
+
+        All orbits are solved together and moons are then offset by their parents' rows, so a planet
+        with many moons is evaluated once per batch.
+
+        :param days_of_year: Day(s) of the year (0-365), scalar or array.
+        :param years: Year(s), broadcastable against days_of_year.
+        :return: Array of shape (len(catalog), *epoch_shape, 3) with positions relative to the star (in AU).
+        """
+        epochs = np.broadcast(np.asarray(days_of_year), np.asarray(years))
+        if Instrumentation.enabled:
+            Instrumentation.count_rows(self._names, epochs=epochs.size)
+        expand = (slice(None),) + (None,) * epochs.ndim
+        return self.compose(orbital_positions(*(element[expand] for element in self.elements), days_of_year, years))
+
+    def get_body_positions(self, rows, days_of_year, years) -> np.ndarray:
+        """
+        Returns the position of body rows[k] at epoch k, e.g. to refine many pairs at different times at once.
+
+        :param rows: Array of catalog rows.
+        :param days_of_year: Day(s) of the year (0-365), broadcastable against rows.
+        :param years: Year(s), broadcastable against rows.
+        :return: Array of shape (..., 3) with positions relative to the star (in AU).
+        """
+        rows, days_of_year, years = np.broadcast_arrays(rows, days_of_year, years)
+        elements = self.elements
+        parents = self._columns["parent"]
+        positions = orbital_positions(*(element[rows] for element in elements), days_of_year, years)
+        if Instrumentation.enabled:
+            Instrumentation.count_rows(self._names, rows)
+
+        current = parents[rows]
+        nested = current >= 0
+        while nested.any():
+            if Instrumentation.enabled:
+                Instrumentation.count_rows(self._names, current[nested])
+            positions[nested] += orbital_positions(*(element[current[nested]] for element in elements),
+                                                   days_of_year[nested], years[nested])
+            current = np.where(nested, parents[np.maximum(current, 0)], -1)
+            nested = current >= 0
+        return positions
+
+    def get_body_states(self, rows, days_of_year, years) -> tuple:
+        """
+        Returns the position and velocity of body rows[k] at epoch k, like get_body_positions.
+
+        :return: Tuple (positions, velocities) of arrays of shape (..., 3) relative to the star (in AU and AU per day).
+        """
+        rows, days_of_year, years = np.broadcast_arrays(rows, days_of_year, years)
+        elements = self.elements
+        parents = self._columns["parent"]
+        positions, velocities = orbital_states(*(element[rows] for element in elements), days_of_year, years)
+        if Instrumentation.enabled:
+            Instrumentation.count_rows(self._names, rows)
+
+        current = parents[rows]
+        nested = current >= 0
+        while nested.any():
+            if Instrumentation.enabled:
+                Instrumentation.count_rows(self._names, current[nested])
+            parent_positions, parent_velocities = orbital_states(*(element[current[nested]] for element in elements),
+                                                                 days_of_year[nested], years[nested])
+            positions[nested] += parent_positions
+            velocities[nested] += parent_velocities
+            current = np.where(nested, parents[np.maximum(current, 0)], -1)
+            nested = current >= 0
+        return positions, velocities
+
+    @classmethod
+    def from_planets(cls, planets) -> "Catalog":
+        """
+        Builds a catalog from Planet objects.
+
+        Parents of moons that are missing from planets are appended after them, so the first
+        len(planets) rows always match the list.
+        """
+        planets = list(planets)
+        rows = {planet.name: row for row, planet in enumerate(planets)}
+        for planet in planets:
+            parent = planet.parent
+            if parent is not None and parent.name not in rows:
+                rows[parent.name] = len(planets)
+                planets.append(parent)
+
+        stars = []
+        star_rows = []
+        for planet in planets:
+            if planet.star not in stars:
+                stars.append(planet.star)
+            star_rows.append(stars.index(planet.star))
+
+        columns = {
+            "mass": [planet.mass for planet in planets],
+            "radius": [planet.radius for planet in planets],
+            "type": [PLANET_TYPES.index(planet.type) for planet in planets],
+            "star": star_rows,
+            "parent": [-1 if planet.parent is None else rows[planet.parent.name] for planet in planets],
+        }
+        for name in ORBITAL_ELEMENTS:
+            columns[name] = [getattr(planet.orbit, name) for planet in planets]
+        return cls(stars, [planet.name for planet in planets], columns)
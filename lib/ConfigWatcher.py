@@ -0,0 +1,161 @@
+import os
+from collections import OrderedDict
+
+
+def body_signature(planet) -> tuple:
+    """
+    Returns everything a body's derived results depend on: its own properties and orbit, the orbits of
+    its parents (moons are positioned relative to them) and its star.
+    """
+    star = planet.star
+    parent = planet.parent
+    return (planet.name, planet.mass, planet.radius, planet.type.name, planet.orbit.elements,
+            (star.name, star.mass, star.type.name, star.au_in_km),
+            None if parent is None else body_signature(parent))
+
+
+def changed_bodies(old_planets, new_planets) -> set:
+    """
+    Diffs two loads of a configuration by body name.
+
+    :param old_planets: Planets of the previous load.
+    :param new_planets: Planets of the new load.
+    :return: Names of bodies that were added, removed or changed, including moons of changed bodies and
+        bodies of changed stars.
+    """
+    old = {planet.name: body_signature(planet) for planet in old_planets}
+    new = {planet.name: body_signature(planet) for planet in new_planets}
+    return {name for name in old.keys() | new.keys() if old.get(name) != new.get(name)}
+
+
+class ResultCache:
+    def __init__(self, max_entries: int = None):
+        """
+        Initializes a cache of derived results indexed by the bodies they depend on, so that a change to
+        one body drops only its own results (O(N) of N^2 pairwise results).
+
+        :param max_entries: Number of results kept, with LRU eviction; None keeps everything.
+        """
+        self._max_entries = max_entries
+        self._results = OrderedDict()
+        self._bodies = {}
+        self._dependents = {}
+
+    def __len__(self):
+        return len(self._results)
+
+    def __contains__(self, key):
+        return key in self._results
+
+    def get(self, key, default=None):
+        if key not in self._results:
+            return default
+        self._results.move_to_end(key)
+        return self._results[key]
+
+    def put(self, key, bodies, value):
+        """
+        Stores a result.
+
+        :param key: Any hashable key.
+        :param bodies: Names of the bodies the result depends on.
+        :param value: The result.
+        """
+        self._discard(key)
+        self._results[key] = value
+        self._bodies[key] = tuple(bodies)
+        for name in self._bodies[key]:
+            self._dependents.setdefault(name, set()).add(key)
+        while self._max_entries is not None and len(self._results) > self._max_entries:
+            self._discard(next(iter(self._results)))
+
+    def _discard(self, key):
+        if key not in self._bodies:
+            return
+        del self._results[key]
+        for name in self._bodies.pop(key):
+            dependents = self._dependents[name]
+            dependents.discard(key)
+            if not dependents:
+                del self._dependents[name]
+
+    def invalidate(self, names) -> int:
+        """
+        Drops every result that depends on any of the named bodies.
+
+        :return: Number of results dropped.
+        """
+        keys = set().union(*(self._dependents.get(name, ()) for name in names))
+        for key in keys:
+            self._discard(key)
+        return len(keys)
+
+    def clear(self):
+        self._results.clear()
+        self._bodies.clear()
+        self._dependents.clear()
+
+
+class ConfigWatcher:
+    def __init__(self, config_path, loader):
+        """
+        Loads a configuration file and reloads it when it changes on disk.
+
+        :param config_path: Configuration file to watch.
+        :param loader: Function returning (stars, planets) for a path, e.g. Config.load_from_json.
+        """
+        self._path = config_path
+        self._loader = loader
+        self._stamp = self._read_stamp()
+        self._stars, self._planets = loader(config_path)
+        self._version = 0
+        self._error = None
+
+    @property
+    def path(self): return self._path
+
+    @property
+    def stars(self): return self._stars
+
+    @property
+    def planets(self): return self._planets
+
+    @property
+    def version(self): return self._version
+
+    @property
+    def error(self): return self._error
+
+    def _read_stamp(self):
+        status = os.stat(self._path)
+        return status.st_mtime_ns, status.st_size
+
+    def poll(self) -> set:
+        """
+        Reloads the file if its modification time or size changed since the last load.
+
+        A file that fails to load (e.g. saved half-way through an edit) leaves the previous bodies in
+        place and is retried on its next change; the failure is kept in error.
+
+        :return: Names of the bodies whose derived results are stale (see changed_bodies); empty when
+            nothing changed.
+        """
+        try:
+            stamp = self._read_stamp()
+        except OSError:
+            return set()
+        if stamp == self._stamp:
+            return set()
+        self._stamp = stamp
+
+        try:
+            stars, planets = self._loader(self._path)
+        except (OSError, ValueError, KeyError) as error:
+            self._error = error
+            return set()
+        self._error = None
+
+        changed = changed_bodies(self._planets, planets)
+        self._stars, self._planets = stars, planets
+        self._version += 1
+        return changed
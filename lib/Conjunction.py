@@ -0,0 +1,207 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from lib import ApproachSearch, Epoch, Instrumentation
+from lib.Catalog import Catalog
+
+# Per-process state installed by _init_worker so the ephemeris table is shipped once per worker
+_worker_state = {}
+
+
+def as_catalog(planets) -> Catalog:
+    """
+    Returns planets as a Catalog, converting a list of Planet instances (parents of moons are appended).
+    """
+    return planets if isinstance(planets, Catalog) else Catalog.from_planets(planets)
+
+
+def sample_ephemeris(catalog, start, stop, step):
+    """
+    Samples every orbit once on a shared time grid.
+
+    :param catalog: Catalog of the bodies, e.g. as returned by as_catalog.
+    :param start: First absolute day of the grid.
+    :param stop: Last absolute day of the grid.
+    :param step: Grid spacing (in days).
+    :return: Tuple (grid, table) where table[i, k] is the x, y, z position of body i at grid[k].
+    """
+    grid = Epoch.time_grid(start, stop, step)
+    return grid, catalog.get_positions(*Epoch.from_days(grid))
+
+
+def _separations(catalog, first, second, days):
+    """
+    Evaluates the distance between bodies first[k] and second[k] at days[k].
+    """
+    days_of_year, years = Epoch.from_days(days)
+    p_first = catalog.get_body_positions(first, days_of_year, years)
+    p_second = catalog.get_body_positions(second, days_of_year, years)
+    return np.linalg.norm(p_first - p_second, axis=-1)
+
+
+def _closest_for_rows(rows, grid, table, catalog, tolerance, candidates):
+    """
+    Computes the closest approach of body i to every body j > i for each i in rows.
+
+    The coarse minima come from the shared table; only the best few candidates per pair are refined.
+    """
+    first, second, lo, hi = [], [], [], []
+    for i in rows:
+        others = np.arange(i + 1, table.shape[0])
+        if not others.size:
+            continue
+        values = np.linalg.norm(table[i] - table[others], axis=-1)
+
+        # Local minima on the coarse grid, including the window edges
+        is_minimum = np.zeros(values.shape, dtype=bool)
+        is_minimum[:, 1:-1] = (values[:, 1:-1] <= values[:, :-2]) & (values[:, 1:-1] < values[:, 2:])
+        is_minimum[:, 0] = values[:, 0] < values[:, 1]
+        is_minimum[:, -1] = values[:, -1] < values[:, -2]
+        masked = np.where(is_minimum, values, np.inf)
+
+        count = min(candidates, masked.shape[1])
+        best = np.argpartition(masked, count - 1, axis=1)[:, :count]
+        valid = np.isfinite(np.take_along_axis(masked, best, axis=1))
+        pair = np.broadcast_to(others[:, None], best.shape)[valid]
+        index = best[valid]
+
+        first.append(np.full(pair.size, i))
+        second.append(pair)
+        lo.append(grid[np.maximum(index - 1, 0)])
+        hi.append(grid[np.minimum(index + 1, grid.size - 1)])
+
+    if not first:
+        return np.empty(0, dtype=int), np.empty(0, dtype=int), np.empty(0), np.empty(0)
+
+    first, second = np.concatenate(first), np.concatenate(second)
+    times, distances = ApproachSearch.golden_section_minimize(
+        lambda days: _separations(catalog, first, second, days), np.concatenate(lo), np.concatenate(hi), tolerance
+    )
+    return first, second, times, distances
+
+
+def _init_worker(grid, table, catalog, tolerance, candidates):
+    _worker_state.update(grid=grid, table=table, catalog=catalog, tolerance=tolerance, candidates=candidates)
+
+
+def _run_worker(rows):
+    state = _worker_state
+    return _closest_for_rows(rows, state["grid"], state["table"], state["catalog"], state["tolerance"], state["candidates"])
+
+
+@Instrumentation.timed("closest_approach_matrix")
+def closest_approach_matrix(planets, start_day: float, start_year: int, span_days: float, tolerance: float = 1e-3,
+                            coarse_steps_per_orbit: int = 64, candidates: int = 3, workers: int = None,
+                            cache=None) -> tuple:
+    """
+    Computes the closest approach between every pair of planets inside a date window.
+
+    Each orbit is sampled exactly once on a shared grid (a fraction of the shortest period in the
+    catalog); every pair's coarse minima are read from that table and the best candidates are refined
+    with golden-section search.
+
+    :param planets: List of Planet instances, e.g. as loaded by Config.load_from_json, or a Catalog.
+    :param start_day: Day of the year the window starts on.
+    :param start_year: Year the window starts in.
+    :param span_days: Length of the window (in days).
+    :param tolerance: Time tolerance (in days) of each refined approach.
+    :param coarse_steps_per_orbit: Coarse samples per orbit of the fastest planet.
+    :param candidates: Number of coarse minima refined per pair.
+    :param workers: Number of worker processes; None or 1 computes everything in-process.
+    :param cache: Optional EphemerisCache the per-orbit tables are read from and stored in.
+    :return: Tuple (distances, days_of_year, years) of N x N arrays, symmetric, NaN on the diagonal.
+    :raises ValueError: If the planets orbit more than one star.
+    """
+    catalog = as_catalog(planets)
+    count = len(planets)
+    if np.unique(catalog.columns["star"][:count]).size > 1:
+        raise ValueError("Bodies of different star systems share no frame; use closest_approach_by_system.")
+    if count == 0:
+        return (np.empty((0, 0)), *Epoch.from_days(np.empty((0, 0))))
+    start = float(Epoch.to_days(start_day, start_year))
+    step = np.min(catalog.columns["period"]) / coarse_steps_per_orbit
+    if cache is None:
+        grid, table = sample_ephemeris(catalog, start, start + span_days, step)
+    else:
+        # Cached tables are relative to each primary; moons are offset by their parents afterwards
+        tables = [cache.get_table(body.orbit, start, start + span_days, step) for body in catalog]
+        grid, table = tables[0][0], catalog.compose(np.stack([positions for _, positions in tables]))
+    # Parents appended for composition are not part of the matrix
+    table = table[:count]
+
+    rows = np.arange(count)
+    if workers is None or workers <= 1:
+        results = [_closest_for_rows(rows, grid, table, catalog, tolerance, candidates)]
+    else:
+        # Interleave rows so every chunk carries a similar number of pairs
+        chunks = [rows[offset::workers * 4] for offset in range(workers * 4)]
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(grid, table, catalog, tolerance, candidates)) as executor:
+            results = list(executor.map(_run_worker, chunks))
+
+    first, second, pair_times, pair_distances = (np.concatenate(parts) for parts in zip(*results))
+    # Keep the best refined candidate for each pair: sort by pair, then distance, and take each pair's first entry
+    order = np.lexsort((pair_distances, second, first))
+    _, best = np.unique(first[order] * count + second[order], return_index=True)
+    best = order[best]
+
+    distances = np.full((count, count), np.inf)
+    times = np.full((count, count), np.nan)
+    distances[first[best], second[best]] = pair_distances[best]
+    times[first[best], second[best]] = pair_times[best]
+
+    # Pairs without a minimum in the window (a constant separation) take it at the start, as in
+    # Body.find_closest_approach
+    upper = np.triu(np.ones((count, count), dtype=bool), 1)
+    missing_first, missing_second = np.nonzero(upper & np.isinf(distances))
+    distances[missing_first, missing_second] = np.linalg.norm(table[missing_first, 0] - table[missing_second, 0], axis=-1)
+    times[missing_first, missing_second] = grid[0]
+
+    distances = np.fmin(distances, distances.T)
+    times = np.where(np.isnan(times), times.T, times)
+    np.fill_diagonal(distances, np.nan)
+    days_of_year, years = Epoch.from_days(times)
+    return distances, days_of_year, years
+
+
+def _run_system(name, catalog, arguments):
+    return name, closest_approach_matrix(catalog, *arguments)
+
+
+@Instrumentation.timed("closest_approach_by_system")
+def closest_approach_by_system(planets, start_day: float, start_year: int, span_days: float, tolerance: float = 1e-3,
+                               coarse_steps_per_orbit: int = 64, candidates: int = 3, workers: int = None,
+                               cache=None) -> dict:
+    """
+    Computes the closest approach matrix of every star system in a catalog separately.
+
+    Bodies of different systems never share a matrix, so the cost follows the size of each system
+    rather than the whole catalog, and every system (its own ephemeris and refinement, with a grid
+    step set by its own fastest orbit) is an independent shard for a worker pool.
+
+    :param planets: List of Planet instances or a Catalog, spanning any number of stars.
+    :param start_day: Day of the year the window starts on.
+    :param start_year: Year the window starts in.
+    :param span_days: Length of the window (in days).
+    :param tolerance: Time tolerance (in days) of each refined approach.
+    :param coarse_steps_per_orbit: Coarse samples per orbit of each system's fastest body.
+    :param candidates: Number of coarse minima refined per pair.
+    :param workers: Number of worker processes, one system per task; None or 1 computes everything in-process.
+    :param cache: Optional EphemerisCache, used when the systems are computed in-process.
+    :return: Dict keyed by star name of tuples (names, distances, days_of_year, years), where the
+        arrays are as returned by closest_approach_matrix for that system's bodies.
+    """
+    systems = as_catalog(planets).partition()
+    arguments = (start_day, start_year, span_days, tolerance, coarse_steps_per_orbit, candidates)
+    if workers is None or workers <= 1:
+        results = [_run_system(name, system, arguments + (None, cache)) for name, system in systems.items()]
+    else:
+        # Largest systems first, so one big system does not start last and hold up the pool
+        order = sorted(systems, key=lambda name: -len(systems[name]))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(_run_system, name, systems[name], arguments) for name in order]
+            results = [future.result() for future in futures]
+
+    matrices = dict(results)
+    return {name: (systems[name].names, *matrices[name]) for name in systems}
@@ -1,91 +1,216 @@
 import math
 
-class EllipticalOrbit:
-    def __init__(self, eccentricity, semi_major_axis, perihelion_day, perihelion_year, period, star):
-        """
-        Initializes an elliptical orbit.
+import numpy as np
 
-        :param eccentricity: The orbital eccentricity (e).
-        :param semi_major_axis: Semi-major axis of the orbit (in AU).
-        :param perihelion_day: Day of the perihelion in the specified perihelion_year.
-        :param perihelion_year: Year of the perihelion event.
-        :param period: Orbital period (in Earth days).
-        :param star: The star around which the object orbits (must have a name attribute).
-        """
-        self._eccentricity = eccentricity
-        self._semi_major_axis = semi_major_axis
-        self._star = star
-        self._perihelion_day = perihelion_day
-        self._perihelion_year = perihelion_year
-        self._period = period
+from lib import Instrumentation
+from lib.Star import Star
+from lib.Kepler import solve_kepler, solve_kepler_scalar, perifocal_to_heliocentric
+
+# Orbital elements in the argument order of orbital_positions
+ORBITAL_ELEMENTS = ("eccentricity", "semi_major_axis", "perihelion_day", "perihelion_year", "period",
+                    "inclination", "ascending_node", "argument_of_perihelion")
+
+
+def mean_anomalies(perihelion_day, perihelion_year, period, days_of_year, years):
+    """
+    Evaluates mean anomalies (radians) for arrays of orbital elements and epochs.
+
+    :return: Array of mean anomalies, unwrapped.
+    """
+    return _mean_anomaly(perihelion_day, perihelion_year, np.asarray(period, dtype=np.float64),
+                         np.asarray(days_of_year, dtype=np.float64), np.asarray(years, dtype=np.float64))
+
+
+def _mean_anomaly(perihelion_day, perihelion_year, period, days_of_year, years):
+    # Plain arithmetic shared by the float and array paths; total elapsed days since the last perihelion
+    days_elapsed = (years - perihelion_year) * 365 + (days_of_year - perihelion_day)
+
+    # Mean motion (radians per day)
+    n = 2.0 * math.pi / period
+    return n * days_elapsed
+
+
+def _radius(semi_major_axis, eccentricity, cos_eccentric_anomaly):
+    # r = a * (1 - e * cos(E)), for floats or arrays
+    return semi_major_axis * (1 - eccentricity * cos_eccentric_anomaly)
+
+
+def orbital_distances(eccentricity, semi_major_axis, perihelion_day, perihelion_year, period, days_of_year, years):
+    """
+    Evaluates orbital distances for arrays of orbital elements and epochs in one vectorized pass.
+
+    Every argument may be a scalar or an array; they are broadcast together, so one call can
+    evaluate many orbits at many epochs.
+
+    The distance follows from the eccentric anomaly E of Kepler's equation:
+        r = a * (1 - e * cos(E))
+
+    :return: Array of distances from the star (in AU).
+    """
+    M = mean_anomalies(perihelion_day, perihelion_year, period, days_of_year, years)
+    e = np.asarray(eccentricity, dtype=np.float64)
+    E, _, _ = solve_kepler(M, e)
+    if Instrumentation.enabled:
+        Instrumentation.count("kernel_evaluations", "orbital_distances", E.size)
+    return _radius(np.asarray(semi_major_axis, dtype=np.float64), e, np.cos(E))
+
+
+def orbital_positions(eccentricity, semi_major_axis, perihelion_day, perihelion_year, period, inclination,
+                      ascending_node, argument_of_perihelion, days_of_year, years, initial_guess=None,
+                      method: str = "newton", return_solution: bool = False):
+    """
+    Evaluates positions for arrays of orbital elements and epochs in one vectorized pass.
+
+    Arguments broadcast together like orbital_distances; the angular elements are in degrees.
+
+    :param initial_guess: Optional warm start for the eccentric anomaly, e.g. the solution of the
+        previous timestep.
+    :param method: Kepler iteration, "newton" or "halley".
+    :param return_solution: Also return a dict with the eccentric anomaly, the iteration count and
+        the worst-case residual of the Kepler solve.
+    :return: Array of shape (..., 3) with x, y, z positions (in AU), optionally with the solution dict.
+    """
+    M = mean_anomalies(perihelion_day, perihelion_year, period, days_of_year, years)
+    a = np.asarray(semi_major_axis, dtype=np.float64)
+    e = np.asarray(eccentricity, dtype=np.float64)
+    E, iterations, max_residual = solve_kepler(M, e, initial_guess=initial_guess, method=method)
+    if Instrumentation.enabled:
+        Instrumentation.count("kernel_evaluations", "orbital_positions", E.size)
+        Instrumentation.count("kepler_iterations", "orbital_positions", iterations)
+
+    x = a * (np.cos(E) - e)
+    y = a * np.sqrt(1 - e**2) * np.sin(E)
+    positions = perifocal_to_heliocentric(x, y, np.radians(inclination), np.radians(ascending_node),
+                                          np.radians(argument_of_perihelion))
+    if return_solution:
+        return positions, {"eccentric_anomaly": E, "iterations": iterations, "max_residual": max_residual}
+    return positions
+
+
+def orbital_states(eccentricity, semi_major_axis, perihelion_day, perihelion_year, period, inclination,
+                   ascending_node, argument_of_perihelion, days_of_year, years):
+    """
+    Evaluates positions and velocities for arrays of orbital elements and epochs in one vectorized pass.
+
+    Arguments broadcast together like orbital_positions. Both come from one Kepler solve; with
+    dE/dt = n / (1 - e * cos(E)) the perifocal velocity is
+        vx = -a * sin(E) * dE/dt,  vy = a * sqrt(1 - e^2) * cos(E) * dE/dt
+
+    :return: Tuple (positions, velocities) of arrays of shape (..., 3), in AU and AU per day.
+    """
+    M = mean_anomalies(perihelion_day, perihelion_year, period, days_of_year, years)
+    a = np.asarray(semi_major_axis, dtype=np.float64)
+    e = np.asarray(eccentricity, dtype=np.float64)
+    E, _, _ = solve_kepler(M, e)
+    if Instrumentation.enabled:
+        Instrumentation.count("kernel_evaluations", "orbital_states", E.size)
+
+    angles = (np.radians(inclination), np.radians(ascending_node), np.radians(argument_of_perihelion))
+    rate = 2.0 * math.pi / np.asarray(period, dtype=np.float64) / (1 - e * np.cos(E))
+    positions = perifocal_to_heliocentric(a * (np.cos(E) - e), a * np.sqrt(1 - e**2) * np.sin(E), *angles)
+    velocities = perifocal_to_heliocentric(-a * np.sin(E) * rate, a * np.sqrt(1 - e**2) * np.cos(E) * rate, *angles)
+    return positions, velocities
+
+
+class Orbit:
+    """
+    Behaviour shared by every orbit. The methods only read the orbital element properties and primary,
+    which subclasses provide: EllipticalOrbit stores them, Catalog.CatalogOrbit reads them from catalog
+    columns. Without slots of its own, views stay as small as their own fields.
+    """
+    __slots__ = ()
 
     def __str__(self):
-        return f"An elliptical orbit around {self._star.name}."
+        return f"An elliptical orbit around {self.primary.name}."
 
     def __repr__(self):
-        return f"EllipticalOrbit({self._star})"
+        return f"EllipticalOrbit({self.primary})"
 
     def __eq__(self, other):
         return (
             self.eccentricity == other.eccentricity and 
-            self._semi_major_axis == other.semi_major_axis and
-            self._perihelion_day == other.perihelion_day and
-            self._perihelion_year == other.perihelion_year
+            self.semi_major_axis == other.semi_major_axis and
+            self.perihelion_day == other.perihelion_day and
+            self.perihelion_year == other.perihelion_year and
+            self.inclination == other.inclination and
+            self.ascending_node == other.ascending_node and
+            self.argument_of_perihelion == other.argument_of_perihelion
         )
 
     @property
-    def eccentricity(self): return self._eccentricity
-
-    @property
-    def semi_major_axis(self): return self._semi_major_axis
-
-    @property
-    def star(self): return self._star
-
-    @property
-    def perihelion_day(self): return self._perihelion_day
+    def parent(self):
+        """
+        The Planet this orbit is around, or None when it orbits a star directly.
+        """
+        return None if isinstance(self.primary, Star) else self.primary
 
     @property
-    def perihelion_year(self): return self._perihelion_year
+    def star(self):
+        """
+        The star of the system, found through the parents for moons.
+        """
+        parent = self.parent
+        return self.primary if parent is None else parent.star
 
     @property
-    def period(self): return self._period
+    def elements(self): return tuple(getattr(self, name) for name in ORBITAL_ELEMENTS)
 
     def get_distance(self, day_of_year: float, year: int) -> float:
         """
-        Returns the orbital distance (in AU) from the star at a given day of the year and year.
+        Returns the orbital distance (in AU) from the primary at a given day of the year and year.
 
-        The formula for distance in an elliptical orbit:
-            r(theta) = a * (1 - e^2) / (1 + e * cos(theta))
+        Scalar counterpart of get_distances. It shares the mean anomaly and radius steps with the batch
+        path but solves Kepler's equation with plain floats (solve_kepler_scalar), as numpy's per-call
+        overhead would make a single evaluation about 20x slower.
 
         :param day_of_year: Day of the year (0–365).
         :param year: The calendar year for which the distance is calculated.
-        :return: Distance from the star (in AU).
+        :return: Distance from the primary (in AU).
         """
+        mean_anomaly = _mean_anomaly(self.perihelion_day, self.perihelion_year, self.period, day_of_year, year)
+        E = solve_kepler_scalar(mean_anomaly, self.eccentricity)
+        return _radius(self.semi_major_axis, self.eccentricity, math.cos(E))
 
-        # Calculate the total elapsed days since the last perihelion
-        days_elapsed = (year - self.perihelion_year) * 365 + (day_of_year - self.perihelion_day)
+    def get_distances(self, days_of_year, years) -> np.ndarray:
+        """
+        Returns the orbital distances (in AU) from the primary for arrays of epochs in one vectorized pass.
 
-        # Mean motion (radians per day)
-        n = 2.0 * math.pi / self.period
+        The distance follows from the eccentric anomaly E of Kepler's equation:
+            r = a * (1 - e * cos(E))
 
-        # Orbital angle in radians from perihelion
-        theta = n * days_elapsed
+        :param days_of_year: Day(s) of the year (0–365), scalar or array.
+        :param years: Calendar year(s), scalar or array broadcastable against days_of_year.
+        :return: Array of distances from the primary (in AU), shaped like the broadcast inputs.
+        """
+        return orbital_distances(self.eccentricity, self.semi_major_axis, self.perihelion_day,
+                                 self.perihelion_year, self.period, days_of_year, years)
 
-        # Compute distance using the orbital equation
-        a = self._semi_major_axis
-        e = self._eccentricity
-        r = a * (1 - e**2) / (1 + e * math.cos(theta))
-        return r
+    def get_positions(self, days_of_year, years, initial_guess=None, method: str = "newton",
+                      return_solution: bool = False):
+        """
+        Returns the positions (in AU) relative to the primary for arrays of epochs in one vectorized pass.
+
+        :param days_of_year: Day(s) of the year (0–365), scalar or array.
+        :param years: Calendar year(s), broadcastable against days_of_year.
+        :param initial_guess: Optional warm start for the eccentric anomaly, e.g. the solution of the
+            previous timestep.
+        :param method: Kepler iteration, "newton" or "halley".
+        :param return_solution: Also return the Kepler solution (eccentric anomaly, iterations, max residual).
+        :return: Array of shape (..., 3) with x, y, z positions, optionally with the solution dict.
+        """
+        return orbital_positions(self.eccentricity, self.semi_major_axis, self.perihelion_day,
+                                 self.perihelion_year, self.period, self.inclination, self.ascending_node,
+                                 self.argument_of_perihelion, days_of_year, years, initial_guess=initial_guess,
+                                 method=method, return_solution=return_solution)
 
     def get_closest_approach(self):
         """
         Returns a tuple of (perihelion_day, perihelion_year, distance) for the perihelion.
         """
-        a = self._semi_major_axis
-        e = self._eccentricity
-        day = self._perihelion_day
-        year = self._perihelion_year
+        a = self.semi_major_axis
+        e = self.eccentricity
+        day = self.perihelion_day
+        year = self.perihelion_year
         distance = a * (1 - e)  # Perihelion distance
         return day, year, distance
 
@@ -94,16 +219,73 @@ class EllipticalOrbit:
         Returns a tuple of (day_of_year, year, distance) for the aphelion.
         Aphelion is approximately half an orbital period (in days) after perihelion.
         """
-        a = self._semi_major_axis
-        e = self._eccentricity
+        a = self.semi_major_axis
+        e = self.eccentricity
         # Aphelion occurs about half an orbital period after perihelion
         aphelion_elapsed_days = self.period / 2.0
 
         # Calculate the aphelion date
-        total_days = self._perihelion_day + aphelion_elapsed_days
+        total_days = self.perihelion_day + aphelion_elapsed_days
         year_increment = int(total_days // 365)
         aphelion_day = total_days % 365
 
-        year = self._perihelion_year + year_increment
+        year = self.perihelion_year + year_increment
         distance = a * (1 + e)  # Aphelion distance
-        return aphelion_day, year, distance
\ No newline at end of file
+        return aphelion_day, year, distance
+
+
+class EllipticalOrbit(Orbit):
+    __slots__ = ("_eccentricity", "_semi_major_axis", "_primary", "_perihelion_day", "_perihelion_year", "_period",
+                 "_inclination", "_ascending_node", "_argument_of_perihelion")
+
+    def __init__(self, eccentricity, semi_major_axis, perihelion_day, perihelion_year, period, primary,
+                 inclination=0.0, ascending_node=0.0, argument_of_perihelion=0.0):
+        """
+        Initializes an elliptical orbit.
+
+        :param eccentricity: The orbital eccentricity (e).
+        :param semi_major_axis: Semi-major axis of the orbit (in AU).
+        :param perihelion_day: Day of the perihelion in the specified perihelion_year.
+        :param perihelion_year: Year of the perihelion event.
+        :param period: Orbital period (in Earth days).
+        :param primary: The Star, or the Planet for moons, around which the object orbits.
+        :param inclination: Inclination to the reference plane (in degrees).
+        :param ascending_node: Longitude of the ascending node (in degrees).
+        :param argument_of_perihelion: Argument of perihelion (in degrees).
+        """
+        self._eccentricity = eccentricity
+        self._semi_major_axis = semi_major_axis
+        self._primary = primary
+        self._perihelion_day = perihelion_day
+        self._perihelion_year = perihelion_year
+        self._period = period
+        self._inclination = inclination
+        self._ascending_node = ascending_node
+        self._argument_of_perihelion = argument_of_perihelion
+
+    @property
+    def eccentricity(self): return self._eccentricity
+
+    @property
+    def semi_major_axis(self): return self._semi_major_axis
+
+    @property
+    def primary(self): return self._primary
+
+    @property
+    def perihelion_day(self): return self._perihelion_day
+
+    @property
+    def perihelion_year(self): return self._perihelion_year
+
+    @property
+    def period(self): return self._period
+
+    @property
+    def inclination(self): return self._inclination
+
+    @property
+    def ascending_node(self): return self._ascending_node
+
+    @property
+    def argument_of_perihelion(self): return self._argument_of_perihelion
@@ -0,0 +1,184 @@
+import hashlib
+import os
+from collections import OrderedDict
+
+import numpy as np
+
+from lib import Epoch
+
+
+def interpolation_error_bound(orbit, step: float) -> float:
+    """
+    Returns the worst-case position error (in AU) of linear interpolation between samples.
+
+    Linear interpolation errs by at most step^2 / 8 * max|x''|. In a Keplerian orbit the acceleration
+    is mu / r^2 with mu = n^2 * a^3, largest at perihelion r = a * (1 - e), which gives
+        error <= step^2 / 8 * n^2 * a / (1 - e)^2
+
+    :param orbit: The EllipticalOrbit being sampled.
+    :param step: Sample spacing (in days).
+    :return: Upper bound on the interpolation error (in AU).
+    """
+    n = 2.0 * np.pi / orbit.period
+    return step**2 / 8.0 * n**2 * orbit.semi_major_axis / (1.0 - orbit.eccentricity) ** 2
+
+
+def config_hash(config_path) -> str:
+    """
+    Returns a short hash of a configuration file's contents, used to namespace persisted tables.
+    """
+    with open(config_path, 'rb') as file:
+        return hashlib.sha256(file.read()).hexdigest()[:16]
+
+
+class EphemerisCache:
+    def __init__(self, max_entries: int = 64, cache_dir=None, config_path=None, max_disk_bytes: int = 256 << 20):
+        """
+        Initializes a cache of sampled position tables.
+
+        Tables are keyed by (orbital elements, epoch range, step), held in memory with LRU eviction and,
+        when cache_dir is given, persisted as .npy files that warm runs memory-map instead of recomputing.
+        Persisted tables are evicted least recently used first, across every namespace in cache_dir, so
+        tables of earlier configurations go before those still in use.
+
+        :param max_entries: Number of tables kept in memory.
+        :param cache_dir: Directory for persisted tables; None keeps the cache in memory only.
+        :param config_path: Configuration file whose content hash namespaces the persisted tables.
+        :param max_disk_bytes: Size bound of cache_dir; None lets it grow without bound.
+        """
+        self._max_entries = max_entries
+        self._max_disk_bytes = max_disk_bytes
+        self._tables = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._cache_dir = cache_dir
+        self._directory = None
+        if cache_dir is not None:
+            namespace = config_hash(config_path) if config_path is not None else "default"
+            self._directory = os.path.join(cache_dir, namespace)
+            os.makedirs(self._directory, exist_ok=True)
+            self.prune()
+
+    def __len__(self):
+        return len(self._tables)
+
+    @property
+    def hits(self): return self._hits
+
+    @property
+    def misses(self): return self._misses
+
+    @property
+    def directory(self): return self._directory
+
+    @staticmethod
+    def key(orbit, start: float, stop: float, step: float) -> tuple:
+        return tuple(float(element) for element in orbit.elements) + (float(start), float(stop), float(step))
+
+    def _path(self, key):
+        digest = hashlib.sha256(repr(key).encode()).hexdigest()[:32]
+        return os.path.join(self._directory, f"{digest}.npy")
+
+    def _remember(self, key, table):
+        self._tables[key] = table
+        self._tables.move_to_end(key)
+        while len(self._tables) > self._max_entries:
+            self._tables.popitem(last=False)
+
+    def get_table(self, orbit, start: float, stop: float, step: float) -> tuple:
+        """
+        Returns the sampled positions of an orbit, computing them only on a cold miss.
+
+        :param orbit: The EllipticalOrbit to sample.
+        :param start: First absolute day (see Epoch.to_days).
+        :param stop: Last absolute day.
+        :param step: Maximum sample spacing (in days).
+        :return: Tuple (grid, positions) with positions of shape (len(grid), 3).
+        """
+        grid = Epoch.time_grid(start, stop, step)
+        key = self.key(orbit, start, stop, step)
+
+        table = self._tables.get(key)
+        if table is not None:
+            self._hits += 1
+            self._tables.move_to_end(key)
+            return grid, table
+
+        path = self._path(key) if self._directory is not None else None
+        if path is not None and os.path.exists(path):
+            self._hits += 1
+            table = np.load(path, mmap_mode='r')
+            # The modification time orders persisted tables by last use for prune
+            os.utime(path)
+        else:
+            self._misses += 1
+            table = orbit.get_positions(*Epoch.from_days(grid))
+            if path is not None:
+                # Write to a temporary file first so readers never see a partial table
+                temporary = f"{path}.{os.getpid()}.tmp"
+                with open(temporary, 'wb') as file:
+                    np.save(file, table)
+                os.replace(temporary, path)
+                self.prune()
+
+        self._remember(key, table)
+        return grid, table
+
+    def get_positions(self, orbit, days, start: float, stop: float, step: float):
+        """
+        Returns positions at arbitrary absolute days by linear interpolation in the cached table.
+
+        The error is bounded by interpolation_error_bound(orbit, step); days outside [start, stop]
+        are clamped to the table ends.
+
+        :param orbit: The EllipticalOrbit to look up.
+        :param days: Absolute day(s), scalar or array.
+        :param start: First absolute day of the table.
+        :param stop: Last absolute day of the table.
+        :param step: Maximum sample spacing of the table (in days).
+        :return: Array of shape (..., 3) with interpolated positions.
+        """
+        grid, table = self.get_table(orbit, start, stop, step)
+        days = np.clip(np.asarray(days, dtype=np.float64), grid[0], grid[-1])
+        spacing = grid[1] - grid[0] if grid.size > 1 else 1.0
+        index = np.clip(((days - grid[0]) / spacing).astype(np.int64), 0, max(grid.size - 2, 0))
+        weight = ((days - grid[index]) / spacing)[..., None]
+        upper = np.minimum(index + 1, grid.size - 1)
+        return table[index] * (1.0 - weight) + table[upper] * weight
+
+    def prune(self) -> int:
+        """
+        Deletes the least recently used persisted tables until cache_dir fits in max_disk_bytes, and
+        namespace directories left empty.
+
+        :return: Number of tables deleted.
+        """
+        if self._cache_dir is None or self._max_disk_bytes is None:
+            return 0
+        files = []
+        for namespace in os.scandir(self._cache_dir):
+            if namespace.is_dir():
+                files.extend((entry.stat().st_mtime_ns, entry.stat().st_size, entry.path)
+                             for entry in os.scandir(namespace.path) if entry.name.endswith(".npy"))
+        total = sum(size for _, size, _ in files)
+        deleted = 0
+        for _, size, path in sorted(files):
+            if total <= self._max_disk_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                # Pruned by another process sharing the directory
+                pass
+            total -= size
+            deleted += 1
+        for namespace in os.scandir(self._cache_dir):
+            if namespace.is_dir() and namespace.path != self._directory and not os.listdir(namespace.path):
+                os.rmdir(namespace.path)
+        return deleted
+
+    def clear(self):
+        """
+        Drops the in-memory tables; persisted tables are kept.
+        """
+        self._tables.clear()
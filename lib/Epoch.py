@@ -0,0 +1,49 @@
+from datetime import datetime
+
+import numpy as np
+
+DAYS_PER_YEAR = 365
+
+
+def to_days(day_of_year, year):
+    """
+    Converts (day_of_year, year) epochs into absolute days on the 365-day calendar used by the orbits.
+
+    :param day_of_year: Day(s) of the year (0-365), scalar or array.
+    :param year: Year(s), broadcastable against day_of_year.
+    :return: Absolute day number(s).
+    """
+    return np.asarray(year, dtype=np.float64) * DAYS_PER_YEAR + np.asarray(day_of_year, dtype=np.float64)
+
+
+def from_days(days):
+    """
+    Converts absolute day numbers back into (day_of_year, year) arrays.
+
+    :param days: Absolute day number(s), scalar or array.
+    :return: Tuple (day_of_year, year) of arrays.
+    """
+    days = np.asarray(days, dtype=np.float64)
+    year = np.floor_divide(days, DAYS_PER_YEAR)
+    return days - year * DAYS_PER_YEAR, year
+
+
+def time_grid(start, stop, step):
+    """
+    Returns an evenly spaced grid of absolute days covering [start, stop] with at most the given step.
+
+    :param start: First absolute day.
+    :param stop: Last absolute day.
+    :param step: Maximum spacing (in days).
+    :return: Array of absolute days.
+    """
+    count = max(int(np.ceil((stop - start) / step)), 1)
+    return np.linspace(start, stop, count + 1)
+
+
+def today():
+    """
+    Returns the current (day_of_year, year).
+    """
+    now = datetime.now()
+    return float(now.timetuple().tm_yday), now.year
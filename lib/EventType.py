@@ -0,0 +1,6 @@
+from enum import Enum
+
+class EventType(Enum):
+    PERIHELION = "Closest point of a body's orbit to its primary (its star, or the parent body of a moon)"
+    APHELION = "Farthest point of a body's orbit from its primary (its star, or the parent body of a moon)"
+    CLOSE_APPROACH = "Two bodies pass within a distance threshold of each other"
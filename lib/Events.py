@@ -0,0 +1,147 @@
+import heapq
+import itertools
+import math
+
+import numpy as np
+
+from lib import ApproachSearch, Epoch
+from lib.EventType import EventType
+
+# Events are tuples (days, event_type, body_names, distance_in_AU) ordered by absolute day
+
+
+def apsis_events(planet, start: float, stop: float = None):
+    """
+    Lazily yields the perihelion and aphelion passages of a planet in time order. Distances are measured
+    from the body's primary, so the apsides of a moon are relative to its parent.
+
+    :param planet: The Planet to follow.
+    :param start: First absolute day (see Epoch.to_days).
+    :param stop: Last absolute day; None runs forever.
+    :return: Generator of (days, EventType, (name,), distance_in_AU) tuples.
+    """
+    orbit = planet.orbit
+    perihelion = float(Epoch.to_days(orbit.perihelion_day, orbit.perihelion_year))
+    perihelion_distance = orbit.semi_major_axis * (1 - orbit.eccentricity)
+    aphelion_distance = orbit.semi_major_axis * (1 + orbit.eccentricity)
+
+    # Aphelion occurs half an orbital period after perihelion
+    half_orbit = math.floor(2 * (start - perihelion) / orbit.period)
+    for half in itertools.count(half_orbit):
+        days = perihelion + half * orbit.period / 2.0
+        if days < start:
+            continue
+        if stop is not None and days > stop:
+            return
+        if half % 2 == 0:
+            yield days, EventType.PERIHELION, (planet.name,), perihelion_distance
+        else:
+            yield days, EventType.APHELION, (planet.name,), aphelion_distance
+
+
+def _radial_range(planet) -> tuple:
+    """
+    Returns the (smallest, largest) possible distance of a body from its star; moons widen their parent's range.
+    """
+    perihelion = planet.get_closest_approach()[2]
+    aphelion = planet.get_farthest_approach()[2]
+    parent = planet.parent
+    if parent is None:
+        return perihelion, aphelion
+    lowest, highest = _radial_range(parent)
+    return max(lowest - aphelion, 0.0), highest + aphelion
+
+
+def close_approach_events(planet, other_planet, start: float, threshold: float, stop: float = None,
+                          window_days: float = None, tolerance: float = 1e-3, coarse_steps_per_orbit: int = 64):
+    """
+    Lazily yields the local minima of the distance between two planets that fall below a threshold.
+
+    The horizon is scanned one window at a time, so memory does not grow with the horizon. All windows
+    share one coarse grid anchored at start and each minimum belongs to the window owning its coarse
+    bracket (see ApproachSearch.shard_minima), so a minimum near a window boundary is yielded exactly
+    once, with the same value whatever the window length. Pairs whose radial ranges keep them farther
+    apart than the threshold yield nothing without scanning; other pairs that never get close enough
+    yield nothing either, but without a stop keep scanning (event_stream is not held up by them).
+
+    :param planet: First Planet.
+    :param other_planet: Second Planet.
+    :param start: First absolute day (see Epoch.to_days).
+    :param threshold: Only approaches closer than this (in AU) are yielded.
+    :param stop: Last absolute day; None runs forever.
+    :param window_days: Days scanned per window; defaults to eight orbits of the faster planet.
+    :param tolerance: Time tolerance (in days) of each approach.
+    :param coarse_steps_per_orbit: Coarse samples per orbit of the faster planet.
+    :return: Generator of (days, EventType.CLOSE_APPROACH, (name, other_name), distance_in_AU) tuples.
+    """
+    return (event for event in _scan_approaches(planet, other_planet, start, threshold, stop, window_days, tolerance,
+                                                coarse_steps_per_orbit) if event[1] is not None)
+
+
+def _scan_approaches(planet, other_planet, start: float, threshold: float, stop: float = None,
+                     window_days: float = None, tolerance: float = 1e-3, coarse_steps_per_orbit: int = 64):
+    """
+    Generator behind close_approach_events that also yields a (days, None, names, nan) progress marker
+    after every window, no later than any approach still to come. A pair that never gets close enough
+    otherwise yields nothing at all and would stall a merge of endless streams.
+    """
+    def separation(days):
+        return planet.get_separations(other_planet, *Epoch.from_days(days))
+
+    # |r1 - r2| >= ||r1| - |r2||, so pairs whose radial ranges stay apart can never get close enough
+    (lowest, highest), (other_lowest, other_highest) = _radial_range(planet), _radial_range(other_planet)
+    if max(lowest - other_highest, other_lowest - highest) >= threshold:
+        return
+
+    shorter_period = min(planet.period, other_planet.period)
+    coarse_step = shorter_period / coarse_steps_per_orbit
+    points_per_window = max(int(round((window_days or 8 * shorter_period) / coarse_step)), 1)
+    # Grid points up to one step past stop, whose brackets may still hold a minimum before it
+    points = None if stop is None else int(math.ceil((stop - start) / coarse_step)) + 1
+    names = (planet.name, other_planet.name)
+
+    first = 0
+    while points is None or first < points:
+        last = first + points_per_window if points is None else min(first + points_per_window, points)
+        # The owned points [first, last) plus one neighbour each side, so no owned point is a grid end
+        grid = start + np.arange(first - 1, last + 1) * coarse_step
+        times, distances = ApproachSearch.shard_minima(separation, grid, 1, grid.size - 1, tolerance)
+        # Later windows own brackets from grid[-2] on, so their minima cannot come before it
+        progress = float(grid[-2])
+        for days, distance in zip(times.tolist(), distances.tolist()):
+            progress = max(progress, days)
+            if days >= start and (stop is None or days < stop) and distance < threshold:
+                yield days, EventType.CLOSE_APPROACH, names, distance
+        yield progress, None, names, math.nan
+        first = last
+
+
+def event_stream(planets, start_day: float, start_year: int, horizon_days: float = None,
+                 approach_threshold: float = None, **approach_options):
+    """
+    Lazily yields the perihelia, aphelia and close approaches of a set of planets in time order.
+
+    Per-body and per-pair generators are merged with a heap, so callers can stop consuming at any
+    point and nothing beyond the current window of each pair is materialized. Pairs report their
+    progress after every window, so one that never gets close enough does not hold up the others.
+
+    :param planets: List of Planet instances (or a Catalog).
+    :param start_day: Day of the year the stream starts on.
+    :param start_year: Year the stream starts in.
+    :param horizon_days: Length of the stream (in days); None runs forever.
+    :param approach_threshold: Distance (in AU) below which pairwise approaches are reported; None
+        disables close-approach events.
+    :param approach_options: Passed through to close_approach_events.
+    :return: Generator of (days, EventType, body_names, distance_in_AU) tuples.
+    """
+    start = float(Epoch.to_days(start_day, start_year))
+    stop = None if horizon_days is None else start + horizon_days
+
+    streams = [apsis_events(planet, start, stop) for planet in planets]
+    if approach_threshold is not None:
+        streams.extend(
+            _scan_approaches(planet, other_planet, start, approach_threshold, stop, **approach_options)
+            for planet, other_planet in itertools.combinations(planets, 2)
+        )
+    merged = heapq.merge(*streams, key=lambda event: event[0])
+    return (event for event in merged if event[1] is not None)
@@ -0,0 +1,222 @@
+import numpy as np
+
+from lib import Epoch, Instrumentation
+from lib.Conjunction import as_catalog
+from lib.Rocket import AU_IN_KM, FUEL_EFFICIENCY, SECONDS_PER_DAY, STANDARD_GRAVITY
+
+AU_IN_M = AU_IN_KM * 1000
+
+# Gravitational parameter of one solar mass (m^3/s^2); Star.mass is in solar masses
+SOLAR_GM = 1.32712440018e20
+
+# Bogacki-Shampine 3(2) pair; the last stage is the first stage of the next step
+STAGE_NODES = (0.5, 0.75)
+SOLUTION_WEIGHTS = (2 / 9, 1 / 3, 4 / 9)
+ERROR_WEIGHTS = (-5 / 72, 1 / 12, 1 / 9, -1 / 8)
+
+
+class _Fleet:
+    """
+    Shared, read-only description of a batch of ships: targets, thrust and guidance parameters.
+    """
+
+    def __init__(self, catalog, target_rows, launch_days, dry_mass_kg, thrust_n, exhaust_velocity, response_time_s):
+        self.catalog = catalog
+        self.target_rows = target_rows
+        self.star_gm = SOLAR_GM * np.array([catalog.stars[star].mass for star in catalog.columns["star"][target_rows]])
+        self.launch_days = launch_days
+        self.dry_mass_kg = dry_mass_kg
+        self.thrust_n = thrust_n
+        self.exhaust_velocity = exhaust_velocity
+        self.response_time_s = response_time_s
+
+    def body_state(self, rows, days):
+        """
+        Returns positions (m) and velocities (m/s) of catalog rows[k] at days[k].
+        """
+        positions, velocities = self.catalog.get_body_states(rows, *Epoch.from_days(days))
+        return positions * AU_IN_M, velocities * (AU_IN_M / SECONDS_PER_DAY)
+
+    def gravity(self, ships, position):
+        """
+        Returns the acceleration (m/s^2) of the target's star at the given positions.
+        """
+        radius = np.linalg.norm(position, axis=-1)
+        return -(self.star_gm[ships] / radius**3)[:, None] * position
+
+    def derivatives(self, ships, time_s, position, velocity, mass):
+        """
+        Evaluates the equations of motion of the given ships.
+
+        Ships fall in the star's gravity (planets' own gravity is not modelled). Guidance tracks the speed
+        from which the ship can still brake to rest at the target, capped so the remaining delta-v covers
+        both speeding up and braking, and cancels the difference between the star's pull on the ship and on
+        the target; thrust is limited by the engine (T / m) and stops when the tanks are empty.
+
+        :return: Tuple (d position, d velocity, d mass) per second.
+        """
+        days = self.launch_days[ships] + time_s / SECONDS_PER_DAY
+        target_position, target_velocity = self.body_state(self.target_rows[ships], days)
+        offset = target_position - position
+        distance = np.linalg.norm(offset, axis=-1)
+        relative_velocity = velocity - target_velocity
+        speed = np.linalg.norm(relative_velocity, axis=-1)
+
+        dry_mass = self.dry_mass_kg[ships]
+        exhaust_velocity = self.exhaust_velocity[ships]
+        max_accel = np.where(mass > dry_mass, self.thrust_n[ships] / mass, 0.0)
+        delta_v_left = exhaust_velocity * np.log(np.maximum(mass, dry_mass) / dry_mass)
+
+        # Braking margin keeps the lagging velocity loop from overshooting the target
+        cruise_speed = np.minimum(np.sqrt(2 * 0.9 * max_accel * distance), 0.5 * (speed + delta_v_left))
+        direction = offset / np.maximum(distance, 1.0)[:, None]
+        gravity = self.gravity(ships, position)
+        tidal = gravity - self.gravity(ships, target_position)
+        command = (direction * cruise_speed[:, None] - relative_velocity) / self.response_time_s - tidal
+        magnitude = np.linalg.norm(command, axis=-1)
+        scale = np.minimum(1.0, max_accel / np.maximum(magnitude, 1e-12))
+        thrust = command * scale[:, None]
+
+        mass_flow = mass * magnitude * scale / exhaust_velocity
+        return velocity, gravity + thrust, -mass_flow
+
+
+def _broadcast_bodies(bodies, count):
+    if isinstance(bodies, (list, tuple)):
+        if len(bodies) != count:
+            raise ValueError("Origins and targets must be one body or one per ship.")
+        return list(bodies)
+    return [bodies] * count
+
+
+@Instrumentation.timed("simulate_flights")
+def simulate_flights(origins, targets, launch_days, fuel_mass_kg, dry_mass_kg, sustained_accel, fuel_type="liquid",
+                     isp_s: float = None, arrival_radius_km: float = 10000.0, arrival_speed_km_s: float = 1.0, tolerance_km: float = 1.0,
+                     max_days: float = 3650.0, max_steps: int = 100000, response_time_s: float = 1000.0) -> dict:
+    """
+    Flies a fleet of ships from their origins to moving targets, integrating every ship in one state array.
+
+    Each ship starts at rest relative to its origin body, falls in the star's gravity and burns with the
+    constant thrust of the rocket model (T = m0 * a, so acceleration grows as fuel burns at T / Ve). Targets are followed at their
+    positions from the orbit engine at every stage. Ships take their own adaptive steps (Bogacki-Shampine
+    3(2)), and finish when they are inside the arrival radius below the arrival speed or run out of time.
+
+    :param origins: Planet each ship departs from, or one Planet per ship.
+    :param targets: Planet each ship flies to, or one Planet per ship.
+    :param launch_days: Absolute departure day(s) (see Epoch.to_days).
+    :param fuel_mass_kg: Fuel mass(es) carried (in kg).
+    :param dry_mass_kg: Dry mass(es) of the spacecraft (in kg).
+    :param sustained_accel: Initial acceleration(s) in multiples of g.
+    :param fuel_type: "liquid" or "solid" for the whole fleet.
+    :param isp_s: Specific impulse(s) (in s) replacing the fuel type's, e.g. for fusion torch drives.
+    :param arrival_radius_km: Distance to the target that counts as arrived.
+    :param arrival_speed_km_s: Largest relative speed that counts as arrived.
+    :param tolerance_km: Local position error allowed per step.
+    :param max_days: Flights still under way after this many days are stopped.
+    :param max_steps: Upper bound on integration rounds for the whole fleet.
+    :param response_time_s: Time constant of the guidance velocity loop.
+    :return: Dict of columns: arrived, flight_time_days, arrival_days, fuel_used_kg, final_mass_kg,
+        peak_velocity_km_s (relative to the target), final_distance_km, final_speed_km_s and steps.
+    :raises ValueError: If a ship's origin and target orbit different stars.
+    """
+    if isp_s is None:
+        if fuel_type not in FUEL_EFFICIENCY:
+            raise ValueError("Fuel type must be 'liquid' or 'solid'.")
+        isp_s = FUEL_EFFICIENCY[fuel_type]
+
+    parameters = np.broadcast_arrays(*(np.atleast_1d(np.asarray(value, dtype=np.float64))
+                                       for value in (launch_days, fuel_mass_kg, dry_mass_kg, sustained_accel)))
+    count = max(parameters[0].size,
+                len(origins) if isinstance(origins, (list, tuple)) else 1,
+                len(targets) if isinstance(targets, (list, tuple)) else 1)
+    launch_days, fuel_mass_kg, dry_mass_kg, sustained_accel = (np.broadcast_to(value, (count,)).copy() for value in parameters)
+    origins, targets = _broadcast_bodies(origins, count), _broadcast_bodies(targets, count)
+
+    # Every distinct body is evaluated through one catalog, so moons and shared targets cost nothing extra
+    bodies = list({body.name: body for body in origins + targets}.values())
+    catalog = as_catalog(bodies)
+    rows = {body.name: row for row, body in enumerate(bodies)}
+    origin_rows = np.array([rows[body.name] for body in origins])
+    target_rows = np.array([rows[body.name] for body in targets])
+    stars = catalog.columns["star"]
+    if np.any(stars[origin_rows] != stars[target_rows]):
+        raise ValueError("Flights must stay within one star system.")
+
+    initial_mass = dry_mass_kg + fuel_mass_kg
+    exhaust_velocity = np.broadcast_to(np.asarray(isp_s, dtype=np.float64) * STANDARD_GRAVITY, (count,)).copy()
+    fleet = _Fleet(catalog, target_rows, launch_days, dry_mass_kg, initial_mass * sustained_accel * STANDARD_GRAVITY,
+                   exhaust_velocity, response_time_s)
+
+    position, velocity = fleet.body_state(origin_rows, launch_days)
+    mass = initial_mass.copy()
+    time_s = np.zeros(count)
+    step_s = np.full(count, 60.0)
+    steps = np.zeros(count, dtype=np.int64)
+    peak_speed = np.zeros(count)
+    arrived = np.zeros(count, dtype=bool)
+    done = np.zeros(count, dtype=bool)
+    limit_s = max_days * SECONDS_PER_DAY
+    tolerance_m = tolerance_km * 1000
+    arrival_radius_m = arrival_radius_km * 1000
+    arrival_speed_m_s = arrival_speed_km_s * 1000
+
+    ships = np.arange(count)
+    k1 = tuple(np.array(stage) for stage in fleet.derivatives(ships, time_s, position, velocity, mass))
+    for _ in range(max_steps):
+        ships = np.flatnonzero(~done)
+        if not ships.size:
+            break
+        t, dt = time_s[ships], np.minimum(step_s[ships], limit_s - time_s[ships])
+        y = (position[ships], velocity[ships], mass[ships])
+        first = tuple(stage[ships] for stage in k1)
+
+        stages = [first]
+        for node, weights in ((STAGE_NODES[0], (0.5,)), (STAGE_NODES[1], (0.0, 0.75))):
+            trial = tuple(y[part] + _weighted(stages, weights, part, dt) for part in range(3))
+            stages.append(fleet.derivatives(ships, t + node * dt, *trial))
+        new = tuple(y[part] + _weighted(stages, SOLUTION_WEIGHTS, part, dt) for part in range(3))
+        new = (new[0], new[1], np.maximum(new[2], dry_mass_kg[ships]))
+        last = fleet.derivatives(ships, t + dt, *new)
+        stages.append(last)
+
+        # Velocity errors are weighed as the position error they cause over one step
+        error = np.maximum(np.linalg.norm(_weighted(stages, ERROR_WEIGHTS, 0, dt), axis=-1),
+                           np.linalg.norm(_weighted(stages, ERROR_WEIGHTS, 1, dt), axis=-1) * dt) / tolerance_m
+        accepted = error <= 1.0
+        step_s[ships] = dt * np.clip(0.9 * np.maximum(error, 1e-10) ** (-1 / 3), 0.2, 5.0)
+
+        moved = ships[accepted]
+        position[moved], velocity[moved], mass[moved] = (part[accepted] for part in new)
+        time_s[moved] += dt[accepted]
+        steps[moved] += 1
+        for stage, value in zip(k1, last):
+            stage[moved] = value[accepted]
+
+        target_position, target_velocity = fleet.body_state(target_rows[moved], launch_days[moved] + time_s[moved] / SECONDS_PER_DAY)
+        distance = np.linalg.norm(target_position - position[moved], axis=-1)
+        speed = np.linalg.norm(velocity[moved] - target_velocity, axis=-1)
+        peak_speed[moved] = np.maximum(peak_speed[moved], speed)
+        arrived[moved] = (distance <= arrival_radius_m) & (speed <= arrival_speed_m_s)
+        done[moved] = arrived[moved] | (time_s[moved] >= limit_s)
+
+    target_position, target_velocity = fleet.body_state(target_rows, launch_days + time_s / SECONDS_PER_DAY)
+    flight_time_days = time_s / SECONDS_PER_DAY
+    return {
+        "arrived": arrived,
+        "flight_time_days": flight_time_days,
+        "arrival_days": np.where(arrived, launch_days + flight_time_days, np.nan),
+        "fuel_used_kg": initial_mass - mass,
+        "final_mass_kg": mass,
+        "peak_velocity_km_s": peak_speed / 1000,
+        "final_distance_km": np.linalg.norm(target_position - position, axis=-1) / 1000,
+        "final_speed_km_s": np.linalg.norm(velocity - target_velocity, axis=-1) / 1000,
+        "steps": steps,
+    }
+
+
+def _weighted(stages, weights, part, dt):
+    """
+    Returns dt * sum(weight * stage) for one part (position, velocity or mass) of the state.
+    """
+    total = sum(weight * stage[part] for weight, stage in zip(weights, stages) if weight)
+    return total * (dt[:, None] if np.ndim(total) == 2 else dt)
@@ -0,0 +1,192 @@
+import cProfile
+import functools
+import json
+import marshal
+import time
+from contextlib import contextmanager
+
+import numpy as np
+
+# True while at least one Recorder is active; hot paths check this flag before recording anything
+enabled = False
+
+_recorders = []
+_originals = {}
+
+
+class Recorder:
+    def __init__(self, profile: bool = False):
+        """
+        Collects counters and timers while active.
+
+        :param profile: Also run cProfile while active, for a full call-level dump.
+        """
+        self._counters = {}
+        self._timers = {}
+        self._profiler = cProfile.Profile() if profile else None
+        self._started = None
+        self._elapsed = 0.0
+
+    @property
+    def counters(self): return self._counters
+
+    @property
+    def timers(self): return self._timers
+
+    @property
+    def elapsed(self): return self._elapsed
+
+    def start(self):
+        _activate(self)
+        self._started = time.perf_counter()
+        if self._profiler is not None:
+            self._profiler.enable()
+        return self
+
+    def stop(self):
+        if self._profiler is not None:
+            self._profiler.disable()
+        self._elapsed += time.perf_counter() - self._started
+        _deactivate(self)
+        return self
+
+    def count(self, name: str, key: str, amount: int = 1):
+        counter = self._counters.setdefault(name, {})
+        counter[key] = counter.get(key, 0) + amount
+
+    def time(self, name: str, seconds: float):
+        timer = self._timers.setdefault(name, {"calls": 0, "total_seconds": 0.0})
+        timer["calls"] += 1
+        timer["total_seconds"] += seconds
+
+    def to_dict(self) -> dict:
+        """
+        Returns the per-query breakdown: wall time, timers (calls, total seconds) and counters.
+        """
+        return {"elapsed_seconds": self._elapsed, "timers": self._timers, "counters": self._counters}
+
+    def to_json(self, path=None) -> str:
+        """
+        Returns the breakdown as JSON, also writing it to path when given.
+        """
+        text = json.dumps(self.to_dict(), indent=4)
+        if path is not None:
+            with open(path, 'w') as file:
+                file.write(text)
+        return text
+
+    def dump_stats(self, path):
+        """
+        Writes a pstats-compatible file, readable with pstats.Stats(path) or snakeviz.
+
+        With profile=True this is the full cProfile dump; otherwise every timer becomes one entry.
+        """
+        if self._profiler is not None:
+            self._profiler.dump_stats(path)
+            return
+        stats = {
+            ("instrumentation", 0, name): (timer["calls"], timer["calls"], timer["total_seconds"], timer["total_seconds"], {})
+            for name, timer in self._timers.items()
+        }
+        with open(path, 'wb') as file:
+            marshal.dump(stats, file)
+
+
+def count(name: str, key: str, amount: int = 1):
+    """
+    Adds to a counter of every active recorder. Callers check `enabled` first on hot paths.
+    """
+    for recorder in _recorders:
+        recorder.count(name, key, amount)
+
+
+def count_rows(names, rows=None, epochs: int = 1):
+    """
+    Counts orbit evaluations per body for the vectorized entry points (Catalog, Propagator), like the
+    patched Planet methods do for single bodies. Callers check `enabled` first.
+
+    :param names: Array of body names indexed by catalog row.
+    :param rows: Rows evaluated once each (repeats add up); None evaluates every row.
+    :param epochs: Epochs evaluated per entry.
+    """
+    if rows is None:
+        rows, amounts = np.arange(len(names)), np.ones(len(names), dtype=np.int64)
+    else:
+        rows, amounts = np.unique(np.asarray(rows).ravel(), return_counts=True)
+    for row, amount in zip(rows, amounts * epochs):
+        count("orbit_evaluations", str(names[row]), int(amount))
+
+
+def timed(name: str):
+    """
+    Decorator recording the duration of every call under name while instrumentation is enabled.
+    """
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not enabled:
+                return function(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                for recorder in _recorders:
+                    recorder.time(name, elapsed)
+        return wrapper
+    return decorator
+
+
+def _counting(method):
+    """
+    Wraps a body evaluation method so every call counts its epochs against the body's name.
+    """
+    @functools.wraps(method)
+    def wrapper(self, days_of_year, years, *args, **kwargs):
+        count("orbit_evaluations", self.name, int(np.broadcast(np.asarray(days_of_year), np.asarray(years)).size))
+        return method(self, days_of_year, years, *args, **kwargs)
+    return wrapper
+
+
+def _activate(recorder):
+    global enabled
+    if not _recorders:
+        # Per-body counting is patched in only while recording, so the scalar path pays nothing otherwise;
+        # Body carries the methods of both Planet and the catalog views
+        from lib.Planet import Body
+        for name in ("get_orbital_distance", "get_orbital_distances", "get_orbital_positions"):
+            _originals[name] = getattr(Body, name)
+            setattr(Body, name, _counting(_originals[name]))
+    _recorders.append(recorder)
+    enabled = True
+
+
+def _deactivate(recorder):
+    global enabled
+    _recorders.remove(recorder)
+    if not _recorders:
+        from lib.Planet import Body
+        for name, method in _originals.items():
+            setattr(Body, name, method)
+        _originals.clear()
+        enabled = False
+
+
+@contextmanager
+def capture(profile: bool = False):
+    """
+    Records a per-query breakdown of everything executed inside the block.
+
+        with Instrumentation.capture() as query:
+            earth.find_closest_distance(mars)
+        print(query.to_json())
+
+    :param profile: Also run cProfile, so dump_stats writes a full call-level profile.
+    :return: Context manager yielding the Recorder.
+    """
+    recorder = Recorder(profile)
+    recorder.start()
+    try:
+        yield recorder
+    finally:
+        recorder.stop()
@@ -0,0 +1,111 @@
+import math
+
+import numpy as np
+
+TWO_PI = 2.0 * math.pi
+
+
+def wrap_anomaly(angle):
+    """
+    Wraps angles into [-pi, pi).
+    """
+    return np.remainder(np.asarray(angle, dtype=np.float64) + math.pi, TWO_PI) - math.pi
+
+
+def solve_kepler(mean_anomaly, eccentricity, initial_guess=None, tolerance: float = 1e-12,
+                 max_iterations: int = 50, method: str = "newton") -> tuple:
+    """
+    Solves Kepler's equation M = E - e * sin(E) for the eccentric anomaly, vectorized over all inputs.
+
+    Elements iterate together, and each one stops moving once its own update falls below the tolerance, so
+    an element's result does not depend on the rest of the batch.
+
+    :param mean_anomaly: Mean anomaly (radians), scalar or array.
+    :param eccentricity: Eccentricity, broadcastable against mean_anomaly.
+    :param initial_guess: Optional warm start, e.g. the eccentric anomaly of the previous timestep
+        advanced by the change in mean anomaly. Defaults to Danby's starter.
+    :param tolerance: Convergence threshold on the update (radians).
+    :param max_iterations: Upper bound on the number of iterations.
+    :param method: "newton" (quadratic) or "halley" (cubic convergence).
+    :return: Tuple (eccentric_anomaly, iterations, max_residual) where max_residual is the worst
+        |E - e sin E - M| over all elements.
+    """
+    if method not in ("newton", "halley"):
+        raise ValueError("Method must be 'newton' or 'halley'.")
+
+    M = wrap_anomaly(mean_anomaly)
+    e = np.asarray(eccentricity, dtype=np.float64)
+    if initial_guess is None:
+        E = M + 0.85 * e * np.sign(np.sin(M))
+    else:
+        # E - M is bounded by e, so bring the guess onto the same branch as M
+        E = M + wrap_anomaly(np.asarray(initial_guess, dtype=np.float64) - M)
+    shape = np.broadcast_shapes(M.shape, e.shape)
+    if E.shape != shape:
+        E = np.broadcast_to(E, shape).astype(np.float64)
+
+    converged = np.zeros(shape, dtype=bool)
+    iterations = 0
+    while iterations < max_iterations:
+        iterations += 1
+        sin_E = np.sin(E)
+        f = E - e * sin_E - M
+        f_prime = 1.0 - e * np.cos(E)
+        if method == "halley":
+            delta = f / (f_prime - 0.5 * f * e * sin_E / f_prime)
+        else:
+            delta = f / f_prime
+        delta = np.where(converged, 0.0, delta)
+        E = E - delta
+        converged |= np.abs(delta) < tolerance
+        if converged.all():
+            break
+
+    residual = np.abs(E - e * np.sin(E) - M)
+    max_residual = float(residual.max()) if residual.size else 0.0
+    return E, iterations, max_residual
+
+
+def solve_kepler_scalar(mean_anomaly: float, eccentricity: float, tolerance: float = 1e-12,
+                        max_iterations: int = 50) -> float:
+    """
+    Solves Kepler's equation for a single mean anomaly with plain floats.
+
+    Same iteration as solve_kepler, without the per-call cost of NumPy on scalars.
+
+    :param mean_anomaly: Mean anomaly (radians).
+    :param eccentricity: Eccentricity.
+    :return: Eccentric anomaly (radians).
+    """
+    M = math.remainder(mean_anomaly, TWO_PI)
+    E = M + 0.85 * eccentricity * math.copysign(1.0, math.sin(M))
+    for _ in range(max_iterations):
+        delta = (E - eccentricity * math.sin(E) - M) / (1.0 - eccentricity * math.cos(E))
+        E -= delta
+        if abs(delta) < tolerance:
+            break
+    return E
+
+
+def perifocal_to_heliocentric(x, y, inclination, ascending_node, argument_of_perihelion):
+    """
+    Rotates perifocal coordinates (x towards perihelion, y along the motion) into the reference frame.
+
+    :param x: Perifocal x (AU).
+    :param y: Perifocal y (AU).
+    :param inclination: Inclination (radians).
+    :param ascending_node: Longitude of the ascending node (radians).
+    :param argument_of_perihelion: Argument of perihelion (radians).
+    :return: Array of shape (..., 3) with x, y, z positions.
+    """
+    cos_node, sin_node = np.cos(ascending_node), np.sin(ascending_node)
+    cos_peri, sin_peri = np.cos(argument_of_perihelion), np.sin(argument_of_perihelion)
+    cos_inc, sin_inc = np.cos(inclination), np.sin(inclination)
+
+    p = (cos_node * cos_peri - sin_node * sin_peri * cos_inc,
+         sin_node * cos_peri + cos_node * sin_peri * cos_inc,
+         sin_peri * sin_inc)
+    q = (-cos_node * sin_peri - sin_node * cos_peri * cos_inc,
+         -sin_node * sin_peri + cos_node * cos_peri * cos_inc,
+         cos_peri * sin_inc)
+    return np.stack([x * p[axis] + y * q[axis] for axis in range(3)], axis=-1)
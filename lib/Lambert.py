@@ -0,0 +1,265 @@
+import math
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from lib import Epoch, Instrumentation
+from lib.Conjunction import as_catalog
+from lib.LaunchWindow import brachistochrone, porkchop
+from lib.Rocket import AU_IN_KM, FUEL_EFFICIENCY, SECONDS_PER_DAY, STANDARD_GRAVITY, fuel_for_delta_v
+
+# Gaussian gravitational constant: GM of one solar mass is k^2 in AU^3/day^2; Star.mass is in solar masses
+GAUSSIAN_GRAVITATIONAL_CONSTANT = 0.01720209895
+SOLAR_GM = GAUSSIAN_GRAVITATIONAL_CONSTANT**2
+
+AU_PER_DAY_IN_KM_S = AU_IN_KM / SECONDS_PER_DAY
+
+# Below this |z| the Stumpff functions are evaluated from their series, avoiding cancellation
+STUMPFF_SERIES_LIMIT = 1e-3
+
+# Single-revolution transfers have z below (2 * pi)^2, where C(z) vanishes
+MAX_UNIVERSAL_Z = 4 * math.pi**2
+
+
+def stumpff_c(z):
+    """
+    Evaluates the Stumpff function C(z) = (1 - cos(sqrt(z))) / z, continued to z <= 0.
+    """
+    z = np.asarray(z, dtype=np.float64)
+    root = np.sqrt(np.abs(z))
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        value = np.where(z > 0, (1 - np.cos(root)) / z, (np.cosh(root) - 1) / -z)
+    return np.where(np.abs(z) < STUMPFF_SERIES_LIMIT, 1 / 2 - z / 24 + z**2 / 720, value)
+
+
+def stumpff_s(z):
+    """
+    Evaluates the Stumpff function S(z) = (sqrt(z) - sin(sqrt(z))) / sqrt(z)^3, continued to z <= 0.
+    """
+    z = np.asarray(z, dtype=np.float64)
+    root = np.sqrt(np.abs(z))
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        value = np.where(z > 0, (root - np.sin(root)) / root**3, (np.sinh(root) - root) / root**3)
+    return np.where(np.abs(z) < STUMPFF_SERIES_LIMIT, 1 / 6 - z / 120 + z**2 / 5040, value)
+
+
+def _transfer_time(z, r1, r2, A, mu):
+    """
+    Returns the time of flight for universal variable z, and the auxiliary y(z); z values with
+    y < 0 correspond to no transfer and count as zero time.
+    """
+    C, S = stumpff_c(z), stumpff_s(z)
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        y = r1 + r2 + A * (z * S - 1) / np.sqrt(C)
+        positive = np.maximum(y, 0.0)
+        time = ((positive / C) ** 1.5 * S + A * np.sqrt(positive)) / np.sqrt(mu)
+    return np.where(y > 0, time, 0.0), y
+
+
+@Instrumentation.timed("solve_lambert")
+def solve_lambert(r1, r2, time_of_flight, mu, prograde: bool = True, tolerance: float = 1e-10,
+                  max_iterations: int = 100) -> tuple:
+    """
+    Solves Lambert's problem for arrays of single-revolution transfers in one vectorized pass.
+
+    Uses the universal-variable formulation: the time of flight grows monotonically with z, so
+    every transfer is bracketed and bisected on z together. Transfers within the tolerance are frozen
+    while the rest continue, so results do not depend on how transfers are batched.
+
+    :param r1: Array of shape (..., 3) with departure positions.
+    :param r2: Array of shape (..., 3) with arrival positions.
+    :param time_of_flight: Time(s) of flight, broadcastable against the positions.
+    :param mu: Gravitational parameter(s) of the central body, in the units of the positions and times.
+    :param prograde: Transfer in the direction of motion of the planets (counter-clockwise seen from +z).
+    :param tolerance: Relative time-of-flight error accepted.
+    :param max_iterations: Upper bound on bisection steps.
+    :return: Tuple (v1, v2, converged): departure and arrival velocities of shape (..., 3), NaN where
+        no transfer was found (non-positive time, transfers through exactly 0 or 180 degrees, or times
+        needing more than one revolution).
+    """
+    r1 = np.asarray(r1, dtype=np.float64)
+    r2 = np.asarray(r2, dtype=np.float64)
+    shape = np.broadcast_shapes(r1.shape[:-1], r2.shape[:-1], np.shape(time_of_flight), np.shape(mu))
+    r1 = np.broadcast_to(r1, shape + (3,)).reshape(-1, 3)
+    r2 = np.broadcast_to(r2, shape + (3,)).reshape(-1, 3)
+    target = np.broadcast_to(np.asarray(time_of_flight, dtype=np.float64), shape).ravel()
+    mu = np.broadcast_to(np.asarray(mu, dtype=np.float64), shape).ravel()
+
+    n1 = np.linalg.norm(r1, axis=-1)
+    n2 = np.linalg.norm(r2, axis=-1)
+    cos_angle = np.clip(np.einsum('ij,ij->i', r1, r2) / (n1 * n2), -1.0, 1.0)
+    angle = np.arccos(cos_angle)
+    turns_back = np.cross(r1, r2)[:, 2] < 0
+    angle = np.where(turns_back == prograde, 2 * math.pi - angle, angle)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        A = np.sin(angle) * np.sqrt(n1 * n2 / (1 - cos_angle))
+    valid = (target > 0) & np.isfinite(A) & (np.abs(A) > 1e-12 * (n1 + n2))
+    A = np.where(valid, A, 1.0)
+
+    # Bracket: the upper end is the single-revolution limit; the lower end moves down for fast (hyperbolic) transfers
+    low = np.full(target.shape, -MAX_UNIVERSAL_Z)
+    high = np.full(target.shape, MAX_UNIVERSAL_Z * (1 - 1e-6))
+    for _ in range(6):
+        too_slow = valid & (_transfer_time(low, n1, n2, A, mu)[0] > target)
+        if not too_slow.any():
+            break
+        low[too_slow] *= 4
+    valid &= _transfer_time(low, n1, n2, A, mu)[0] <= target
+    valid &= _transfer_time(high, n1, n2, A, mu)[0] >= target
+
+    z = 0.5 * (low + high)
+    active = valid.copy()
+    for _ in range(max_iterations):
+        time, _ = _transfer_time(z, n1, n2, A, mu)
+        active &= np.abs(time - target) > tolerance * target
+        if not active.any():
+            break
+        longer = time > target
+        high = np.where(active & longer, z, high)
+        low = np.where(active & ~longer, z, low)
+        z = np.where(active, 0.5 * (low + high), z)
+
+    time, y = _transfer_time(z, n1, n2, A, mu)
+    converged = valid & (np.abs(time - target) <= tolerance * target) & (y > 0)
+
+    # Lagrange coefficients
+    with np.errstate(divide='ignore', invalid='ignore'):
+        f = 1 - y / n1
+        g = A * np.sqrt(np.maximum(y, 0.0) / mu)
+        g_dot = 1 - y / n2
+        v1 = (r2 - f[:, None] * r1) / g[:, None]
+        v2 = (g_dot[:, None] * r2 - r1) / g[:, None]
+    v1[~converged] = np.nan
+    v2[~converged] = np.nan
+    return v1.reshape(shape + (3,)), v2.reshape(shape + (3,)), converged.reshape(shape)
+
+
+def _solve_chunk(r1, r2, time_of_flight, mu, prograde):
+    return solve_lambert(r1, r2, time_of_flight, mu, prograde)
+
+
+def _body_rows(bodies, rows):
+    if isinstance(bodies, (list, tuple)):
+        return np.array([rows[body.name] for body in bodies])
+    return np.array(rows[bodies.name])
+
+
+@Instrumentation.timed("lambert_transfers")
+def lambert_transfers(origins, destinations, departure_days, arrival_days, prograde: bool = True,
+                      workers: int = None, chunk_size: int = 65536) -> dict:
+    """
+    Computes ballistic transfers between bodies for arrays of departure and arrival epochs.
+
+    Bodies and epochs broadcast together, e.g. departure_days[:, None] and arrival_days[None, :] give a
+    porkchop grid, and lists of bodies give one pair per transfer. Positions and velocities come from
+    the orbit engine in one call per end; the transfers are solved around the bodies' star, with the
+    delta-v measured against each body's own orbital velocity (gravity wells are not included).
+
+    :param origins: Planet every transfer departs from, or a list of Planets.
+    :param destinations: Planet every transfer arrives at, or a list of Planets.
+    :param departure_days: Absolute departure day(s) (see Epoch.to_days).
+    :param arrival_days: Absolute arrival day(s).
+    :param prograde: Transfer in the direction of motion of the planets.
+    :param workers: Number of worker processes for the solver; None or 1 solves in-process.
+    :param chunk_size: Transfers per worker task.
+    :return: Dict of columns in the broadcast shape: departure_days, arrival_days, time_of_flight_days,
+        departure_delta_v_km_s, arrival_delta_v_km_s, delta_v_km_s (their sum; NaN where no transfer
+        was found) and converged.
+    """
+    bodies = [*(origins if isinstance(origins, (list, tuple)) else [origins]),
+              *(destinations if isinstance(destinations, (list, tuple)) else [destinations])]
+    bodies = list({body.name: body for body in bodies}.values())
+    catalog = as_catalog(bodies)
+    rows = {body.name: row for row, body in enumerate(bodies)}
+
+    origin_rows, destination_rows, departure_days, arrival_days = np.broadcast_arrays(
+        _body_rows(origins, rows), _body_rows(destinations, rows),
+        np.asarray(departure_days, dtype=np.float64), np.asarray(arrival_days, dtype=np.float64))
+    stars = catalog.columns["star"]
+    if np.any(stars[origin_rows] != stars[destination_rows]):
+        raise ValueError("Transfers must stay within one star system.")
+    mu = SOLAR_GM * np.array([star.mass for star in catalog.stars])[stars[origin_rows]]
+
+    r1, v_origin = catalog.get_body_states(origin_rows, *Epoch.from_days(departure_days))
+    r2, v_destination = catalog.get_body_states(destination_rows, *Epoch.from_days(arrival_days))
+    time_of_flight = arrival_days - departure_days
+
+    if workers is None or workers <= 1:
+        v1, v2, converged = solve_lambert(r1, r2, time_of_flight, mu, prograde)
+    else:
+        flat = [value.reshape((-1, 3) if value.ndim > time_of_flight.ndim else -1) for value in (r1, r2, time_of_flight, mu)]
+        chunks = [slice(start, start + chunk_size) for start in range(0, time_of_flight.size, chunk_size)]
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_solve_chunk, *([value[chunk] for chunk in chunks] for value in flat),
+                                        [prograde] * len(chunks)))
+        v1, v2, converged = (np.concatenate(parts).reshape(shape)
+                             for parts, shape in zip(zip(*results), (r1.shape, r2.shape, time_of_flight.shape)))
+
+    departure_delta_v = np.linalg.norm(v1 - v_origin, axis=-1) * AU_PER_DAY_IN_KM_S
+    arrival_delta_v = np.linalg.norm(v_destination - v2, axis=-1) * AU_PER_DAY_IN_KM_S
+    return {
+        "departure_days": departure_days,
+        "arrival_days": arrival_days,
+        "time_of_flight_days": time_of_flight,
+        "departure_delta_v_km_s": departure_delta_v,
+        "arrival_delta_v_km_s": arrival_delta_v,
+        "delta_v_km_s": departure_delta_v + arrival_delta_v,
+        "converged": converged,
+    }
+
+
+@Instrumentation.timed("transfer_trade_study")
+def transfer_trade_study(origin, destination, departure_days, arrival_days, fuel_mass_kg=200000, dry_mass_kg=15500,
+                         sustained_accel=0.5, fuel_type="liquid", workers: int = None) -> dict:
+    """
+    Compares ballistic (Lambert) transfers with constant-acceleration flights on one departure x arrival grid,
+    for one ship or a fleet.
+
+    Both sides charge the whole trip to the same ship and engine: the ballistic fuel covers the departure
+    and arrival delta-v (rocket equation), the torch fuel both the acceleration and deceleration burns
+    (see LaunchWindow.brachistochrone). The ship parameters broadcast against each other to the fleet shape,
+    () for a single ship; the transfer geometry is solved once and shared by the whole fleet.
+
+    :param origin: Departure Planet.
+    :param destination: Arrival Planet.
+    :param departure_days: Absolute departure days (see Epoch.to_days).
+    :param arrival_days: Absolute arrival days.
+    :param fuel_mass_kg: Fuel carried (in kg), per ship.
+    :param dry_mass_kg: Dry mass of the spacecraft (in kg), per ship.
+    :param sustained_accel: Acceleration of the brachistochrone flights in multiples of g, per ship.
+    :param fuel_type: "liquid" or "solid".
+    :param workers: Number of worker processes for both grids.
+    :return: Dict with departure_days, arrival_days, the departure x arrival matrix ballistic_delta_v_km_s and
+        fleet shape + departure x arrival arrays ballistic_fuel_kg, ballistic_feasible, torch_transit_days,
+        torch_fuel_kg and torch_feasible.
+    """
+    if fuel_type not in FUEL_EFFICIENCY:
+        raise ValueError("Fuel type must be 'liquid' or 'solid'.")
+    departure_days = np.asarray(departure_days, dtype=np.float64)
+    arrival_days = np.asarray(arrival_days, dtype=np.float64)
+    exhaust_velocity = FUEL_EFFICIENCY[fuel_type] * STANDARD_GRAVITY
+
+    fuel_mass_kg, dry_mass_kg, sustained_accel = np.broadcast_arrays(
+        *(np.asarray(value, dtype=np.float64) for value in (fuel_mass_kg, dry_mass_kg, sustained_accel)))
+    fleet = fuel_mass_kg.shape + (1, 1)
+    fuel_mass_kg, dry_mass_kg, sustained_accel = (value.reshape(fleet)
+                                                  for value in (fuel_mass_kg, dry_mass_kg, sustained_accel))
+
+    ballistic = lambert_transfers(origin, destination, departure_days[:, None], arrival_days[None, :], workers=workers)
+    distance_au = porkchop(origin, destination, departure_days, arrival_days, fuel_type=fuel_type,
+                           workers=workers)["distance_au"]
+
+    ballistic_fuel = fuel_for_delta_v(ballistic["delta_v_km_s"] * 1000, dry_mass_kg, exhaust_velocity)
+    torch_transit, torch_fuel = brachistochrone(distance_au * AU_IN_KM * 1000, fuel_mass_kg, dry_mass_kg,
+                                                sustained_accel, exhaust_velocity)
+    window_days = arrival_days[None, :] - departure_days[:, None]
+    return {
+        "departure_days": departure_days,
+        "arrival_days": arrival_days,
+        "ballistic_delta_v_km_s": ballistic["delta_v_km_s"],
+        "ballistic_fuel_kg": ballistic_fuel,
+        "ballistic_feasible": ballistic["converged"] & (ballistic_fuel <= fuel_mass_kg),
+        "torch_transit_days": torch_transit,
+        "torch_fuel_kg": torch_fuel,
+        "torch_feasible": (torch_transit <= window_days) & (torch_transit > 0),
+    }
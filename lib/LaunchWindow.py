@@ -0,0 +1,120 @@
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from lib import Epoch, Instrumentation
+from lib.Rocket import AU_IN_KM, FUEL_EFFICIENCY, STANDARD_GRAVITY, fuel_for_burn_time, mission_profile
+
+OUTPUTS = ("distance_au", "transit_days", "fuel_kg")
+
+# Per-process state installed by _init_worker: inputs plus views onto the shared result arrays
+_worker_state = {}
+
+
+def _compute_rows(rows, origin_positions, destination_positions, mission):
+    """
+    Computes the porkchop values for a block of departure rows against every arrival.
+    """
+    offsets = destination_positions[None, :, :] - origin_positions[rows, None, :]
+    distance_au = np.linalg.norm(offsets, axis=-1)
+    distance_m = distance_au * AU_IN_KM * 1000
+
+    total_days, fuel_kg = brachistochrone(distance_m, *mission)
+    return distance_au, total_days, fuel_kg
+
+
+def brachistochrone(distance_m, fuel_mass_kg, dry_mass_kg, sustained_accel, exhaust_velocity):
+    """
+    Computes the transit time of a flight and the fuel it needs to accelerate to the midpoint and
+    decelerate over the rest. Works on scalars and on broadcastable NumPy arrays.
+
+    :return: Tuple of (transit_days, fuel_kg); with less fuel than fuel_kg on board the transit
+        follows the burn-coast-burn profile of mission_profile.
+    """
+    half_burn_s = np.sqrt(distance_m / (sustained_accel * STANDARD_GRAVITY))
+    fuel_kg = fuel_for_burn_time(2 * half_burn_s, dry_mass_kg, sustained_accel, exhaust_velocity)
+    _, _, _, total_days = mission_profile(distance_m, fuel_mass_kg, dry_mass_kg, sustained_accel, exhaust_velocity)
+    return total_days, fuel_kg
+
+
+def _init_worker(names, shape, origin_positions, destination_positions, mission):
+    blocks = [shared_memory.SharedMemory(name=name) for name in names]
+    _worker_state.update(
+        blocks=blocks,
+        results=[np.ndarray(shape, dtype=np.float64, buffer=block.buf) for block in blocks],
+        origin_positions=origin_positions,
+        destination_positions=destination_positions,
+        mission=mission,
+    )
+
+
+def _run_worker(rows):
+    state = _worker_state
+    values = _compute_rows(rows, state["origin_positions"], state["destination_positions"], state["mission"])
+    for result, value in zip(state["results"], values):
+        result[rows] = value
+    return len(rows)
+
+
+@Instrumentation.timed("porkchop")
+def porkchop(origin, destination, departure_days, arrival_days, fuel_mass_kg=200000, dry_mass_kg=15500,
+             sustained_accel=0.5, fuel_type="liquid", workers: int = None, chunk_rows: int = 64) -> dict:
+    """
+    Builds a porkchop plot of departure date x arrival date between two planets.
+
+    Each orbit is evaluated once for all departures and once for all arrivals; the straight-line
+    distance between those positions drives the brachistochrone model of lib.Rocket.
+
+    :param origin: Departure Planet.
+    :param destination: Arrival Planet.
+    :param departure_days: Absolute departure days (see Epoch.to_days).
+    :param arrival_days: Absolute arrival days.
+    :param fuel_mass_kg: Fuel carried (in kg).
+    :param dry_mass_kg: Dry mass of the spacecraft (in kg).
+    :param sustained_accel: Acceleration in multiples of g.
+    :param fuel_type: "liquid" or "solid".
+    :param workers: Number of worker processes writing into shared memory; None or 1 runs in-process.
+    :param chunk_rows: Departure rows per worker task.
+    :return: Dict with departure_days, arrival_days and departure x arrival matrices distance_au,
+        transit_days (with the fuel carried: the brachistochrone time, or burn-coast-burn when the tank
+        is short of fuel_kg), fuel_kg (fuel for the full brachistochrone, both burns) and feasible (the
+        ship arrives by the arrival day with the fuel carried, coasting if need be; compare fuel_kg with
+        the fuel carried for flights under thrust all the way).
+    """
+    if fuel_type not in FUEL_EFFICIENCY:
+        raise ValueError("Fuel type must be 'liquid' or 'solid'.")
+
+    departure_days = np.asarray(departure_days, dtype=np.float64)
+    arrival_days = np.asarray(arrival_days, dtype=np.float64)
+    origin_positions = origin.get_orbital_positions(*Epoch.from_days(departure_days))
+    destination_positions = destination.get_orbital_positions(*Epoch.from_days(arrival_days))
+    mission = (fuel_mass_kg, dry_mass_kg, sustained_accel, FUEL_EFFICIENCY[fuel_type] * STANDARD_GRAVITY)
+
+    shape = (departure_days.size, arrival_days.size)
+    rows = np.arange(departure_days.size)
+    if workers is None or workers <= 1:
+        values = _compute_rows(rows, origin_positions, destination_positions, mission)
+    else:
+        size = max(int(np.prod(shape)) * 8, 1)
+        blocks = [shared_memory.SharedMemory(create=True, size=size) for _ in OUTPUTS]
+        try:
+            chunks = [rows[start:start + chunk_rows] for start in range(0, rows.size, chunk_rows)]
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=([block.name for block in blocks], shape, origin_positions,
+                                               destination_positions, mission)) as executor:
+                list(executor.map(_run_worker, chunks))
+            values = [np.ndarray(shape, dtype=np.float64, buffer=block.buf).copy() for block in blocks]
+        finally:
+            for block in blocks:
+                block.close()
+                block.unlink()
+
+    result = dict(zip(OUTPUTS, values))
+    result["departure_days"] = departure_days
+    result["arrival_days"] = arrival_days
+    result["feasible"] = (
+        (result["transit_days"] <= arrival_days[None, :] - departure_days[:, None]) &
+        (result["transit_days"] > 0)
+    )
+    return result
@@ -8,4 +8,5 @@ class PlanetType(Enum):
     HOT_JUPITER = "Gas giant orbiting very close to its star"
     SUPER_EARTH = "Planet larger than Earth but smaller than Neptune"
     MINI_NEPTUNE = "Planet smaller than Neptune but bigger than Earth"
-    OCEAN_WORLD = "Possible planet with significant surface or subsurface oceans"
\ No newline at end of file
+    OCEAN_WORLD = "Possible planet with significant surface or subsurface oceans"
+    MOON = "Natural satellite orbiting a planet (like the Moon or Europa)"
\ No newline at end of file
@@ -0,0 +1,92 @@
+import math
+
+import numpy as np
+
+from lib import Epoch, Instrumentation
+from lib.Conjunction import as_catalog
+from lib.EllipticalOrbit import orbital_positions
+
+
+class Propagator:
+    def __init__(self, planets, day_of_year: float, year: int):
+        """
+        Initializes an incrementally advanced ephemeris for a set of planets.
+
+        Every step evaluates all bodies in one vectorized call, warm-starting Kepler's equation from the
+        previous step's eccentric anomalies; moons are then offset by their parents.
+
+        :param planets: List of Planet instances or a Catalog.
+        :param day_of_year: Day of the year to start at.
+        :param year: Year to start at.
+        """
+        self._planets = planets
+        self._catalog = as_catalog(planets)
+        self._elements = self._catalog.elements
+        self._mean_motion = 2.0 * math.pi / self._elements[4]
+        self._days = None
+        self._anomaly = None
+        self._iterations = 0
+        self._max_residual = 0.0
+        self._positions = None
+        self.set_days(float(Epoch.to_days(day_of_year, year)))
+
+    @property
+    def planets(self): return self._planets
+
+    @property
+    def days(self): return self._days
+
+    @property
+    def positions(self): return self._positions
+
+    @property
+    def iterations(self): return self._iterations
+
+    @property
+    def max_residual(self): return self._max_residual
+
+    def set_days(self, days: float) -> np.ndarray:
+        """
+        Moves the ephemeris to an absolute day (forwards or backwards) and returns the new positions.
+
+        :param days: Absolute day (see Epoch.to_days).
+        :return: Array of shape (len(planets), 3) with positions (in AU).
+        """
+        guess = None
+        if self._anomaly is not None:
+            guess = self._anomaly + self._mean_motion * (days - self._days)
+
+        positions, solution = orbital_positions(*self._elements, *Epoch.from_days(days), initial_guess=guess,
+                                                return_solution=True)
+        if Instrumentation.enabled:
+            Instrumentation.count_rows(self._catalog.names)
+        positions = self._catalog.compose(positions)[:len(self._planets)]
+        self._days = days
+        self._positions = positions
+        self._anomaly = solution["eccentric_anomaly"]
+        self._iterations = solution["iterations"]
+        self._max_residual = solution["max_residual"]
+        return positions
+
+    def advance(self, delta_days: float) -> np.ndarray:
+        """
+        Advances the ephemeris by a number of days and returns the new positions.
+        """
+        return self.set_days(self._days + delta_days)
+
+    def sample_orbits(self, samples: int = 256) -> np.ndarray:
+        """
+        Samples one full revolution of every orbit, e.g. for drawing orbit paths.
+
+        Paths are relative to each body's primary, so a moon's path is centred on its parent.
+
+        :param samples: Points per orbit.
+        :return: Array of shape (len(planets), samples, 3).
+        """
+        phase = np.linspace(0.0, 1.0, samples)
+        perihelion = Epoch.to_days(self._elements[2], self._elements[3])
+        days = perihelion[:, None] + self._elements[4][:, None] * phase
+        paths = orbital_positions(*(element[:, None] for element in self._elements), *Epoch.from_days(days))
+        if Instrumentation.enabled:
+            Instrumentation.count_rows(self._catalog.names, epochs=samples)
+        return paths[:len(self._planets)]
@@ -0,0 +1,185 @@
+import numpy as np
+
+from lib import Epoch
+
+# Same as Rocket.AU_IN_KM; kept here so distance queries never import the rocket model
+AU_IN_KM = 149597870.7
+
+
+def find_body(planets: dict, name: str):
+    """
+    Returns a body from a dict of planets keyed by name.
+    """
+    if name not in planets:
+        raise ValueError(f"Unknown body {name}.")
+    return planets[name]
+
+
+def same_system(planets: dict, origin: str, destination: str):
+    """
+    Checks that two bodies orbit the same star; positions of different systems share no frame.
+    """
+    if planets[origin].star.name != planets[destination].star.name:
+        raise ValueError(f"{origin} and {destination} are in different star systems.")
+
+
+def systems(planets: dict) -> dict:
+    """
+    Groups a dict of planets keyed by name into one such dict per star name.
+    """
+    grouped = {}
+    for name, planet in planets.items():
+        grouped.setdefault(planet.star.name, {})[name] = planet
+    return grouped
+
+
+def distance_query(planets, origin, destination, day_of_year, year) -> dict:
+    """
+    Returns the distance between two bodies at an epoch.
+    """
+    distance = float(find_body(planets, origin).get_separations(find_body(planets, destination), day_of_year, year))
+    return {"origin": origin, "destination": destination, "day_of_year": day_of_year, "year": year,
+            "distance_au": distance, "distance_km": distance * AU_IN_KM}
+
+
+def closest_query(planets, origin, destination, start_day, start_year, span_days, tolerance, coarse_steps_per_orbit,
+                  workers=None) -> dict:
+    """
+    Returns the closest approach between two bodies inside a window.
+    """
+    distance, (day, year) = find_body(planets, origin).find_closest_approach(
+        find_body(planets, destination), start_day, start_year, span_days, tolerance, coarse_steps_per_orbit,
+        workers=workers)
+    return {"origin": origin, "destination": destination, "distance_au": distance, "distance_km": distance * AU_IN_KM,
+            "approach_day_of_year": day, "approach_year": year}
+
+
+def mission_query(planets, distance_au, fuel_mass_kg, dry_mass_kg, sustained_accel, fuel_type) -> dict:
+    """
+    Returns the burn/coast profile of a mission over a distance.
+    """
+    # Only mission queries pay for the rocket model
+    from lib.Rocket import FUEL_EFFICIENCY, STANDARD_GRAVITY, mission_profile
+
+    if fuel_type not in FUEL_EFFICIENCY:
+        raise ValueError("Fuel type must be 'liquid' or 'solid'.")
+    burn_days, coast_days, peak_velocity, total_days = mission_profile(
+        distance_au * AU_IN_KM * 1000, fuel_mass_kg, dry_mass_kg, sustained_accel, FUEL_EFFICIENCY[fuel_type] * STANDARD_GRAVITY
+    )
+    return {"distance_au": distance_au, "total_time_days": float(total_days), "burn_time_days": float(burn_days),
+            "coasting_time_days": float(coast_days), "peak_velocity_km_s": float(peak_velocity) / 1000}
+
+
+# Queries taking (planets, **parameters); parse_query fills in their defaults
+QUERIES = {"distance": distance_query, "closest": closest_query, "mission": mission_query}
+
+
+def parse_query(planets: dict, query_type: str, params: dict) -> dict:
+    """
+    Turns string parameters (a query string, a CSV row) into the full keyword arguments of a query, with
+    defaults filled in, so that equivalent queries compare equal.
+
+    :param planets: Dict of planets keyed by name.
+    :param query_type: A key of QUERIES.
+    :param params: Dict of parameter values; empty strings count as missing.
+    :return: Dict of keyword arguments for QUERIES[query_type].
+    """
+    params = {name: value for name, value in params.items() if value not in (None, "")}
+
+    def number(name, default=None):
+        if name not in params:
+            if default is None:
+                raise ValueError(f"Missing parameter {name}.")
+            return default
+        try:
+            return float(params[name])
+        except (TypeError, ValueError):
+            raise ValueError(f"Parameter {name} must be a number.") from None
+
+    def body(name):
+        if name not in params:
+            raise ValueError(f"Missing parameter {name}.")
+        return find_body(planets, params[name]).name
+
+    def pair():
+        origin, destination = body("origin"), body("destination")
+        same_system(planets, origin, destination)
+        return origin, destination
+
+    today_day, today_year = Epoch.today()
+    if query_type == "distance":
+        origin, destination = pair()
+        return {"origin": origin, "destination": destination,
+                "day_of_year": number("day_of_year", float(today_day)), "year": int(number("year", today_year))}
+    if query_type == "closest":
+        origin, destination = pair()
+        longer_period = max(planets[origin].period, planets[destination].period)
+        return {"origin": origin, "destination": destination,
+                "start_day": number("start_day", float(today_day)), "start_year": int(number("start_year", today_year)),
+                "span_days": number("span_days", float(longer_period)), "tolerance": number("tolerance", 1.0 / 1440),
+                "coarse_steps_per_orbit": int(number("coarse_steps_per_orbit", 64))}
+    if query_type == "mission":
+        if "distance_au" in params:
+            distance_au = number("distance_au")
+        else:
+            # Without an explicit distance, fly between two bodies as they are placed at an epoch
+            distance_au = distance_query(planets, *pair(),
+                                         number("day_of_year", float(today_day)), int(number("year", today_year)))["distance_au"]
+        return {"distance_au": distance_au, "fuel_mass_kg": number("fuel_mass_kg", 200000.0),
+                "dry_mass_kg": number("dry_mass_kg", 15500.0), "sustained_accel": number("sustained_accel", 0.5),
+                "fuel_type": params.get("fuel_type", "liquid")}
+    raise ValueError(f"Unknown query {query_type}.")
+
+
+def run_batch(planets: dict, queries, workers: int = None):
+    """
+    Evaluates many queries in one process.
+
+    Distance queries are grouped by body pair and evaluated in one vectorized call per pair; repeated
+    queries are computed once. Failing queries yield an "error" entry instead of stopping the batch.
+
+    :param planets: Dict of planets keyed by name.
+    :param queries: Iterable of dicts with a "query" type plus string or numeric parameters.
+    :param workers: Worker processes for each closest-approach search.
+    :return: List of result dicts, in input order. Each echoes its query's fields (e.g. origin and
+        destination of a mission over a distance between them), overridden by the parsed parameters
+        and followed by the results.
+    """
+    results = []
+    parsed = []
+    distances = {}
+    memo = {}
+    for query in queries:
+        query_type = query.get("query", "")
+        echo = {"query": query_type, **query}
+        try:
+            params = parse_query(planets, query_type, {name: value for name, value in query.items() if name != "query"})
+        except ValueError as error:
+            results.append({**echo, "error": str(error)})
+            parsed.append(None)
+            continue
+        if query_type == "distance":
+            distances.setdefault((params["origin"], params["destination"]), []).append(len(results))
+        results.append({**echo, **params})
+        parsed.append(params)
+
+    for (origin, destination), rows in distances.items():
+        days = np.array([parsed[row]["day_of_year"] for row in rows], dtype=np.float64)
+        years = np.array([parsed[row]["year"] for row in rows], dtype=np.float64)
+        separations = planets[origin].get_separations(planets[destination], days, years)
+        for row, distance in zip(rows, separations.tolist()):
+            results[row].update(distance_au=distance, distance_km=distance * AU_IN_KM)
+
+    for row, (result, params) in enumerate(zip(results, parsed)):
+        query_type = result["query"]
+        if query_type == "distance" or params is None:
+            continue
+        key = (query_type, tuple(sorted(params.items())))
+        if key not in memo:
+            options = {"workers": workers} if query_type == "closest" else {}
+            try:
+                memo[key] = QUERIES[query_type](planets, **params, **options)
+            except ValueError as error:
+                memo[key] = {"error": str(error)}
+        result.update(memo[key])
+    return results
@@ -1,6 +1,141 @@
 import math
 from datetime import datetime, timedelta
 
+import numpy as np
+
+from lib import Instrumentation
+
+AU_IN_KM = 149597870.7
+STANDARD_GRAVITY = 9.81  # m/s²
+SECONDS_PER_DAY = 60 * 60 * 24
+
+# Fuel-specific impulse (ISP) in seconds
+FUEL_EFFICIENCY = {
+    "liquid": 450,   # ISP for liquid fuel (~450s for LOX/LH2)
+    "solid": 250     # ISP for solid fuel (~250s for solid rocket motors)
+}
+
+
+def mission_profile(distance_m, fuel_mass_kg, dry_mass_kg, sustained_accel, exhaust_velocity):
+    """
+    Computes the burn/coast profile of a mission. Works on scalars and on broadcastable NumPy arrays.
+
+    :param distance_m: Distance to travel (in m).
+    :param fuel_mass_kg: Fuel carried (in kg).
+    :param dry_mass_kg: Dry mass of the spacecraft (in kg).
+    :param sustained_accel: Acceleration in multiples of g.
+    :param exhaust_velocity: Effective exhaust velocity Ve = ISP * g (in m/s).
+    :return: Tuple (burn_time_days, coasting_time_days, peak_velocity_m_s, total_time_days); the burn time is
+        that of each of the acceleration and deceleration burns, which share the fuel equally.
+    """
+    # Compute total mass at start of burn
+    initial_mass = dry_mass_kg + fuel_mass_kg
+
+    # Compute thrust using F = ma
+    acceleration_m_s2 = sustained_accel * STANDARD_GRAVITY
+    thrust_newtons = initial_mass * acceleration_m_s2
+
+    # Compute correct mass flow rate using ṁ = T / Ve
+    mass_flow_rate = thrust_newtons / exhaust_velocity
+    # Half the tank is kept for the deceleration burn
+    fuel_burn_time_s = 0.5 * fuel_mass_kg / mass_flow_rate
+
+    # Compute distance covered during each burn phase
+    distance_covered_m = 0.5 * acceleration_m_s2 * fuel_burn_time_s**2
+
+    # With fuel to reach the halfway point, burn to it and flip (no coasting); otherwise coast between the burns
+    reaches_halfway = distance_covered_m >= distance_m / 2
+    burn_time_s = np.where(reaches_halfway, np.sqrt(distance_m / acceleration_m_s2), fuel_burn_time_s)
+
+    # Compute peak velocity using v = a * t
+    peak_velocity_m_s = acceleration_m_s2 * burn_time_s
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        coasting_time_s = np.where(reaches_halfway, 0.0, (distance_m - 2 * distance_covered_m) / peak_velocity_m_s)
+
+    burn_time_days = (burn_time_s / SECONDS_PER_DAY)[()]
+    coasting_time_days = (coasting_time_s / SECONDS_PER_DAY)[()]
+
+    # Total travel time
+    total_time_days = 2 * burn_time_days + coasting_time_days
+    return burn_time_days, coasting_time_days, peak_velocity_m_s[()], total_time_days
+
+
+def fuel_for_burn_time(burn_time_s, dry_mass_kg, sustained_accel, exhaust_velocity):
+    """
+    Returns the fuel needed to sustain the acceleration for a burn time, using the thrust model of
+    mission_profile (T = m0 * a, ṁ = T / Ve). Works on scalars and on broadcastable NumPy arrays.
+
+    :param burn_time_s: Burn duration (in s).
+    :param dry_mass_kg: Dry mass of the spacecraft (in kg).
+    :param sustained_accel: Acceleration in multiples of g.
+    :param exhaust_velocity: Effective exhaust velocity Ve = ISP * g (in m/s).
+    :return: Fuel mass (in kg); infinite where the burn cannot be sustained at any fuel load.
+    """
+    # burn_time = fuel * Ve / ((dry + fuel) * a), solved for fuel
+    velocity_budget = np.asarray(burn_time_s * sustained_accel * STANDARD_GRAVITY, dtype=np.float64)
+    shortfall = exhaust_velocity - velocity_budget
+    with np.errstate(divide='ignore'):
+        return np.where(shortfall > 0, velocity_budget * dry_mass_kg / shortfall, np.inf)
+
+
+def fuel_for_delta_v(delta_v_m_s, dry_mass_kg, exhaust_velocity):
+    """
+    Returns the fuel needed for an impulsive velocity change, from the rocket equation
+    delta_v = Ve * ln((dry + fuel) / dry). Works on scalars and on broadcastable NumPy arrays.
+
+    :param delta_v_m_s: Velocity change (in m/s).
+    :param dry_mass_kg: Dry mass of the spacecraft (in kg).
+    :param exhaust_velocity: Effective exhaust velocity Ve = ISP * g (in m/s).
+    :return: Fuel mass (in kg); infinite where the mass ratio overflows.
+    """
+    with np.errstate(over='ignore'):
+        return dry_mass_kg * np.expm1(np.asarray(delta_v_m_s, dtype=np.float64) / exhaust_velocity)
+
+
+@Instrumentation.timed("sweep_missions")
+def sweep_missions(distance_au, fuel_mass_kg, dry_mass_kg, sustained_accel, fuel_type="liquid", grid=False) -> dict:
+    """
+    Evaluates many mission scenarios in one vectorized pass.
+
+    With grid=False the parameters are broadcast against each other; with grid=True every combination
+    of the (1-D) parameter arrays is evaluated, flattened in C order with distance varying slowest.
+
+    :param distance_au: Distance(s) to travel (in AU).
+    :param fuel_mass_kg: Fuel mass(es) carried (in kg).
+    :param dry_mass_kg: Dry mass(es) of the spacecraft (in kg).
+    :param sustained_accel: Acceleration(s) in multiples of g.
+    :param fuel_type: "liquid" or "solid" for the whole sweep.
+    :param grid: Evaluate the Cartesian product of the parameters instead of broadcasting them.
+    :return: Dict of columns: the input parameters plus total_time_days, burn_time_days,
+        coasting_time_days and peak_velocity_km_s.
+    """
+    if fuel_type not in FUEL_EFFICIENCY:
+        raise ValueError("Fuel type must be 'liquid' or 'solid'.")
+
+    parameters = [np.asarray(value, dtype=np.float64) for value in (distance_au, fuel_mass_kg, dry_mass_kg, sustained_accel)]
+    if grid:
+        parameters = [axis.ravel() for axis in np.meshgrid(*(np.ravel(value) for value in parameters), indexing='ij')]
+    else:
+        parameters = np.broadcast_arrays(*parameters)
+    distance_au, fuel_mass_kg, dry_mass_kg, sustained_accel = parameters
+
+    exhaust_velocity = FUEL_EFFICIENCY[fuel_type] * STANDARD_GRAVITY
+    burn_time_days, coasting_time_days, peak_velocity_m_s, total_time_days = mission_profile(
+        distance_au * AU_IN_KM * 1000, fuel_mass_kg, dry_mass_kg, sustained_accel, exhaust_velocity
+    )
+    return {
+        "distance_au": distance_au,
+        "fuel_mass_kg": fuel_mass_kg,
+        "dry_mass_kg": dry_mass_kg,
+        "sustained_acceleration_g": sustained_accel,
+        "total_time_days": total_time_days,
+        "burn_time_days": burn_time_days,
+        "coasting_time_days": coasting_time_days,
+        "peak_velocity_km_s": peak_velocity_m_s / 1000,
+    }
+
+
 class MissionCalculator:
     def __init__(self, distance_au=0.524, fuel_mass_kg=200000, dry_mass_kg=15500, fuel_type="liquid", sustained_accel=0.5):
         """
@@ -11,22 +146,20 @@ class MissionCalculator:
         :param fuel_type: Type of fuel used ("liquid" or "solid").
         :param sustained_accel: Maximum acceleration in multiples of Earth's gravity (g = 9.81 m/s²).
         """
-        self.distance_km = distance_au * 149597870.7  # Convert AU to km
+        self.distance_km = distance_au * AU_IN_KM  # Convert AU to km
         self.dry_mass = dry_mass_kg
         self.fuel_mass = fuel_mass_kg
         self.fuel_type = fuel_type
         self.sustained_accel = sustained_accel  # Desired acceleration in g-force
-        self.g = 9.81  # Gravity in m/s²
+        self.g = STANDARD_GRAVITY  # Gravity in m/s²
 
         # Fuel-specific impulse (ISP) in seconds
-        self.fuel_efficiency = {
-            "liquid": 450,   # ISP for liquid fuel (~450s for LOX/LH2)
-            "solid": 250     # ISP for solid fuel (~250s for solid rocket motors)
-        }
+        self.fuel_efficiency = dict(FUEL_EFFICIENCY)
 
         if fuel_type not in self.fuel_efficiency:
             raise ValueError("Fuel type must be 'liquid' or 'solid'.")
 
+    @Instrumentation.timed("calculate_mission_time")
     def calculate_mission_time(self):
         """
         Compute acceleration, coasting, and deceleration time while respecting available fuel mass.
@@ -42,41 +175,11 @@ class MissionCalculator:
 
         # Effective exhaust velocity (Ve = ISP * g)
         exhaust_velocity = self.fuel_efficiency[self.fuel_type] * self.g  # m/s
-
-        # Compute total mass at start and end of burn
-        initial_mass = self.dry_mass + self.fuel_mass  # Total mass with fuel
-        final_mass = self.dry_mass  # Mass after all fuel is burned
-
-        # Compute thrust using F = ma
         acceleration_m_s2 = self.sustained_accel * self.g  # m/s²
-        thrust_newtons = initial_mass * acceleration_m_s2  # F = m * a
-
-        # Compute correct mass flow rate using ṁ = T / Ve
-        mass_flow_rate = thrust_newtons / exhaust_velocity  # kg/s
-        burn_time_s = self.fuel_mass / mass_flow_rate  # Time until fuel runs out
-        burn_time_days = burn_time_s / (60 * 60 * 24)  # Convert to days
-
-        # Print burn time for debugging
-        print(f"Burn time (s): {burn_time_s}")  # Should vary with fuel mass
-
-        # Compute peak velocity using v = a * t
-        peak_velocity_m_s = acceleration_m_s2 * burn_time_s
-
-        # Compute distance covered during burn phase
-        distance_covered_m = 0.5 * acceleration_m_s2 * burn_time_s**2  
-
-        # Check if fuel is enough to reach halfway point
-        if distance_covered_m >= distance_m / 2:
-            # Fuel is sufficient for full acceleration phase
-            accel_time_days = burn_time_days
-            coasting_time_days = ((distance_m - 2 * distance_covered_m) / (2 * peak_velocity_m_s)) / (60 * 60 * 24)
-        else:
-            # Fuel runs out before reaching halfway point, switch to coasting early
-            accel_time_days = burn_time_days
-            coasting_time_days = ((distance_m - 2 * distance_covered_m) / (2 * peak_velocity_m_s)) / (60 * 60 * 24)
 
-        # Total travel time
-        total_time_days = 2 * accel_time_days + coasting_time_days
+        accel_time_days, coasting_time_days, peak_velocity_m_s, total_time_days = map(float, mission_profile(
+            distance_m, self.fuel_mass, self.dry_mass, self.sustained_accel, exhaust_velocity
+        ))
 
         # Calculate arrival date
         today = datetime.today()
@@ -93,10 +196,11 @@ class MissionCalculator:
             "arrival_date": arrival_date.strftime("%Y-%m-%d")
         }
 
-# Example Usage:
-mission = MissionCalculator(distance_au=0.524, fuel_mass_kg=8000, dry_mass_kg=15500, fuel_type="liquid", sustained_accel=0.2)
-result = mission.calculate_mission_time()
+if __name__ == "__main__":
+    # Example Usage:
+    mission = MissionCalculator(distance_au=0.524, fuel_mass_kg=8000, dry_mass_kg=15500, fuel_type="liquid", sustained_accel=0.2)
+    result = mission.calculate_mission_time()
 
-# Print results
-for key, value in result.items():
-    print(f"{key}: {value}")
+    # Print results
+    for key, value in result.items():
+        print(f"{key}: {value}")
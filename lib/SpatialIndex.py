@@ -0,0 +1,157 @@
+from itertools import chain, product
+
+import numpy as np
+
+from lib.Propagator import Propagator
+
+
+class SpatialIndex:
+    def __init__(self, bodies, day_of_year: float, year: int, cell_size: float = 0.25):
+        """
+        Initializes a uniform-grid index of body positions at an epoch.
+
+        Advancing the epoch propagates every body in one vectorized call and only moves the bodies whose
+        grid cell changed, instead of rebuilding the index.
+
+        :param bodies: List of Planet instances or a Catalog.
+        :param day_of_year: Day of the year of the indexed epoch.
+        :param year: Year of the indexed epoch.
+        :param cell_size: Edge length of a grid cell (in AU); roughly the typical query radius works well.
+        """
+        self._bodies = bodies
+        self._cell_size = cell_size
+        self._propagator = Propagator(bodies, day_of_year, year)
+        self._keys = self._cell_keys(self._propagator.positions)
+        self._bounds = self._key_bounds(self._keys)
+        self._cells = {}
+        for index, key in enumerate(map(tuple, self._keys.tolist())):
+            self._cells.setdefault(key, set()).add(index)
+
+    def __len__(self):
+        return len(self._keys)
+
+    @property
+    def bodies(self): return self._bodies
+
+    @property
+    def days(self): return self._propagator.days
+
+    @property
+    def positions(self): return self._propagator.positions
+
+    @property
+    def cell_size(self): return self._cell_size
+
+    def _cell_keys(self, positions):
+        return np.floor(positions / self._cell_size).astype(np.int64)
+
+    @staticmethod
+    def _key_bounds(keys):
+        if not len(keys):
+            return np.zeros(3, dtype=np.int64), np.zeros(3, dtype=np.int64)
+        return keys.min(axis=0), keys.max(axis=0)
+
+    def _update(self):
+        keys = self._cell_keys(self._propagator.positions)
+        moved = np.flatnonzero((keys != self._keys).any(axis=1))
+        for index, old, new in zip(moved.tolist(), map(tuple, self._keys[moved].tolist()), map(tuple, keys[moved].tolist())):
+            cell = self._cells[old]
+            cell.discard(index)
+            if not cell:
+                del self._cells[old]
+            self._cells.setdefault(new, set()).add(index)
+        self._keys = keys
+        self._bounds = self._key_bounds(keys)
+        return moved.size
+
+    def advance(self, delta_days: float) -> int:
+        """
+        Moves the indexed epoch by a number of days.
+
+        :param delta_days: Days to advance (negative to go back).
+        :return: Number of bodies that changed cell.
+        """
+        self._propagator.advance(delta_days)
+        return self._update()
+
+    def set_days(self, days: float) -> int:
+        """
+        Moves the indexed epoch to an absolute day (see Epoch.to_days).
+
+        :return: Number of bodies that changed cell.
+        """
+        self._propagator.set_days(days)
+        return self._update()
+
+    def _candidates(self, lower, upper):
+        """
+        Returns the indices of bodies in every cell overlapping the box [lower, upper] of cell keys.
+        """
+        spans = [range(low, high + 1) for low, high in zip(lower, upper)]
+        if np.prod([len(span) for span in spans]) > len(self._cells):
+            # Big boxes: scanning the occupied cells is cheaper than enumerating the box
+            cells = (members for key, members in self._cells.items()
+                     if all(low <= axis <= high for axis, low, high in zip(key, lower, upper)))
+        else:
+            cells = (self._cells[key] for key in product(*spans) if key in self._cells)
+        return np.fromiter(chain.from_iterable(cells), dtype=np.int64)
+
+    def within(self, point, radius: float) -> tuple:
+        """
+        Returns the bodies within a radius of a point at the indexed epoch.
+
+        :param point: x, y, z position (in AU), e.g. a ship or a body's position.
+        :param radius: Search radius (in AU).
+        :return: Tuple (indices, distances) ordered by distance.
+        """
+        point = np.asarray(point, dtype=np.float64)
+        lower = np.floor((point - radius) / self._cell_size).astype(np.int64).tolist()
+        upper = np.floor((point + radius) / self._cell_size).astype(np.int64).tolist()
+        candidates = self._candidates(lower, upper)
+        distances = np.linalg.norm(self._propagator.positions[candidates] - point, axis=-1)
+        inside = distances <= radius
+        candidates, distances = candidates[inside], distances[inside]
+        order = np.argsort(distances)
+        return candidates[order], distances[order]
+
+    def nearest(self, point, k: int = 1) -> tuple:
+        """
+        Returns the k bodies nearest to a point at the indexed epoch.
+
+        Rings of cells are added around the point until k bodies are found inside a sphere that the
+        searched cells fully cover.
+
+        :param point: x, y, z position (in AU).
+        :param k: Number of bodies to return.
+        :return: Tuple (indices, distances) ordered by distance.
+        """
+        point = np.asarray(point, dtype=np.float64)
+        k = min(k, len(self))
+        center = np.floor(point / self._cell_size).astype(np.int64)
+        lowest, highest = self._bounds
+        extent = max(np.max(center - lowest), np.max(highest - center), 0)
+
+        ring = 1
+        while True:
+            candidates = self._candidates((center - ring).tolist(), (center + ring).tolist())
+            distances = np.linalg.norm(self._propagator.positions[candidates] - point, axis=-1)
+            # Everything within ring cells of the point's cell is guaranteed to be searched
+            covered = distances <= ring * self._cell_size
+            if np.count_nonzero(covered) >= k or ring >= extent:
+                break
+            ring *= 2
+
+        order = np.argsort(distances)[:k]
+        return candidates[order], distances[order]
+
+    def within_body(self, index: int, radius: float) -> tuple:
+        """
+        Returns the other bodies within a radius of an indexed body.
+
+        :param index: Row of the body (its position in the bodies list or catalog).
+        :param radius: Search radius (in AU).
+        :return: Tuple (indices, distances) ordered by distance, excluding the body itself.
+        """
+        indices, distances = self.within(self._propagator.positions[index], radius)
+        keep = indices != index
+        return indices[keep], distances[keep]
@@ -8,13 +8,13 @@ class Star:
         self._au_in_km = AU_IN_KM
 
     def __str__(self):
-        return f"{self.name} is a {self.star_type.name} star."
+        return f"{self.name} is a {self.type.name} star."
 
     def __repr__(self):
-        return f"Star({self.name}, {self.star_type})"
+        return f"Star({self.name}, {self.type})"
     
     def __eq__(self, other):
-        return self.name == other.name and self.star_type == other.star_type
+        return self.name == other.name and self.type == other.type
     
     @property
     def name(self): return self._name
@@ -1,5 +1,8 @@
 from Config import load_from_json
 from datetime import datetime, timedelta
+from lib import Epoch
+from lib.Conjunction import closest_approach_by_system
+from lib.EphemerisCache import EphemerisCache
 
 if __name__ == "__main__":
 
@@ -7,7 +10,9 @@ if __name__ == "__main__":
         date = datetime(int(year), 1, 1) + timedelta(days=day_of_year - 1)
         return date.strftime("%d %B")
 
-    stars, planets = load_from_json("./config/solarsystem.json")
+    config_path = "./config/solarsystem.json"
+    stars, planets = load_from_json(config_path)
+    cache = EphemerisCache(cache_dir="./.ephemeris_cache", config_path=config_path)
 
     for planet in planets:
         print(f"Details for {planet.name}: ---->")
@@ -15,17 +20,26 @@ if __name__ == "__main__":
         farthest = planet.get_farthest_approach()
         orbital_distance = planet.get_orbital_distance(36.0, 2025)
 
-        print(f"Closest approach to {planet.star.name}: {closest} and in km: {int(round(closest[2] * planet.star.au_in_km, 0)): ,} km")
-        print(f"Farthest approach from {planet.star.name}: {farthest} and in km: {int(round(farthest[2] * planet.star.au_in_km, 0)): ,} km")
+        print(f"Closest approach to {planet.orbit.primary.name}: {closest} and in km: {int(round(closest[2] * planet.star.au_in_km, 0)): ,} km")
+        print(f"Farthest approach from {planet.orbit.primary.name}: {farthest} and in km: {int(round(farthest[2] * planet.star.au_in_km, 0)): ,} km")
         print(f"Orbital distance in km on 5th of Feb: {int(round(orbital_distance * planet.star.au_in_km, 0)): ,} km")
 
-    earth = next(planet for planet in planets if planet.name == "Earth")
-    mars = next(planet for planet in planets if planet.name == "Mars")
-    jupiter = next(planet for planet in planets if planet.name == "Jupiter")
+    # One shared ephemeris per star system. The window starts on the first day of the year and covers the
+    # longest orbital period from any day in it, so persisted tables are reused all year, not for one day
+    _, current_year = Epoch.today()
+    longest_period = max(planet.period for planet in planets)
+    systems = closest_approach_by_system(planets, 1, current_year, longest_period + 366, cache=cache)
 
-    closest_distance_1, closest_time_1 = earth.find_closest_distance(mars)
-    closest_distance_2, closest_time_2 = earth.find_closest_distance(jupiter)
-    print(f"Closest distance between Earth and Mars: {int(round(closest_distance_1 * earth.star.au_in_km, 0)): ,} km")
-    print(f"Occurs on {format_day_of_year(closest_time_1[0], closest_time_1[1])} of year {int(closest_time_1[1])}")
-    print(f"Closest distance between Earth and Jupiter: {int(round(closest_distance_2 * earth.star.au_in_km, 0)): ,} km")
-    print(f"Occurs on {format_day_of_year(closest_time_2[0], closest_time_2[1])} of year {int(closest_time_2[1])}")
\ No newline at end of file
+    names, distances, days_of_year, years = systems["Sol"]
+    names = list(names)
+    earth, mars, jupiter = names.index("Earth"), names.index("Mars"), names.index("Jupiter")
+    au_in_km = stars["Sol"].au_in_km
+    for other in (mars, jupiter):
+        print(f"Closest distance between Earth and {names[other]}: {int(round(distances[earth, other] * au_in_km, 0)): ,} km")
+        print(f"Occurs on {format_day_of_year(days_of_year[earth, other], years[earth, other])} of year {int(years[earth, other])}")
+
+    for star, (names, distances, _, _) in systems.items():
+        print(f"Closest approach matrix of the {star} system (AU):")
+        print(" " * 10 + "".join(f"{name:>10}" for name in names))
+        for i, name in enumerate(names):
+            print(f"{name:>10}" + "".join(f"{distance:>10.3f}" for distance in distances[i]))
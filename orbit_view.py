@@ -0,0 +1,178 @@
+import os
+import sys
+
+import numpy as np
+import pygame
+
+import Config as cf
+from lib import Epoch
+from lib.Propagator import Propagator
+
+# Window layout
+width, height = 1000, 1000
+slider_height = 60
+view_radius = (min(width, height - slider_height) // 2) - 20
+view_center = (width // 2, (height - slider_height) // 2)
+
+# Timeline: the slider spans this many years from the start date
+timeline_years = 200
+target_fps = 60
+
+black = (0, 0, 0)
+yellow = (255, 255, 0)
+grey = (70, 70, 70)
+white = (230, 230, 230)
+green = (0, 255, 0)
+
+
+def to_screen(positions, max_distance):
+    """
+    Projects x/y positions (AU) onto the screen.
+
+    A square-root radial scale keeps the inner planets visible next to Neptune.
+    """
+    radius = np.linalg.norm(positions[..., :2], axis=-1)
+    scale = np.sqrt(radius / max_distance) * view_radius / np.maximum(radius, 1e-12)
+    x = view_center[0] + positions[..., 0] * scale
+    y = view_center[1] - positions[..., 1] * scale
+    return np.stack([x, y], axis=-1)
+
+
+def load_icons(planets, size):
+    icons = []
+    for planet in planets:
+        path = f"./media/{planet.name.lower()}.png"
+        if os.path.exists(path):
+            icons.append(pygame.transform.scale(pygame.image.load(path).convert_alpha(), (size, size)))
+        else:
+            # Bodies without artwork (asteroids, small moons) are drawn as dots
+            icon = pygame.Surface((size, size), pygame.SRCALPHA)
+            pygame.draw.circle(icon, white, (size // 2, size // 2), max(size // 4, 1))
+            icons.append(icon)
+    return icons
+
+
+def draw_background(propagator, max_distance):
+    """
+    Renders the static layer (star and orbit paths) once; frames only restore pieces of it.
+
+    Moons move with their parents, so only orbits around the star have a fixed path.
+    """
+    background = pygame.Surface((width, height))
+    background.fill(black)
+    for planet, path in zip(propagator.planets, to_screen(propagator.sample_orbits(), max_distance)):
+        if planet.parent is None:
+            pygame.draw.lines(background, grey, True, [tuple(point) for point in path], 1)
+    pygame.draw.circle(background, yellow, view_center, 8)
+    return background
+
+
+def draw_timeline(surface, font, fraction, days, speed):
+    rect = pygame.Rect(0, height - slider_height, width, slider_height)
+    surface.fill(black, rect)
+    track = pygame.Rect(20, rect.centery - 3, width - 40, 6)
+    pygame.draw.rect(surface, grey, track)
+    handle_x = track.left + int(fraction * track.width)
+    pygame.draw.circle(surface, green, (handle_x, track.centery), 9)
+    day_of_year, year = Epoch.from_days(days)
+    label = font.render(f"Day {float(day_of_year):6.1f} of {int(year)}   {speed:g} days/s   [space] play/pause  [up/down] speed",
+                        True, white)
+    surface.blit(label, (20, rect.top + 2))
+    return rect, track
+
+
+def main(config_path="./config/solarsystem.json", star=None):
+    """
+    Opens the animated view of one star system.
+
+    :param config_path: Catalog to load.
+    :param star: Name of the star whose system is shown; None shows the first star with bodies.
+    """
+    stars, planets = cf.load_from_json(config_path)
+    if star is None:
+        star = planets[0].star.name
+    planets = [planet for planet in planets if planet.star.name == star]
+    if not planets:
+        raise ValueError(f"No bodies orbit {star}.")
+
+    pygame.init()
+    screen = pygame.display.set_mode((width, height))
+    pygame.display.set_caption(f"Orbital view: {star}")
+    font = pygame.font.SysFont(None, 20)
+    clock = pygame.time.Clock()
+
+    start_day, start_year = Epoch.today()
+    start = float(Epoch.to_days(start_day, start_year))
+    span = timeline_years * Epoch.DAYS_PER_YEAR
+    propagator = Propagator(planets, start_day, start_year)
+    max_distance = max(planet.get_farthest_approach()[2] for planet in planets if planet.parent is None)
+
+    icon_size = 18
+    icons = load_icons(planets, icon_size)
+    background = draw_background(propagator, max_distance)
+    screen.blit(background, (0, 0))
+    pygame.display.flip()
+
+    speed = 30.0  # days per second
+    playing = True
+    dragging = False
+    previous_rects = []
+
+    running = True
+    while running:
+        elapsed = clock.tick(target_fps) / 1000.0
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+            elif event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_SPACE:
+                    playing = not playing
+                elif event.key == pygame.K_UP:
+                    speed *= 2
+                elif event.key == pygame.K_DOWN:
+                    speed /= 2
+            elif event.type == pygame.MOUSEBUTTONDOWN and event.pos[1] >= height - slider_height:
+                dragging = True
+            elif event.type == pygame.MOUSEBUTTONUP:
+                dragging = False
+
+        days = propagator.days
+        if dragging:
+            fraction = min(max((pygame.mouse.get_pos()[0] - 20) / (width - 40), 0.0), 1.0)
+            days = start + fraction * span
+        elif playing:
+            days = min(days + speed * elapsed, start + span)
+        if days != propagator.days:
+            propagator.set_days(days)
+
+        # Restore the background under last frame's sprites, then draw this frame's
+        dirty = []
+        for rect in previous_rects:
+            screen.blit(background, rect, rect)
+            dirty.append(rect)
+
+        current_rects = []
+        for icon, (x, y) in zip(icons, to_screen(propagator.positions, max_distance)):
+            rect = icon.get_rect(center=(int(x), int(y)))
+            screen.blit(icon, rect)
+            current_rects.append(rect)
+        dirty.extend(current_rects)
+        previous_rects = current_rects
+
+        timeline_rect, _ = draw_timeline(screen, font, (propagator.days - start) / span, propagator.days, speed)
+        dirty.append(timeline_rect)
+
+        fps_surface = font.render(f"{clock.get_fps():5.1f} FPS", True, white)
+        fps_rect = fps_surface.get_rect(topleft=(10, 10))
+        screen.blit(background, fps_rect.inflate(40, 0), fps_rect.inflate(40, 0))
+        screen.blit(fps_surface, fps_rect)
+        dirty.append(fps_rect.inflate(40, 0))
+
+        pygame.display.update(dirty)
+
+    pygame.quit()
+    sys.exit()
+
+
+if __name__ == "__main__":
+    main()
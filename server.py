@@ -0,0 +1,220 @@
+import argparse
+import asyncio
+import json
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import parse_qsl, urlsplit
+
+import Config as cf
+from lib.ConfigWatcher import ConfigWatcher, ResultCache
+from lib.Queries import QUERIES, parse_query, systems
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+HTTP_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 500: "Internal Server Error"}
+
+# Per-process state installed by _init_worker so every worker loads the catalog once
+_worker_state = {}
+
+
+# Queries expensive enough to leave the event loop
+POOLED = {"closest"}
+
+
+def _init_worker(config_path):
+    _worker_state["watcher"] = ConfigWatcher(config_path, cf.load_from_json)
+    _worker_state["systems"] = systems({planet.name: planet for planet in _worker_state["watcher"].planets})
+
+
+def _run_query(endpoint, star, params):
+    # Workers follow edits to the configuration on their own, so the pool survives reloads
+    if _worker_state["watcher"].poll():
+        _worker_state["systems"] = systems({planet.name: planet for planet in _worker_state["watcher"].planets})
+    return QUERIES[endpoint](_worker_state["systems"].get(star, {}), **params)
+
+
+def _query_bodies(params) -> tuple:
+    """
+    Returns the names of the bodies a query's result depends on.
+    """
+    return tuple(params[name] for name in ("origin", "destination") if name in params)
+
+
+class QueryService:
+    def __init__(self, config_path, workers: int = None, cache_size: int = 1024):
+        """
+        Initializes a long-running query service over one loaded catalog.
+
+        Results are cached by their normalized parameters (bodies, window, step) with LRU eviction, and
+        identical queries that arrive while one is being computed wait for that computation instead of
+        starting their own. The configuration is reloaded when it changes on disk, dropping only the
+        results of the bodies that changed. Queries only see the bodies of their own star system.
+
+        :param config_path: Configuration file loaded at startup (and once per worker), then watched.
+        :param workers: Number of worker processes for the searches; 0 computes everything in-process.
+        :param cache_size: Number of results kept.
+        """
+        self._watcher = ConfigWatcher(config_path, cf.load_from_json)
+        self._planets = {planet.name: planet for planet in self._watcher.planets}
+        self._systems = systems(self._planets)
+        self._executor = None
+        if workers != 0:
+            self._executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(config_path,))
+        self._results = ResultCache(cache_size)
+        self._pending = {}
+        self._stats = {"hits": 0, "computed": 0, "coalesced": 0, "reloads": 0, "invalidated": 0}
+
+    @property
+    def planets(self): return self._planets
+
+    @property
+    def systems(self): return self._systems
+
+    @property
+    def stats(self): return dict(self._stats, cached=len(self._results), in_flight=len(self._pending),
+                                 config_version=self._watcher.version)
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+
+    def reload(self) -> set:
+        """
+        Picks up changes to the configuration file.
+
+        :return: Names of the bodies that changed.
+        """
+        changed = self._watcher.poll()
+        if changed:
+            self._planets = {planet.name: planet for planet in self._watcher.planets}
+            self._systems = systems(self._planets)
+            self._stats["reloads"] += 1
+            self._stats["invalidated"] += self._results.invalidate(changed)
+            # Queries still running against the old bodies finish for their callers but are not joined again
+            for key in [key for key in self._pending if changed.intersection(_query_bodies(dict(key[1])))]:
+                del self._pending[key]
+        return changed
+
+    async def _compute(self, key, endpoint, params):
+        version = self._watcher.version
+        bodies = _query_bodies(params)
+        star = self._planets[bodies[0]].star.name if bodies else None
+        if endpoint in POOLED and self._executor is not None:
+            result = await asyncio.get_running_loop().run_in_executor(self._executor, _run_query, endpoint, star, params)
+        else:
+            result = QUERIES[endpoint](self._systems.get(star, {}), **params)
+        if version == self._watcher.version:
+            self._results.put(key, bodies, result)
+        return result
+
+    def _forget(self, key, pending):
+        # A reload may already have replaced the entry with a computation against the new bodies
+        if self._pending.get(key) is pending:
+            del self._pending[key]
+
+    async def query(self, endpoint, params: dict) -> dict:
+        """
+        Answers a parsed query from the cache, by joining an identical in-flight query, or by computing it.
+        """
+        key = (endpoint, tuple(sorted(params.items())))
+        if key in self._results:
+            self._stats["hits"] += 1
+            return self._results.get(key)
+
+        pending = self._pending.get(key)
+        if pending is None:
+            self._stats["computed"] += 1
+            pending = asyncio.ensure_future(self._compute(key, endpoint, params))
+            self._pending[key] = pending
+            pending.add_done_callback(lambda done: self._forget(key, done))
+        else:
+            self._stats["coalesced"] += 1
+        # A disconnecting client must not cancel the computation the others are waiting on
+        return await asyncio.shield(pending)
+
+    async def dispatch(self, method: str, target: str) -> tuple:
+        """
+        Routes one request.
+
+        :return: Tuple (status, JSON-serializable body).
+        """
+        if method != "GET":
+            return 405, {"error": "Only GET is supported."}
+        self.reload()
+        url = urlsplit(target)
+        endpoint = url.path.strip("/")
+        query = dict(parse_qsl(url.query))
+        if endpoint == "bodies":
+            if "star" not in query:
+                return 200, {"bodies": list(self._planets)}
+            if query["star"] not in self._systems:
+                return 400, {"error": f"No bodies orbit {query['star']}."}
+            return 200, {"bodies": list(self._systems[query["star"]])}
+        if endpoint == "systems":
+            return 200, {star: list(bodies) for star, bodies in self._systems.items()}
+        if endpoint == "stats":
+            return 200, self.stats
+        if endpoint not in QUERIES:
+            return 404, {"error": f"Unknown endpoint /{endpoint}."}
+        try:
+            return 200, await self.query(endpoint, parse_query(self._planets, endpoint, query))
+        except ValueError as error:
+            return 400, {"error": str(error)}
+
+    async def handle(self, reader, writer):
+        """
+        Serves one HTTP/1.1 request per connection.
+        """
+        try:
+            request_line = (await reader.readline()).decode("latin-1")
+            # Headers carry nothing the queries need
+            while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                pass
+            parts = request_line.split()
+            if len(parts) != 3:
+                status, body = 400, {"error": "Malformed request line."}
+            else:
+                try:
+                    status, body = await self.dispatch(parts[0], parts[1])
+                except Exception as error:
+                    status, body = 500, {"error": repr(error)}
+
+            payload = json.dumps(body).encode()
+            writer.write(
+                f"HTTP/1.1 {status} {HTTP_REASONS[status]}\r\nContent-Type: application/json\r\n"
+                f"Content-Length: {len(payload)}\r\nConnection: close\r\n\r\n".encode("latin-1") + payload
+            )
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+
+async def serve(config_path, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, workers: int = None,
+                cache_size: int = 1024):
+    """
+    Runs the query service until cancelled.
+    """
+    service = QueryService(config_path, workers, cache_size)
+    server = await asyncio.start_server(service.handle, host, port)
+    print(f"Serving {len(service.planets)} bodies on http://{host}:{port}")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        service.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local HTTP service for distance, closest-approach and mission queries.")
+    parser.add_argument("--config", default="./config/solarsystem.json")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--workers", type=int, default=None, help="worker processes for searches; 0 runs them in-process")
+    parser.add_argument("--cache-size", type=int, default=1024)
+    arguments = parser.parse_args()
+    try:
+        asyncio.run(serve(arguments.config, arguments.host, arguments.port, arguments.workers, arguments.cache_size))
+    except KeyboardInterrupt:
+        pass
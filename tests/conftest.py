@@ -0,0 +1,43 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+CONFIG_PATH = os.path.join(ROOT, "config", "solarsystem.json")
+
+
+@pytest.fixture(scope="session")
+def config_path():
+    return CONFIG_PATH
+
+
+@pytest.fixture(scope="session")
+def planets():
+    import Config as cf
+
+    _, planets = cf.load_from_json(CONFIG_PATH)
+    return {planet.name: planet for planet in planets}
+
+
+@pytest.fixture(scope="session")
+def two_systems_path(tmp_path_factory):
+    # The configured system plus a red dwarf with a planet and a moon of its own
+    import json
+
+    with open(CONFIG_PATH) as file:
+        data = json.load(file)
+    data["stars"].append({"name": "Proxima", "mass": 0.12, "type": "M", "AU": 149597879})
+    orbit = {"eccentricity": 0.1, "perihelion_day": 1.0, "perihelion_year": 2024, "inclination": 0.0,
+             "ascending_node": 0.0, "argument_of_perihelion": 0.0, "star": "Proxima"}
+    data["planets"].insert(1, {"name": "Proxima b", "mass": 1.1, "radius": 1.0, "type": "TERRESTRIAL",
+                               "orbit": dict(orbit, semi_major_axis=0.05, period=11.2)})
+    data["planets"].append({"name": "Proxima c", "mass": 7.0, "radius": 2.0, "type": "ICE_GIANT",
+                            "orbit": dict(orbit, semi_major_axis=1.5, period=1900)})
+    data["planets"].append({"name": "Proxima c I", "mass": 0.01, "radius": 0.2, "type": "MOON",
+                            "orbit": dict(orbit, semi_major_axis=0.003, period=20, primary="Proxima c")})
+    path = tmp_path_factory.mktemp("config") / "two_systems.json"
+    path.write_text(json.dumps(data))
+    return str(path)
@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+
+from lib import ApproachSearch
+
+
+def wavy(times):
+    return np.cos(times) + 0.3 * np.cos(2.7 * times) + 2.0
+
+
+@pytest.mark.parametrize("points", [1, 2, 7, 50, 1000])
+def test_shards_find_the_minima_of_the_whole_grid(points):
+    grid = ApproachSearch.coarse_grid(0.0, 100.0, 0.3)
+    whole = ApproachSearch.shard_minima(wavy, grid, 0, grid.size, 1e-9)
+    parts = []
+    for first in range(0, grid.size, points):
+        last = min(first + points, grid.size)
+        low, high = max(first - 1, 0), min(last + 1, grid.size)
+        parts.append(ApproachSearch.shard_minima(wavy, grid[low:high], first - low, last - low, 1e-9))
+    for sharded, expected in zip((np.concatenate(part) for part in zip(*parts)), whole):
+        np.testing.assert_array_equal(sharded, expected)
+
+
+def test_minima_match_a_dense_scan():
+    # Shallow minima only show up once the coarse step resolves them
+    times, values = ApproachSearch.find_local_minima(wavy, 0.0, 100.0, 0.05, 1e-9)
+    dense = np.linspace(0.0, 100.0, 1_000_001)
+    samples = wavy(dense)
+    rows = np.flatnonzero((samples[1:-1] < samples[:-2]) & (samples[1:-1] < samples[2:])) + 1
+    np.testing.assert_allclose(times, dense[rows], atol=1e-4)
+    assert (values <= samples[rows] + 1e-12).all()
+
+
+def test_window_ends_are_candidates():
+    times, _ = ApproachSearch.find_local_minima(lambda t: t, 0.0, 10.0, 1.0, 1e-9)
+    np.testing.assert_allclose(times, [0.0], atol=1e-8)
+    assert ApproachSearch.bracket_minima(np.ones(5)).size == 0
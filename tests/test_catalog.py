@@ -0,0 +1,46 @@
+import sys
+
+import numpy as np
+
+import Config as cf
+
+
+def test_catalog_views_match_planets(config_path, planets):
+    _, catalog = cf.load_catalog(config_path)
+    for view in catalog:
+        planet = planets[view.name]
+        assert view == planet
+        assert str(view) == str(planet)
+        assert repr(view) == repr(planet)
+        assert view.orbit.elements == planet.orbit.elements
+        np.testing.assert_allclose(view.get_orbital_positions(100, 2025), planet.get_orbital_positions(100, 2025))
+
+
+class _Row:
+    __slots__ = ("_catalog", "_index")
+
+
+def test_catalog_views_carry_only_their_row(config_path):
+    _, catalog = cf.load_catalog(config_path)
+    view = catalog[0]
+    assert not hasattr(view, "__dict__")
+    assert sys.getsizeof(view) == sys.getsizeof(view.orbit) == sys.getsizeof(_Row())
+
+
+def test_star_repr(planets):
+    assert repr(planets["Earth"].star) == "Star(Sol, StarType.G)"
+
+
+def test_partition_keeps_moons_with_their_parents(two_systems_path):
+    _, catalog = cf.load_catalog(two_systems_path)
+    systems = catalog.partition()
+    assert list(systems) == ["Sol", "Proxima"]
+    assert list(systems["Proxima"].names) == ["Proxima b", "Proxima c", "Proxima c I"]
+    assert sum(len(system) for system in systems.values()) == len(catalog)
+
+    positions = catalog.get_positions(100, 2025)
+    names = list(catalog.names)
+    for system in systems.values():
+        rows = [names.index(name) for name in system.names]
+        np.testing.assert_array_equal(system.get_positions(100, 2025), positions[rows])
+    assert catalog.partition() is systems
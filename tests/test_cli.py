@@ -0,0 +1,66 @@
+import csv
+import json
+import subprocess
+import sys
+
+import pytest
+
+import cli
+from conftest import ROOT
+
+
+def test_batch_matches_single_queries(config_path, tmp_path, capsys):
+    queries = tmp_path / "queries.csv"
+    queries.write_text(
+        "query,origin,destination,day_of_year,year,distance_au,span_days\n"
+        "distance,Earth,Mars,10,2025,,\n"
+        "distance,Earth,Mars,200,2025,,\n"
+        "closest,Earth,Venus,10,2025,,400\n"
+        "mission,,,,,1.5,\n"
+        "distance,Earth,Pluto,10,2025,,\n"
+    )
+    output = tmp_path / "results.csv"
+    cli.main(["--config", config_path, "batch", str(queries), "--output", str(output)])
+    assert "1 of 5 queries failed." in capsys.readouterr().err
+
+    with open(output, newline="") as file:
+        rows = list(csv.DictReader(file))
+    assert [row["query"] for row in rows] == ["distance", "distance", "closest", "mission", "distance"]
+    assert rows[4]["error"] == "Unknown body Pluto."
+
+    cli.main(["--config", config_path, "distance", "Earth", "Mars", "--day-of-year", "200", "--year", "2025"])
+    single = json.loads(capsys.readouterr().out)
+    assert float(rows[1]["distance_au"]) == pytest.approx(single["distance_au"], rel=1e-12)
+
+
+def test_unknown_body_exits_with_an_error(config_path):
+    with pytest.raises(SystemExit) as exit_info:
+        cli.main(["--config", config_path, "distance", "Earth", "Pluto"])
+    assert exit_info.value.code == "error: Unknown body Pluto."
+
+
+def test_distance_query_imports_only_what_it_needs(config_path):
+    script = (f"import sys; sys.argv = ['cli.py', '--config', {config_path!r}, 'distance', 'Earth', 'Mars']\n"
+              "import cli; cli.main()\n"
+              "heavy = {'pygame', 'lib.Rocket', 'concurrent.futures', 'server'} & set(sys.modules)\n"
+              "assert not heavy, heavy")
+    subprocess.run([sys.executable, "-c", script], cwd=ROOT, check=True, capture_output=True)
+
+
+def test_batch_rows_echo_their_queries(config_path, tmp_path):
+    queries = tmp_path / "queries.jsonl"
+    queries.write_text(
+        '{"query": "mission", "origin": "Earth", "destination": "Mars", "day_of_year": 10, "year": 2025}\n'
+        '{"query": "closest", "origin": "Earth", "destination": "Venus", "start_day": 10, "start_year": 2025, '
+        '"span_days": 400, "label": "venus"}\n'
+        '{"query": "mission", "origin": "Earth", "destination": "Pluto"}\n'
+    )
+    output = tmp_path / "results.jsonl"
+    cli.main(["--config", config_path, "batch", str(queries), "--output", str(output)])
+    mission, closest, failed = [json.loads(line) for line in output.read_text().splitlines()]
+
+    assert (mission["origin"], mission["destination"], mission["day_of_year"]) == ("Earth", "Mars", 10)
+    assert mission["total_time_days"] > 0
+    assert (closest["label"], closest["start_day"], closest["start_year"]) == ("venus", 10.0, 2025)
+    assert 2025 <= closest["approach_year"] <= 2026
+    assert (failed["origin"], failed["destination"], failed["error"]) == ("Earth", "Pluto", "Unknown body Pluto.")
@@ -0,0 +1,102 @@
+import json
+
+import numpy as np
+import pytest
+
+import Config as cf
+from lib.PlanetType import PlanetType
+
+
+def test_streaming_type_filter_keeps_parents_of_moons(config_path):
+    _, catalog = cf.load_streaming(config_path, planet_type=PlanetType.MOON)
+    assert list(catalog.names) == ["Earth", "Moon"]
+    assert list(catalog.columns["parent"]) == [-1, 0]
+
+    _, full = cf.load_catalog(config_path)
+    moon = list(full.names).index("Moon")
+    np.testing.assert_array_equal(catalog.get_positions(100, 2025)[1], full.get_positions(100, 2025)[moon])
+
+
+def test_streaming_type_filter_without_moons(config_path):
+    _, catalog = cf.load_streaming(config_path, planet_type=PlanetType.TERRESTRIAL)
+    assert list(catalog.names) == ["Mercury", "Venus", "Earth", "Mars"]
+    assert (catalog.columns["parent"] == -1).all()
+
+
+def assert_same_catalog(actual, expected):
+    assert list(actual.names) == list(expected.names)
+    assert [star.name for star in actual.stars] == [star.name for star in expected.stars]
+    for name, column in expected.columns.items():
+        np.testing.assert_array_equal(actual.columns[name], column)
+
+
+def test_streaming_json_matches_full_load(config_path):
+    with open(config_path) as file:
+        data = json.load(file)
+    expected_records = [("star", star) for star in data["stars"]] + [("planet", planet) for planet in data["planets"]]
+    # Chunks small enough to split keys, numbers and records
+    for chunk_size in (7, 64, 1 << 16):
+        assert list(cf.iter_records(config_path, chunk_size)) == expected_records
+
+    _, expected = cf.load_catalog(config_path)
+    _, catalog = cf.load_streaming(config_path)
+    assert_same_catalog(catalog, expected)
+
+
+def test_streaming_json_lines_matches_full_load(config_path, tmp_path):
+    with open(config_path) as file:
+        data = json.load(file)
+    path = tmp_path / "catalog.jsonl"
+    # Moons before their parents and stars after the planets must still load
+    lines = [json.dumps(planet) for planet in reversed(data["planets"])]
+    lines += [json.dumps(dict(star, kind="star")) for star in data["stars"]]
+    path.write_text("\n".join(lines) + "\n")
+
+    _, expected = cf.load_catalog(config_path)
+    _, catalog = cf.load_streaming(str(path))
+    assert list(catalog.names) == list(reversed(expected.names))
+    reorder = [list(catalog.names).index(name) for name in expected.names]
+    np.testing.assert_array_equal(catalog.get_positions(100, 2025)[reorder], expected.get_positions(100, 2025))
+
+
+def test_binary_round_trip(config_path, tmp_path):
+    path = str(tmp_path / "catalog.bin")
+    cf.convert_to_binary(config_path, path)
+    stars, catalog = cf.load_binary_catalog(path)
+    expected_stars, expected = cf.load_catalog(config_path)
+    assert_same_catalog(catalog, expected)
+    assert stars == expected_stars
+
+    # A binary catalog saved again from its memory map is byte for byte the same
+    again = str(tmp_path / "again.bin")
+    cf.save_binary_catalog(stars, catalog, again)
+    assert open(again, "rb").read() == open(path, "rb").read()
+
+
+def test_binary_loader_rejects_other_files(config_path):
+    with pytest.raises(ValueError):
+        cf.load_binary_catalog(config_path)
+
+
+@pytest.mark.parametrize("moon_star", [None, "Proxima"])
+def test_moons_orbit_the_star_of_their_parent(two_systems_path, tmp_path, moon_star):
+    with open(two_systems_path) as file:
+        data = json.load(file)
+    moon = next(planet for planet in data["planets"] if planet["name"] == "Moon")
+    if moon_star is None:
+        del moon["orbit"]["star"]
+    else:
+        moon["orbit"]["star"] = moon_star
+    path = tmp_path / "moons.json"
+    path.write_text(json.dumps(data))
+
+    _, planets = cf.load_from_json(str(path))
+    stars = {planet.name: planet.star.name for planet in planets}
+    assert stars["Moon"] == "Sol"
+    for _, catalog in (cf.load_catalog(str(path)), cf.load_streaming(str(path))):
+        assert {view.name: view.star.name for view in catalog} == stars
+
+    _, sol = cf.load_streaming(str(path), star="Sol")
+    assert "Moon" in list(sol.names) and "Proxima c I" not in list(sol.names)
+    _, proxima = cf.load_streaming(str(path), star="Proxima")
+    assert list(proxima.names) == ["Proxima b", "Proxima c", "Proxima c I"]
@@ -0,0 +1,102 @@
+import asyncio
+import json
+import os
+import shutil
+
+import pytest
+
+import Config as cf
+from lib.ConfigWatcher import ConfigWatcher, ResultCache, changed_bodies
+from server import QueryService
+
+
+@pytest.fixture
+def config_copy(config_path, tmp_path):
+    path = str(tmp_path / "solarsystem.json")
+    shutil.copy(config_path, path)
+    return path
+
+
+def edit(path, change):
+    with open(path) as file:
+        data = json.load(file)
+    change(data)
+    stamp = os.stat(path).st_mtime_ns
+    with open(path, "w") as file:
+        json.dump(data, file)
+    # Coarse file system clocks could otherwise hide the edit
+    os.utime(path, ns=(stamp + 10**9, stamp + 10**9))
+
+
+def planet(data, name):
+    return next(record for record in data["planets"] if record["name"] == name)
+
+
+def test_changed_parents_change_their_moons(config_path, config_copy):
+    _, old = cf.load_from_json(config_path)
+    edit(config_copy, lambda data: planet(data, "Earth")["orbit"].update(eccentricity=0.02))
+    _, new = cf.load_from_json(config_copy)
+    assert changed_bodies(old, new) == {"Earth", "Moon"}
+    assert changed_bodies(old, old) == set()
+    assert changed_bodies(old, [body for body in new if body.name != "Mars"]) == {"Earth", "Moon", "Mars"}
+
+
+def test_result_cache_invalidates_by_body():
+    cache = ResultCache()
+    cache.put("a", ("Earth", "Mars"), 1)
+    cache.put("b", ("Venus",), 2)
+    cache.put("c", ("Mars", "Jupiter"), 3)
+    assert cache.invalidate({"Mars"}) == 2
+    assert "a" not in cache and "c" not in cache
+    assert cache.get("b") == 2
+    assert cache.invalidate({"Mars"}) == 0
+
+
+def test_result_cache_evicts_least_recently_used():
+    cache = ResultCache(max_entries=2)
+    cache.put("a", ("Earth",), 1)
+    cache.put("b", ("Mars",), 2)
+    cache.get("a")
+    cache.put("c", ("Venus",), 3)
+    assert len(cache) == 2
+    assert "b" not in cache and cache.get("a") == 1
+    # Evicted results no longer count as dependents
+    assert cache.invalidate({"Mars"}) == 0
+
+
+def test_poll_reloads_changes_and_keeps_bodies_on_errors(config_copy):
+    watcher = ConfigWatcher(config_copy, cf.load_from_json)
+    assert watcher.poll() == set()
+
+    edit(config_copy, lambda data: planet(data, "Mars").update(mass=0.2))
+    assert watcher.poll() == {"Mars"}
+    assert watcher.version == 1
+    assert next(body for body in watcher.planets if body.name == "Mars").mass == 0.2
+
+    with open(config_copy) as file:
+        saved = file.read()
+    # A file saved half-way through an edit
+    with open(config_copy, "w") as file:
+        file.write(saved[:len(saved) // 2])
+    planets = watcher.planets
+    assert watcher.poll() == set()
+    assert watcher.error is not None
+    assert watcher.planets is planets and watcher.version == 1
+
+    with open(config_copy, "w") as file:
+        file.write(saved)
+    assert watcher.poll() == set()
+    assert watcher.error is None and watcher.version == 2
+
+
+def test_service_drops_only_stale_results(config_copy):
+    service = QueryService(config_copy, workers=0)
+    try:
+        asyncio.run(service.dispatch("GET", "/distance?origin=Earth&destination=Mars"))
+        asyncio.run(service.dispatch("GET", "/distance?origin=Venus&destination=Jupiter"))
+        edit(config_copy, lambda data: planet(data, "Mars").update(radius=0.6))
+        assert service.reload() == {"Mars"}
+        assert service.stats["invalidated"] == 1
+        assert service.stats["cached"] == 1
+    finally:
+        service.close()
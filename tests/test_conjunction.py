@@ -0,0 +1,93 @@
+import numpy as np
+import pytest
+
+import Config as cf
+from lib import Epoch
+from lib.Catalog import Catalog, PLANET_TYPES
+from lib.Conjunction import closest_approach_by_system, closest_approach_matrix
+from lib.EllipticalOrbit import ORBITAL_ELEMENTS
+from lib.EphemerisCache import EphemerisCache
+from lib.PlanetType import PlanetType
+
+NAMES = ["Mercury", "Venus", "Earth", "Mars", "Jupiter", "Moon"]
+START_DAY, START_YEAR, SPAN_DAYS = 10, 2025, 2000
+
+
+def test_matrix_matches_pairwise_search(planets):
+    bodies = [planets[name] for name in NAMES]
+    distances, days_of_year, years = closest_approach_matrix(bodies, START_DAY, START_YEAR, SPAN_DAYS, tolerance=1e-5,
+                                                             coarse_steps_per_orbit=256, candidates=1000)
+    assert np.isnan(np.diag(distances)).all()
+    np.testing.assert_array_equal(distances, distances.T)
+    for i, first in enumerate(bodies):
+        for j, second in enumerate(bodies[i + 1:], i + 1):
+            distance, (day, year) = first.find_closest_approach(second, START_DAY, START_YEAR, SPAN_DAYS, 1e-5, 256)
+            assert distances[i, j] == pytest.approx(distance, rel=1e-6, abs=1e-9)
+            assert float(first.get_separations(second, days_of_year[i, j], years[i, j])) == pytest.approx(distances[i, j])
+
+
+def test_matrix_keeps_the_best_candidate(planets):
+    bodies = [planets[name] for name in NAMES]
+    many = closest_approach_matrix(bodies, START_DAY, START_YEAR, SPAN_DAYS, candidates=50)
+    for candidates in (1, 3):
+        fewer = closest_approach_matrix(bodies, START_DAY, START_YEAR, SPAN_DAYS, candidates=candidates)
+        assert (np.nan_to_num(many[0]) <= np.nan_to_num(fewer[0]) + 1e-12).all()
+
+
+def test_matrix_with_workers_matches_serial(planets):
+    bodies = [planets[name] for name in NAMES]
+    serial = closest_approach_matrix(bodies, START_DAY, START_YEAR, SPAN_DAYS)
+    pooled = closest_approach_matrix(bodies, START_DAY, START_YEAR, SPAN_DAYS, workers=2)
+    for expected, actual in zip(serial, pooled):
+        np.testing.assert_array_equal(actual, expected)
+
+
+def test_matrix_times_are_inside_the_window(planets):
+    bodies = [planets[name] for name in NAMES]
+    _, days_of_year, years = closest_approach_matrix(bodies, START_DAY, START_YEAR, SPAN_DAYS)
+    days = Epoch.to_days(days_of_year, years)
+    start = Epoch.to_days(START_DAY, START_YEAR)
+    off_diagonal = ~np.eye(len(bodies), dtype=bool)
+    assert ((days[off_diagonal] >= start) & (days[off_diagonal] <= start + SPAN_DAYS)).all()
+
+
+def test_systems_are_searched_separately(two_systems_path):
+    _, planets = cf.load_from_json(two_systems_path)
+    results = closest_approach_by_system(planets, START_DAY, START_YEAR, 400)
+    assert list(results) == ["Sol", "Proxima"]
+    for star, (names, distances, days_of_year, years) in results.items():
+        bodies = [planet for planet in planets if planet.star.name == star]
+        assert list(names) == [planet.name for planet in bodies]
+        expected = closest_approach_matrix(bodies, START_DAY, START_YEAR, 400)
+        for actual, wanted in zip((distances, days_of_year, years), expected):
+            np.testing.assert_array_equal(actual, wanted)
+
+    with pytest.raises(ValueError):
+        closest_approach_matrix(planets, START_DAY, START_YEAR, 400)
+
+
+def test_pairs_without_a_minimum_match_the_pairwise_search(planets):
+    # A body on Earth's orbit, and one half a period behind on a circular orbit of the same size
+    earth = planets["Earth"]
+    columns = {name: np.array([value, value, value]) for name, value in zip(ORBITAL_ELEMENTS, earth.orbit.elements)}
+    columns["eccentricity"][2] = 0.0
+    columns["perihelion_day"][2] += earth.period / 2
+    columns.update(mass=np.ones(3), radius=np.ones(3), type=np.full(3, PLANET_TYPES.index(PlanetType.TERRESTRIAL)),
+                   star=np.zeros(3), parent=np.full(3, -1))
+    bodies = Catalog([earth.star], ["Earth", "Twin", "Opposite"], columns)
+
+    distances, days_of_year, years = closest_approach_matrix(bodies, START_DAY, START_YEAR, 400)
+    assert distances[0, 1] == 0.0
+    assert (days_of_year[0, 1], years[0, 1]) == (START_DAY, START_YEAR)
+    assert np.isfinite(distances[~np.eye(3, dtype=bool)]).all()
+    for i, j in ((0, 1), (0, 2), (1, 2)):
+        distance, _ = bodies[i].find_closest_approach(bodies[j], START_DAY, START_YEAR, 400)
+        assert distances[i, j] == pytest.approx(distance, abs=1e-9)
+
+
+def test_empty_catalog_gives_an_empty_matrix(config_path):
+    _, catalog = cf.load_catalog(config_path)
+    empty = catalog.select(np.zeros(len(catalog), dtype=bool))
+    for cache in (None, EphemerisCache()):
+        matrices = closest_approach_matrix(empty, START_DAY, START_YEAR, 400, cache=cache)
+        assert [matrix.shape for matrix in matrices] == [(0, 0)] * 3
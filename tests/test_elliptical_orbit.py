@@ -0,0 +1,32 @@
+import numpy as np
+import pytest
+
+from lib import Epoch
+
+DAYS = Epoch.to_days(1, 2025) + np.linspace(-20000, 20000, 401)
+
+
+@pytest.mark.parametrize("name", ["Mercury", "Earth", "Mars", "Neptune", "Moon"])
+def test_batch_distances_match_scalar_distances(planets, name):
+    orbit = planets[name].orbit
+    days_of_year, years = Epoch.from_days(DAYS)
+    batch = orbit.get_distances(days_of_year, years)
+    assert batch.shape == DAYS.shape
+    for day_of_year, year, distance in zip(days_of_year, years, batch):
+        assert orbit.get_distance(float(day_of_year), int(year)) == pytest.approx(distance, rel=1e-12)
+
+
+def test_batch_distances_broadcast(planets):
+    orbit = planets["Earth"].orbit
+    grid = orbit.get_distances(np.arange(0, 365, 73.0)[:, None], np.array([2024, 2025, 2026]))
+    assert grid.shape == (5, 3)
+    assert grid[2, 1] == pytest.approx(orbit.get_distance(146.0, 2025), rel=1e-12)
+
+
+def test_distances_stay_between_the_apsides(planets):
+    orbit = planets["Mercury"].orbit
+    distances = orbit.get_distances(*Epoch.from_days(DAYS))
+    assert distances.min() >= orbit.get_closest_approach()[2] - 1e-12
+    assert distances.max() <= orbit.get_farthest_approach()[2] + 1e-12
+    assert orbit.get_distance(orbit.perihelion_day, orbit.perihelion_year) == pytest.approx(
+        orbit.get_closest_approach()[2])
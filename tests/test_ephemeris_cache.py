@@ -0,0 +1,99 @@
+import time
+
+import numpy as np
+import pytest
+
+from lib import Epoch
+from lib.EphemerisCache import EphemerisCache, interpolation_error_bound
+
+START = float(Epoch.to_days(1, 2025))
+STOP = START + 800
+
+
+@pytest.mark.parametrize("name, step", [("Mercury", 2.0), ("Earth", 5.0), ("Mars", 1.0), ("Neptune", 50.0)])
+def test_interpolation_error_stays_within_the_bound(planets, name, step):
+    orbit = planets[name].orbit
+    cache = EphemerisCache()
+    days = np.linspace(START, STOP, 5001)
+    exact = orbit.get_positions(*Epoch.from_days(days))
+    error = np.linalg.norm(cache.get_positions(orbit, days, START, STOP, step) - exact, axis=-1)
+    bound = interpolation_error_bound(orbit, step)
+    assert error.max() <= bound
+    # The bound is tight enough to pick a step from
+    assert error.max() >= bound / 20
+
+
+def test_samples_are_exact(planets):
+    orbit = planets["Earth"].orbit
+    grid, table = EphemerisCache().get_table(orbit, START, STOP, 4.0)
+    np.testing.assert_allclose(EphemerisCache().get_positions(orbit, grid, START, STOP, 4.0), table, atol=1e-15)
+    np.testing.assert_array_equal(table, orbit.get_positions(*Epoch.from_days(grid)))
+
+
+def test_least_recently_used_tables_are_evicted(planets):
+    cache = EphemerisCache(max_entries=2)
+    earth, mars, venus = planets["Earth"].orbit, planets["Mars"].orbit, planets["Venus"].orbit
+    cache.get_table(earth, START, STOP, 4.0)
+    cache.get_table(mars, START, STOP, 4.0)
+    cache.get_table(earth, START, STOP, 4.0)
+    cache.get_table(venus, START, STOP, 4.0)
+    assert len(cache) == 2
+    assert (cache.hits, cache.misses) == (1, 3)
+
+    cache.get_table(earth, START, STOP, 4.0)
+    cache.get_table(mars, START, STOP, 4.0)
+    assert (cache.hits, cache.misses) == (2, 4)
+
+
+def test_tables_persist_across_caches(planets, tmp_path, config_path):
+    orbit = planets["Mars"].orbit
+    cold = EphemerisCache(cache_dir=tmp_path, config_path=config_path)
+    _, table = cold.get_table(orbit, START, STOP, 4.0)
+    assert cold.misses == 1
+
+    warm = EphemerisCache(cache_dir=tmp_path, config_path=config_path)
+    _, loaded = warm.get_table(orbit, START, STOP, 4.0)
+    assert (warm.hits, warm.misses) == (1, 0)
+    np.testing.assert_array_equal(loaded, table)
+
+    other = EphemerisCache(cache_dir=tmp_path)
+    other.get_table(orbit, START, STOP, 4.0)
+    assert other.misses == 1
+
+
+
+def use(cache, orbit):
+    cache.get_table(orbit, START, STOP, 4.0)
+    # Tables are ordered by modification time, which coarse file system clocks could tie
+    time.sleep(0.02)
+
+
+def test_persisted_tables_stay_within_the_disk_bound(planets, tmp_path, config_path):
+    mercury, venus, earth, mars = (planets[name].orbit for name in ("Mercury", "Venus", "Earth", "Mars"))
+    # Room for two tables with their .npy headers
+    bound = 2 * EphemerisCache().get_table(mercury, START, STOP, 4.0)[1].nbytes + 512
+    cache = EphemerisCache(cache_dir=tmp_path, config_path=config_path, max_disk_bytes=bound)
+    for orbit in (mercury, venus, earth):
+        use(cache, orbit)
+    assert len(list(tmp_path.rglob("*.npy"))) == 2
+
+    # The least recently used table goes first, and a disk hit counts as a use
+    warm = EphemerisCache(cache_dir=tmp_path, config_path=config_path, max_disk_bytes=bound)
+    use(warm, venus)
+    use(warm, mars)
+    assert (warm.hits, warm.misses) == (1, 1)
+    warm.clear()
+    use(warm, venus)
+    use(warm, earth)
+    assert (warm.hits, warm.misses) == (2, 2)
+
+
+def test_tables_of_other_configurations_are_pruned_first(planets, tmp_path, config_path):
+    orbit = planets["Earth"].orbit
+    use(EphemerisCache(cache_dir=tmp_path), orbit)
+    table_bytes = next(tmp_path.rglob("*.npy")).stat().st_size
+
+    current = EphemerisCache(cache_dir=tmp_path, config_path=config_path, max_disk_bytes=table_bytes)
+    use(current, orbit)
+    assert [str(path.parent) for path in tmp_path.rglob("*.npy")] == [current.directory]
+    assert [str(path) for path in tmp_path.iterdir()] == [current.directory]
@@ -0,0 +1,85 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from lib import Epoch
+from lib.EventType import EventType
+from lib.Catalog import Catalog, PLANET_TYPES
+from lib.Events import apsis_events, close_approach_events, event_stream
+from lib.PlanetType import PlanetType
+
+
+def test_moon_apsides_are_relative_to_the_parent(planets):
+    moon = planets["Moon"]
+    events = list(apsis_events(moon, 740000, 740000 + moon.orbit.period))
+    assert [event_type for _, event_type, _, _ in events].count(EventType.PERIHELION) >= 1
+    for _, event_type, _, distance in events:
+        expected = 1 - moon.orbit.eccentricity if event_type is EventType.PERIHELION else 1 + moon.orbit.eccentricity
+        assert distance == pytest.approx(moon.orbit.semi_major_axis * expected)
+        assert distance < 0.01
+
+
+@pytest.mark.parametrize("window_days", [3.0, 7.3, 50.0, 400.0])
+def test_close_approaches_do_not_depend_on_the_window(planets, window_days):
+    earth, venus = planets["Earth"], planets["Venus"]
+    start = 740000.0
+    whole = list(close_approach_events(earth, venus, start, 2.0, start + 3000, window_days=1e6))
+    windowed = list(close_approach_events(earth, venus, start, 2.0, start + 3000, window_days=window_days))
+    assert windowed == whole
+    assert len(whole) >= 4
+    endless = close_approach_events(earth, venus, start, 2.0, window_days=window_days)
+    assert list(itertools.islice(endless, len(whole))) == whole
+
+
+def test_close_approaches_match_a_dense_scan(planets):
+    earth, venus = planets["Earth"], planets["Venus"]
+    start, stop = 740000.0, 743000.0
+    events = list(close_approach_events(earth, venus, start, 2.0, stop, window_days=20.0, tolerance=1e-5))
+
+    days = np.arange(start, stop, 0.05)
+    separations = earth.get_separations(venus, *Epoch.from_days(days))
+    rows = np.flatnonzero((separations[1:-1] < separations[:-2]) & (separations[1:-1] < separations[2:])) + 1
+    assert [event[0] for event in events] == pytest.approx(days[rows].tolist(), abs=0.1)
+    for (_, _, names, distance), row in zip(events, rows):
+        assert names == ("Earth", "Venus")
+        assert distance <= separations[row] + 1e-12
+
+
+def test_pair_that_never_approaches_does_not_stall_the_stream(planets):
+    # Two circular 1 AU orbits half a period apart: radial ranges overlap, separation stays 2 AU
+    columns = {
+        "mass": np.ones(2),
+        "radius": np.ones(2),
+        "type": np.full(2, PLANET_TYPES.index(PlanetType.TERRESTRIAL)),
+        "star": np.zeros(2),
+        "parent": np.full(2, -1),
+        "eccentricity": np.zeros(2),
+        "semi_major_axis": np.ones(2),
+        "perihelion_day": np.array([1.0, 183.5]),
+        "perihelion_year": np.full(2, 2024),
+        "period": np.full(2, 365.0),
+        "inclination": np.zeros(2),
+        "ascending_node": np.zeros(2),
+        "argument_of_perihelion": np.zeros(2),
+    }
+    bodies = list(Catalog([planets["Earth"].star], ["Leading", "Trailing"], columns))
+    events = list(itertools.islice(event_stream(bodies, 1, 2025, approach_threshold=0.1), 3))
+    assert len(events) == 3
+    assert {event_type for _, event_type, _, _ in events} <= {EventType.PERIHELION, EventType.APHELION}
+    assert [days for days, _, _, _ in events] == sorted(days for days, _, _, _ in events)
+
+    # With a horizon the stream ends, and the pair still contributes nothing
+    bounded = list(event_stream(bodies, 1, 2025, horizon_days=2000, approach_threshold=0.1))
+    assert all(event_type is not EventType.CLOSE_APPROACH for _, event_type, _, _ in bounded)
+
+
+def test_stream_matches_the_pairwise_generators(planets):
+    bodies = [planets["Earth"], planets["Venus"], planets["Mars"]]
+    start = float(Epoch.to_days(1, 2025))
+    stream = [event for event in event_stream(bodies, 1, 2025, 2000, approach_threshold=1.0)
+              if event[1] is EventType.CLOSE_APPROACH]
+    expected = sorted((event for first, second in itertools.combinations(bodies, 2)
+                       for event in close_approach_events(first, second, start, 1.0, start + 2000)),
+                      key=lambda event: event[0])
+    assert stream == expected
@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+
+import Config as cf
+from lib import Epoch
+from lib.FlightSimulator import ERROR_WEIGHTS, SOLUTION_WEIGHTS, STAGE_NODES, simulate_flights
+
+LAUNCH = Epoch.to_days(1, 2025)
+
+
+def test_torch_drive_arrives_within_fuel(planets):
+    result = simulate_flights(planets["Earth"], [planets["Mars"], planets["Moon"]], LAUNCH, 200000, 15500, 0.3,
+                              isp_s=1e6, max_days=60)
+    assert result["arrived"].all()
+    assert (result["final_distance_km"] <= 10000).all()
+    assert (result["final_speed_km_s"] <= 1.0).all()
+    assert (result["fuel_used_kg"] > 0).all() and (result["fuel_used_kg"] <= 200000).all()
+    assert result["flight_time_days"][1] < result["flight_time_days"][0]
+
+
+def test_ships_do_not_depend_on_their_batch(planets):
+    launches = LAUNCH + np.array([0.0, 40.0, 90.0])
+    batch = simulate_flights(planets["Earth"], planets["Venus"], launches, 200000, 15500, 0.3, isp_s=1e6, max_days=60)
+    for k, launch in enumerate(launches):
+        single = simulate_flights(planets["Earth"], planets["Venus"], launch, 200000, 15500, 0.3, isp_s=1e6,
+                                  max_days=60)
+        for name, column in batch.items():
+            np.testing.assert_array_equal(column[k], single[name][0])
+
+
+def test_empty_tank_does_not_arrive(planets):
+    result = simulate_flights(planets["Earth"], planets["Jupiter"], LAUNCH, 100, 15500, 0.3, max_days=30)
+    assert not result["arrived"][0]
+    assert result["final_mass_kg"][0] >= 15500
+    assert np.isnan(result["arrival_days"][0])
+
+
+def test_tableau_is_third_order():
+    nodes = (0.0,) + STAGE_NODES
+    assert sum(SOLUTION_WEIGHTS) == pytest.approx(1)
+    assert sum(b * c for b, c in zip(SOLUTION_WEIGHTS, nodes)) == pytest.approx(1 / 2)
+    assert sum(b * c**2 for b, c in zip(SOLUTION_WEIGHTS, nodes)) == pytest.approx(1 / 3)
+    # Only the third stage depends on another one: a32 = c3, at the second node
+    assert SOLUTION_WEIGHTS[2] * STAGE_NODES[1] * STAGE_NODES[0] == pytest.approx(1 / 6)
+    # The embedded second-order solution reuses the first stage of the next step
+    assert sum(ERROR_WEIGHTS) == pytest.approx(0)
+
+
+def test_coasting_flight_converges_with_tolerance(planets):
+    tolerances = (100.0, 10.0, 1.0, 0.01)
+    runs = [simulate_flights(planets["Earth"], planets["Mars"], LAUNCH, 0.0, 15500, 0.0, tolerance_km=tolerance,
+                             max_days=200) for tolerance in tolerances]
+    reference = runs[-1]["final_distance_km"][0]
+    errors = [abs(run["final_distance_km"][0] - reference) for run in runs[:-1]]
+    assert errors[0] > errors[1] > errors[2]
+    steps = [run["steps"][0] for run in runs]
+    # Third order: a tenth of the tolerance costs about 10 ** (1 / 3) times the steps
+    for fewer, more in zip(steps[:2], steps[1:3]):
+        assert 1.7 < more / fewer < 2.7
+
+
+def test_flights_stay_within_one_star_system(two_systems_path):
+    _, bodies = cf.load_from_json(two_systems_path)
+    bodies = {body.name: body for body in bodies}
+    with pytest.raises(ValueError):
+        simulate_flights(bodies["Earth"], [bodies["Mars"], bodies["Proxima b"]], LAUNCH, 200000, 15500, 0.3,
+                         max_days=1)
+    result = simulate_flights(bodies["Proxima b"], bodies["Proxima c"], LAUNCH, 200000, 15500, 0.3, max_days=1)
+    assert result["steps"][0] > 0
@@ -0,0 +1,44 @@
+import numpy as np
+
+import Config as cf
+from lib import Instrumentation
+from lib.Propagator import Propagator
+
+
+def test_planet_methods_count_epochs_per_body(planets):
+    with Instrumentation.capture() as query:
+        planets["Moon"].get_orbital_positions(np.arange(5.0), 2025)
+    # A moon evaluates its parent at the same epochs
+    assert query.counters["orbit_evaluations"] == {"Moon": 5, "Earth": 5}
+    assert query.counters["kernel_evaluations"]["orbital_positions"] == 10
+
+
+def test_catalog_paths_count_per_row(config_path):
+    _, catalog = cf.load_catalog(config_path)
+    moon = catalog.find("Moon").index
+    with Instrumentation.capture() as query:
+        catalog.get_positions(np.arange(4.0), 2025)
+    assert query.counters["orbit_evaluations"] == {name: 4 for name in catalog.names}
+
+    with Instrumentation.capture() as query:
+        catalog.get_body_positions(np.array([0, moon, moon]), 10, 2025)
+    assert query.counters["orbit_evaluations"] == {catalog.names[0]: 1, "Moon": 2, "Earth": 2}
+
+
+def test_propagator_counts_per_row(config_path):
+    _, catalog = cf.load_catalog(config_path)
+    propagator = Propagator(catalog, 10, 2025)
+    with Instrumentation.capture() as query:
+        propagator.advance(1.0)
+        propagator.advance(1.0)
+    assert query.counters["orbit_evaluations"] == {name: 2 for name in catalog.names}
+
+
+def test_counting_is_removed_after_capture(planets):
+    with Instrumentation.capture():
+        pass
+    assert not Instrumentation.enabled
+    with Instrumentation.capture() as query:
+        pass
+    planets["Earth"].get_orbital_positions(1, 2025)
+    assert query.counters == {}
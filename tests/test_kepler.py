@@ -0,0 +1,65 @@
+import math
+
+import numpy as np
+import pytest
+
+from lib import Epoch
+from lib.Kepler import solve_kepler, solve_kepler_scalar
+
+MEAN_ANOMALIES = np.linspace(-3 * math.pi, 3 * math.pi, 241)
+ECCENTRICITIES = np.array([0.0, 0.0167, 0.2056, 0.5, 0.9, 0.99])
+
+
+@pytest.mark.parametrize("method", ["newton", "halley"])
+def test_solution_satisfies_keplers_equation(method):
+    M, e = np.meshgrid(MEAN_ANOMALIES, ECCENTRICITIES)
+    E, iterations, max_residual = solve_kepler(M, e, method=method)
+    assert max_residual < 1e-12
+    assert iterations < 50
+    wrapped = np.remainder(M + math.pi, 2 * math.pi) - math.pi
+    np.testing.assert_allclose(E - e * np.sin(E), wrapped, atol=1e-12)
+
+
+def test_halley_converges_in_fewer_iterations():
+    M, e = np.meshgrid(MEAN_ANOMALIES, ECCENTRICITIES)
+    _, newton_iterations, _ = solve_kepler(M, e, method="newton")
+    E, halley_iterations, _ = solve_kepler(M, e, method="halley")
+    assert halley_iterations <= newton_iterations
+    np.testing.assert_allclose(E, solve_kepler(M, e)[0], atol=1e-12)
+
+
+def test_scalar_solver_matches_batch():
+    M, e = np.meshgrid(MEAN_ANOMALIES, ECCENTRICITIES)
+    E = solve_kepler(M, e)[0]
+    for mean_anomaly, eccentricity, expected in zip(M.ravel(), e.ravel(), E.ravel()):
+        # The two solvers may land on either side of +-pi, which is the same anomaly
+        difference = solve_kepler_scalar(float(mean_anomaly), float(eccentricity)) - expected
+        assert math.remainder(difference, 2 * math.pi) == pytest.approx(0.0, abs=1e-12)
+
+
+def test_solution_does_not_depend_on_the_batch():
+    M, e = np.meshgrid(MEAN_ANOMALIES, ECCENTRICITIES)
+    E = solve_kepler(M, e)[0]
+    np.testing.assert_array_equal(solve_kepler(M[2], e[2])[0], E[2])
+
+
+def test_warm_start_converges_to_the_same_anomaly():
+    M = MEAN_ANOMALIES
+    cold, cold_iterations, _ = solve_kepler(M, 0.5)
+    warm, warm_iterations, _ = solve_kepler(M + 0.01, 0.5, initial_guess=cold + 0.01)
+    np.testing.assert_allclose(warm, solve_kepler(M + 0.01, 0.5)[0], atol=1e-12)
+    assert warm_iterations <= cold_iterations
+
+
+def test_unknown_method_is_rejected():
+    with pytest.raises(ValueError):
+        solve_kepler(0.5, 0.1, method="bisection")
+
+
+def test_positions_lie_at_the_orbital_distance(planets):
+    days_of_year, years = Epoch.from_days(Epoch.to_days(1, 2025) + np.arange(0, 2000, 7.0))
+    for name in ("Mercury", "Earth", "Neptune"):
+        orbit = planets[name].orbit
+        positions = orbit.get_positions(days_of_year, years)
+        np.testing.assert_allclose(np.linalg.norm(positions, axis=-1), orbit.get_distances(days_of_year, years),
+                                   rtol=1e-12)
@@ -0,0 +1,89 @@
+import numpy as np
+import pytest
+
+from lib import Epoch
+from lib.EllipticalOrbit import EllipticalOrbit
+from lib.Lambert import lambert_transfers, solve_lambert, transfer_trade_study
+from lib.LaunchWindow import porkchop
+from lib.Planet import Planet
+from lib.PlanetType import PlanetType
+from lib.Rocket import AU_IN_KM, FUEL_EFFICIENCY, STANDARD_GRAVITY, fuel_for_burn_time, fuel_for_delta_v
+from lib.Star import Star
+from lib.StarType import StarType
+
+EARTH_GM_KM3_S2 = 398600
+LIQUID_EXHAUST_VELOCITY = FUEL_EFFICIENCY["liquid"] * STANDARD_GRAVITY
+
+
+def test_solve_lambert_matches_textbook_example():
+    # Curtis, Orbital Mechanics for Engineering Students, example 5.2
+    v1, v2, converged = solve_lambert(np.array([5000.0, 10000, 2100]), np.array([-14600.0, 2500, 7000]),
+                                      3600.0, EARTH_GM_KM3_S2, True)
+    assert converged
+    np.testing.assert_allclose(v1, [-5.9925, 1.9254, 3.2456], atol=1e-3)
+    np.testing.assert_allclose(v2, [-3.3125, -4.1966, -0.38529], atol=1e-3)
+
+
+def test_solve_lambert_batch_matches_single_solves():
+    r1 = np.array([[5000.0, 10000, 2100], [7000.0, 0, 0]])
+    r2 = np.array([[-14600.0, 2500, 7000], [0.0, 9000, 1000]])
+    time_of_flight = np.array([3600.0, 2500.0])
+    v1, v2, converged = solve_lambert(r1, r2, time_of_flight, EARTH_GM_KM3_S2, True)
+    for i in range(2):
+        single = solve_lambert(r1[i], r2[i], time_of_flight[i], EARTH_GM_KM3_S2, True)
+        np.testing.assert_array_equal(v1[i], single[0])
+        np.testing.assert_array_equal(v2[i], single[1])
+        assert converged[i] == single[2]
+
+
+def test_lambert_transfers_with_workers_matches_serial(planets):
+    departures = Epoch.to_days(2025, 1) + np.arange(0, 60, 10.0)
+    arrivals = departures[:, None] + np.array([150.0, 200, 250, 300])
+    serial = lambert_transfers(planets["Earth"], planets["Mars"], departures[:, None], arrivals)
+    pooled = lambert_transfers(planets["Earth"], planets["Mars"], departures[:, None], arrivals, workers=2,
+                               chunk_size=5)
+    for name, values in serial.items():
+        np.testing.assert_array_equal(pooled[name], values)
+    assert serial["converged"].all()
+
+
+def test_lambert_transfers_rejects_other_star_systems(planets):
+    star = Star("Proxima", 0.12, StarType.M)
+    planet = Planet("Proxima b", 1.07, 1.1, PlanetType.TERRESTRIAL, EllipticalOrbit(0.02, 0.0485, 1, 2024, 11.2, star))
+    with pytest.raises(ValueError):
+        lambert_transfers(planets["Earth"], planet, Epoch.to_days(2025, 1), Epoch.to_days(2025, 200))
+
+
+def test_trade_study_charges_both_ends_of_both_flights(planets):
+    departures = Epoch.to_days(2025, 1) + np.array([0.0, 30])
+    arrivals = Epoch.to_days(2025, 1) + np.array([200.0, 260, 320])
+    study = transfer_trade_study(planets["Earth"], planets["Mars"], departures, arrivals, sustained_accel=1e-6)
+
+    # The delta-v of both ballistic burns against the fuel of both torch burns
+    transfers = lambert_transfers(planets["Earth"], planets["Mars"], departures[:, None], arrivals[None, :])
+    np.testing.assert_allclose(study["ballistic_delta_v_km_s"],
+                               transfers["departure_delta_v_km_s"] + transfers["arrival_delta_v_km_s"])
+    ballistic_fuel = fuel_for_delta_v(study["ballistic_delta_v_km_s"] * 1000, 15500, LIQUID_EXHAUST_VELOCITY)
+    np.testing.assert_allclose(study["ballistic_fuel_kg"], ballistic_fuel)
+
+    distance_m = porkchop(planets["Earth"], planets["Mars"], departures, arrivals)["distance_au"] * AU_IN_KM * 1000
+    burn_time_s = 2 * np.sqrt(distance_m / (1e-6 * STANDARD_GRAVITY))
+    np.testing.assert_allclose(study["torch_fuel_kg"],
+                               fuel_for_burn_time(burn_time_s, 15500, 1e-6, LIQUID_EXHAUST_VELOCITY))
+
+
+def test_trade_study_fleet_matches_single_ships(planets):
+    departures = Epoch.to_days(2025, 1) + np.array([0.0, 30])
+    arrivals = Epoch.to_days(2025, 1) + np.array([200.0, 260, 320])
+    fuel = np.array([1e5, 2e5, 4e5])
+    study = transfer_trade_study(planets["Earth"], planets["Mars"], departures, arrivals, fuel_mass_kg=fuel,
+                                 sustained_accel=1e-6)
+    assert study["ballistic_delta_v_km_s"].shape == (2, 3)
+    for name in ("ballistic_fuel_kg", "ballistic_feasible", "torch_transit_days", "torch_fuel_kg", "torch_feasible"):
+        assert study[name].shape == (3, 2, 3)
+    for ship, fuel_mass_kg in enumerate(fuel):
+        single = transfer_trade_study(planets["Earth"], planets["Mars"], departures, arrivals,
+                                      fuel_mass_kg=fuel_mass_kg, sustained_accel=1e-6)
+        for name in ("ballistic_fuel_kg", "ballistic_feasible", "torch_transit_days", "torch_fuel_kg",
+                     "torch_feasible"):
+            np.testing.assert_array_equal(study[name][ship], single[name])
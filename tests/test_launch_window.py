@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+
+from lib import Epoch
+from lib.LaunchWindow import porkchop
+from lib.Rocket import SECONDS_PER_DAY, STANDARD_GRAVITY, mission_profile
+
+DEPARTURES = Epoch.to_days(1, 2026) + np.arange(0.0, 200.0, 20.0)
+ARRIVALS = Epoch.to_days(1, 2026) + np.arange(100.0, 600.0, 25.0)
+
+
+def test_fuel_covers_both_burns(planets):
+    grid = porkchop(planets["Earth"], planets["Mars"], DEPARTURES, ARRIVALS, fuel_mass_kg=1e6, sustained_accel=1e-6)
+    finite = np.isfinite(grid["fuel_kg"])
+    assert finite.any()
+
+    # A ship carrying exactly fuel_kg flies the brachistochrone: no coast, transit 2 * sqrt(d / a)
+    distance_m = grid["distance_au"][finite] * 149597870.7 * 1000
+    _, coast_days, _, total_days = mission_profile(distance_m, grid["fuel_kg"][finite], 15500, 1e-6,
+                                                   450 * STANDARD_GRAVITY)
+    np.testing.assert_allclose(coast_days, 0.0, atol=1e-9)
+    np.testing.assert_allclose(total_days, 2 * np.sqrt(distance_m / (1e-6 * STANDARD_GRAVITY)) / SECONDS_PER_DAY)
+
+
+def test_feasible_means_arrival_in_time(planets):
+    grid = porkchop(planets["Earth"], planets["Mars"], DEPARTURES, ARRIVALS)
+    window = ARRIVALS[None, :] - DEPARTURES[:, None]
+    assert np.all(grid["transit_days"][grid["feasible"]] <= window[grid["feasible"]])
+    assert not np.any(grid["feasible"] & (window <= 0))
+
+
+def test_workers_match_serial(planets):
+    serial = porkchop(planets["Earth"], planets["Mars"], DEPARTURES, ARRIVALS)
+    pooled = porkchop(planets["Earth"], planets["Mars"], DEPARTURES, ARRIVALS, workers=2, chunk_rows=3)
+    for name in ("distance_au", "transit_days", "fuel_kg", "feasible"):
+        np.testing.assert_array_equal(serial[name], pooled[name])
+
+
+def test_unknown_fuel_type(planets):
+    with pytest.raises(ValueError):
+        porkchop(planets["Earth"], planets["Mars"], DEPARTURES, ARRIVALS, fuel_type="nuclear")
@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+from lib import Epoch
+from lib.Queries import closest_query
+
+START_DAY, START_YEAR = 10, 2025
+
+
+def test_local_minima_match_a_dense_scan(planets):
+    earth, mars = planets["Earth"], planets["Mars"]
+    span_days = 3000
+    minima = earth.find_local_minima(mars, START_DAY, START_YEAR, span_days, tolerance=1e-4)
+
+    days = Epoch.to_days(START_DAY, START_YEAR) + np.arange(0, span_days, 0.05)
+    separations = earth.get_separations(mars, *Epoch.from_days(days))
+    # Either end of the window counts when the separation falls towards it
+    padded = np.concatenate([[np.inf], separations, [np.inf]])
+    rows = np.flatnonzero((padded[1:-1] < padded[:-2]) & (padded[1:-1] < padded[2:]))
+    assert len(minima) == rows.size
+    for (distance, (day, year)), row in zip(minima, rows):
+        assert Epoch.to_days(day, year) == pytest.approx(days[row], abs=0.05)
+        assert distance <= separations[row] + 1e-12
+
+
+def test_local_minima_with_workers_match_serial(planets):
+    serial = planets["Earth"].find_local_minima(planets["Neptune"], START_DAY, START_YEAR, 60000)
+    pooled = planets["Earth"].find_local_minima(planets["Neptune"], START_DAY, START_YEAR, 60000, workers=2)
+    assert pooled == serial
+
+
+def test_closest_distance_to_itself_is_zero(planets):
+    earth = planets["Earth"]
+    distance, (day, year) = earth.find_closest_distance(earth)
+    assert distance == 0.0
+    assert (day, year) == Epoch.today()
+
+
+def test_closest_query_without_minima_returns_the_start(planets):
+    result = closest_query(planets, "Earth", "Earth", START_DAY, START_YEAR, 100, 1e-3, 64)
+    assert result["distance_au"] == 0.0
+    assert (result["approach_day_of_year"], result["approach_year"]) == (START_DAY, START_YEAR)
+
+
+@pytest.mark.parametrize("shard_days", [1.0, 97.5, 5000.0])
+def test_shard_size_does_not_change_the_minima(planets, shard_days):
+    serial = planets["Earth"].find_local_minima(planets["Mars"], START_DAY, START_YEAR, 3000)
+    pooled = planets["Earth"].find_local_minima(planets["Mars"], START_DAY, START_YEAR, 3000, workers=2,
+                                                shard_days=shard_days)
+    assert pooled == serial
@@ -0,0 +1,38 @@
+import numpy as np
+
+import Config as cf
+from lib import Epoch
+from lib.Propagator import Propagator
+
+
+def test_incremental_steps_match_direct_positions(config_path):
+    _, catalog = cf.load_catalog(config_path)
+    propagator = Propagator(catalog, 1, 2025)
+    start = propagator.days
+    for step in (0.5, 1.0, 30.0, -45.0, 365.0):
+        positions = propagator.advance(step)
+        expected = catalog.get_positions(*Epoch.from_days(propagator.days))
+        np.testing.assert_allclose(positions, expected, atol=1e-12)
+        assert propagator.max_residual < 1e-12
+    assert propagator.days == start + 351.5
+
+
+def test_warm_start_needs_fewer_iterations(config_path):
+    _, catalog = cf.load_catalog(config_path)
+    warm = Propagator(catalog, 1, 2025)
+    warm.advance(0.1)
+    assert warm.iterations <= Propagator(catalog, *Epoch.from_days(warm.days)).iterations
+
+
+def test_planet_lists_keep_their_length(planets):
+    bodies = [planets["Moon"], planets["Mars"]]
+    propagator = Propagator(bodies, 1, 2025)
+    assert propagator.positions.shape == (2, 3)
+    np.testing.assert_allclose(propagator.positions[0], planets["Moon"].get_orbital_positions(1, 2025), atol=1e-12)
+
+
+def test_sampled_orbits_close_on_themselves(config_path):
+    _, catalog = cf.load_catalog(config_path)
+    paths = Propagator(catalog, 1, 2025).sample_orbits(64)
+    assert paths.shape == (len(catalog), 64, 3)
+    np.testing.assert_allclose(paths[:, 0], paths[:, -1], atol=1e-9)
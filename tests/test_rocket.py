@@ -0,0 +1,81 @@
+import math
+
+import numpy as np
+import pytest
+
+from lib.Rocket import (STANDARD_GRAVITY, SECONDS_PER_DAY, MissionCalculator, fuel_for_burn_time, mission_profile,
+                        sweep_missions)
+
+DISTANCE_M = 1e9
+DRY_MASS_KG = 15500
+ACCEL_G = 0.5
+# A chemical engine cannot fly a brachistochrone over this distance; use a torch drive's exhaust velocity
+EXHAUST_VELOCITY = 1e6
+
+
+def brachistochrone_fuel():
+    # Accelerate to the midpoint and decelerate from it: two burns of sqrt(d / a) each
+    half_burn_s = math.sqrt(DISTANCE_M / (ACCEL_G * STANDARD_GRAVITY))
+    return float(fuel_for_burn_time(2 * half_burn_s, DRY_MASS_KG, ACCEL_G, EXHAUST_VELOCITY)), half_burn_s
+
+
+def test_exact_brachistochrone_fuel_has_no_coast():
+    fuel, half_burn_s = brachistochrone_fuel()
+    burn_days, coast_days, peak_velocity, total_days = mission_profile(DISTANCE_M, fuel, DRY_MASS_KG, ACCEL_G,
+                                                                       EXHAUST_VELOCITY)
+    assert coast_days == pytest.approx(0.0, abs=1e-9)
+    assert burn_days == pytest.approx(half_burn_s / SECONDS_PER_DAY, rel=1e-9)
+    assert total_days == pytest.approx(2 * half_burn_s / SECONDS_PER_DAY, rel=1e-9)
+    assert peak_velocity == pytest.approx(ACCEL_G * STANDARD_GRAVITY * half_burn_s, rel=1e-9)
+
+
+def test_less_fuel_coasts_and_burns_only_the_tank():
+    fuel, _ = brachistochrone_fuel()
+    fuel *= 0.8
+    burn_days, coast_days, _, total_days = mission_profile(DISTANCE_M, fuel, DRY_MASS_KG, ACCEL_G, EXHAUST_VELOCITY)
+    assert coast_days > 0
+    assert total_days == pytest.approx(2 * burn_days + coast_days)
+
+    # Both burns together use exactly the fuel carried
+    mass_flow = (DRY_MASS_KG + fuel) * ACCEL_G * STANDARD_GRAVITY / EXHAUST_VELOCITY
+    assert 2 * burn_days * SECONDS_PER_DAY * mass_flow == pytest.approx(fuel)
+
+
+def test_profile_covers_the_distance():
+    fuel, _ = brachistochrone_fuel()
+    burn_days, coast_days, peak_velocity, _ = mission_profile(DISTANCE_M, 0.3 * fuel, DRY_MASS_KG, ACCEL_G,
+                                                              EXHAUST_VELOCITY)
+    burn_s, coast_s = burn_days * SECONDS_PER_DAY, coast_days * SECONDS_PER_DAY
+    covered = ACCEL_G * STANDARD_GRAVITY * burn_s**2 + peak_velocity * coast_s
+    assert covered == pytest.approx(DISTANCE_M)
+
+
+def test_scalars_and_arrays_agree():
+    fuels = np.array([1000.0, 5000.0, 50000.0])
+    vector = mission_profile(DISTANCE_M, fuels, DRY_MASS_KG, ACCEL_G, EXHAUST_VELOCITY)
+    for k, fuel in enumerate(fuels):
+        scalar = mission_profile(DISTANCE_M, float(fuel), DRY_MASS_KG, ACCEL_G, EXHAUST_VELOCITY)
+        assert np.allclose([value[k] for value in vector], scalar)
+
+
+def test_sweep_matches_single_missions():
+    sweep = sweep_missions([0.3, 0.524, 1.5], [8000, 2e5], 15500, [0.2, 1.0], grid=True)
+    assert sweep["total_time_days"].shape == (12,)
+    for row in range(12):
+        result = MissionCalculator(sweep["distance_au"][row], sweep["fuel_mass_kg"][row], sweep["dry_mass_kg"][row],
+                                   "liquid", sweep["sustained_acceleration_g"][row]).calculate_mission_time()
+        assert result["total_time_days"] == round(float(sweep["total_time_days"][row]), 1)
+        assert result["coasting_time_days"] == round(float(sweep["coasting_time_days"][row]), 1)
+        assert result["peak_velocity_km_s"] == round(float(sweep["peak_velocity_km_s"][row]), 1)
+
+
+def test_sweep_broadcasts_without_grid():
+    sweep = sweep_missions(np.array([[0.3], [1.5]]), 8000, 15500, np.array([0.2, 0.5, 1.0]))
+    assert sweep["total_time_days"].shape == (2, 3)
+    assert sweep["distance_au"][1, 2] == 1.5
+    assert sweep["sustained_acceleration_g"][1, 2] == 1.0
+
+
+def test_sweep_rejects_unknown_fuel():
+    with pytest.raises(ValueError):
+        sweep_missions(1.0, 8000, 15500, 0.5, fuel_type="nuclear")
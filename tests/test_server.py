@@ -0,0 +1,61 @@
+import asyncio
+
+import pytest
+
+from lib.Queries import closest_query
+from server import QueryService
+
+CLOSEST = "/closest?origin=Earth&destination=Mars&start_day=10&start_year=2025&span_days=800"
+
+
+@pytest.fixture
+def service(config_path):
+    service = QueryService(config_path, workers=0)
+    yield service
+    service.close()
+
+
+def test_identical_queries_are_computed_once(service, planets):
+    async def run():
+        return await asyncio.gather(*(service.dispatch("GET", CLOSEST) for _ in range(5)))
+
+    responses = asyncio.run(run())
+    expected = closest_query(planets, "Earth", "Mars", 10.0, 2025, 800.0, 1.0 / 1440, 64)
+    assert responses == [(200, expected)] * 5
+    assert service.stats["computed"] == 1
+    assert service.stats["coalesced"] == 4
+
+    # Equivalent parameters hit the cache
+    assert asyncio.run(service.dispatch("GET", CLOSEST + "&coarse_steps_per_orbit=64")) == (200, expected)
+    assert service.stats["hits"] == 1
+
+
+def test_errors_map_to_statuses(service):
+    assert asyncio.run(service.dispatch("POST", CLOSEST))[0] == 405
+    assert asyncio.run(service.dispatch("GET", "/nothing"))[0] == 404
+    status, body = asyncio.run(service.dispatch("GET", "/distance?origin=Earth&destination=Pluto"))
+    assert (status, body) == (400, {"error": "Unknown body Pluto."})
+
+
+def test_closest_to_itself_is_answered(service):
+    status, body = asyncio.run(service.dispatch("GET", "/closest?origin=Earth&destination=Earth&span_days=100"))
+    assert status == 200
+    assert body["distance_au"] == 0.0
+
+
+def test_bodies_and_systems(service):
+    assert asyncio.run(service.dispatch("GET", "/systems"))[1] == {"Sol": list(service.planets)}
+    assert asyncio.run(service.dispatch("GET", "/bodies?star=Sol"))[1] == {"bodies": list(service.planets)}
+    assert asyncio.run(service.dispatch("GET", "/bodies?star=Vega"))[0] == 400
+
+
+def test_queries_stay_inside_their_system(two_systems_path):
+    service = QueryService(two_systems_path, workers=0)
+    try:
+        assert asyncio.run(service.dispatch("GET", "/systems"))[1]["Proxima"] == ["Proxima b", "Proxima c", "Proxima c I"]
+        status, body = asyncio.run(service.dispatch("GET", "/distance?origin=Earth&destination=Proxima%20b"))
+        assert (status, body) == (400, {"error": "Earth and Proxima b are in different star systems."})
+        status, body = asyncio.run(service.dispatch("GET", "/closest?origin=Proxima%20b&destination=Proxima%20c&span_days=100"))
+        assert status == 200 and body["distance_au"] > 0
+    finally:
+        service.close()
@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+
+from lib.Catalog import Catalog, PLANET_TYPES
+from lib.PlanetType import PlanetType
+from lib.SpatialIndex import SpatialIndex
+
+
+@pytest.fixture(scope="module")
+def belt(planets):
+    # Main-belt-like orbits around the configured star
+    rng = np.random.default_rng(7)
+    count = 2000
+    semi_major_axis = rng.uniform(2.0, 3.3, count)
+    columns = {
+        "mass": np.full(count, 1e-9),
+        "radius": np.full(count, 0.001),
+        "type": np.full(count, PLANET_TYPES.index(PlanetType.DWARF_PLANET)),
+        "star": np.zeros(count),
+        "parent": np.full(count, -1),
+        "eccentricity": rng.uniform(0.0, 0.3, count),
+        "semi_major_axis": semi_major_axis,
+        "perihelion_day": rng.uniform(0, 365, count),
+        "perihelion_year": np.full(count, 2024),
+        "period": 365.25 * semi_major_axis**1.5,
+        "inclination": rng.uniform(0, 20, count),
+        "ascending_node": rng.uniform(0, 360, count),
+        "argument_of_perihelion": rng.uniform(0, 360, count),
+    }
+    return Catalog([planets["Earth"].star], [f"Body{i}" for i in range(count)], columns)
+
+
+def brute_force(positions, point, radius=np.inf):
+    distances = np.linalg.norm(positions - point, axis=-1)
+    order = np.argsort(distances)
+    return order[distances[order] <= radius], distances[order][distances[order] <= radius]
+
+
+@pytest.mark.parametrize("cell_size", [0.05, 0.25, 2.0])
+def test_queries_match_brute_force(belt, cell_size):
+    index = SpatialIndex(belt, 1, 2025, cell_size)
+    rng = np.random.default_rng(1)
+    for point in rng.uniform(-3.5, 3.5, (10, 3)) * [1, 1, 0.2]:
+        for radius in (0.1, 0.5, 2.0):
+            indices, distances = index.within(point, radius)
+            expected_indices, expected_distances = brute_force(index.positions, point, radius)
+            np.testing.assert_array_equal(np.sort(indices), np.sort(expected_indices))
+            np.testing.assert_allclose(distances, expected_distances)
+        for k in (1, 5, 50):
+            indices, distances = index.nearest(point, k)
+            np.testing.assert_allclose(distances, brute_force(index.positions, point)[1][:k])
+
+
+def test_advancing_matches_a_fresh_index(belt):
+    index = SpatialIndex(belt, 1, 2025, 0.1)
+    moved = index.advance(1.0)
+    assert 0 < moved < len(index)
+    fresh = SpatialIndex(belt, 2, 2025, 0.1)
+    np.testing.assert_allclose(index.positions, fresh.positions, atol=1e-12)
+    point = index.positions[0]
+    np.testing.assert_array_equal(np.sort(index.within(point, 0.3)[0]), np.sort(fresh.within(point, 0.3)[0]))
+    assert 0 not in index.within_body(0, 0.3)[0]
+
+
+def test_nearest_never_returns_more_than_the_catalog(planets):
+    bodies = [planets["Earth"], planets["Mars"]]
+    indices, distances = SpatialIndex(bodies, 1, 2025).nearest([0.0, 0.0, 0.0], k=5)
+    assert indices.size == 2
+    assert distances[0] <= distances[1]
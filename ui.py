@@ -1,8 +1,9 @@
 import sys
 
 import pygame
+from Config import load_from_json
 from lib import PlanetType, EllipticalOrbit, Planet
-import Config as cf
+from lib.ConfigWatcher import ConfigWatcher, ResultCache
 
 # New variables and constants for the destination click behavior
 AU_TO_KM = 149597870.7
@@ -17,11 +18,52 @@ drag_line_y = None
 screen_radius = 1130
 planet_radius = 14
 
+# Render resources and expensive results, created once and reused across frames
+icon_cache = {}
+font_cache = {}
+pair_distance_cache = ResultCache()
+
+# How often (in ms) the configuration file is checked for edits
+CONFIG_POLL_MS = 1000
+
+def get_icon(path, size):
+    key = (path, size)
+    if key not in icon_cache:
+        icon_cache[key] = pygame.transform.scale(pygame.image.load(path).convert_alpha(), size)
+    return icon_cache[key]
+
+def get_font(size):
+    if size not in font_cache:
+        font_cache[size] = pygame.font.SysFont(None, size)
+    return font_cache[size]
+
+def get_pair_distance(origin_index, destination_index):
+    origin, destination = planets[origin_index], planets[destination_index]
+    key = (origin.name, destination.name)
+    if key not in pair_distance_cache:
+        pair_distance_cache.put(key, key, origin.find_closest_distance(destination))
+    return pair_distance_cache.get(key)
+
+def reload_planets():
+    global planets
+    changed = watcher.poll()
+    if changed:
+        # The schematic layout keeps its slots; each slot picks up its body's new orbit
+        reloaded = {p.name: p for p in watcher.planets}
+        planets = [reloaded.get(p.name, p) for p in planets]
+        pair_distance_cache.invalidate(changed)
+
+def draw_frame_stats(surface, clock):
+    fps = clock.get_fps()
+    frame_ms = clock.get_rawtime()
+    text_surface = get_font(20).render(f"{fps:5.1f} FPS  {frame_ms:3d} ms", True, (200, 200, 200))
+    surface.blit(text_surface, (10, 10))
+
 # Define the Clear button drawing and event handling functions
 def draw_clear_button(surface):
     button_rect = pygame.Rect(surface.get_width() - 110, 10, 100, 40)
     pygame.draw.rect(surface, (200, 200, 200), button_rect)
-    font = pygame.font.SysFont(None, 24)
+    font = get_font(24)
     text_surface = font.render("Clear", True, (0, 0, 0))
     text_rect = text_surface.get_rect(center=button_rect.center)
     surface.blit(text_surface, text_rect)
@@ -35,7 +77,8 @@ def handle_clear_button_event(event, button_rect):
         drag_start_x = None
         drag_line_y = None
 
-stars, planets = cf.load_from_json("./config/solarsystem.json")
+watcher = ConfigWatcher("./config/solarsystem.json", load_from_json)
+stars, planets = watcher.stars, watcher.planets
 mercury = [p for p in planets if p.name == "Mercury"][0].get_farthest_approach()[2] * 1 
 venus = [p for p in planets if p.name == "Venus"][0].get_farthest_approach()[2] * 2 
 earth = [p for p in planets if p.name == "Earth"][0].get_farthest_approach()[2] * 3 
@@ -78,10 +121,19 @@ green = (0, 255, 0)
 circle_radius = 10
 # circle_pos = (width // 2, height // 2)
 circle_pos = (0, height // 2)
+# Icons are loaded and scaled once, not every frame
+planet_images = [get_icon(icon, (int(plant_radii[i] * 2), int(plant_radii[i] * 2))) for i, icon in enumerate(icons)]
+clock = pygame.time.Clock()
+last_config_poll = 0
+
 # button_rect will be computed each frame
 # Main loop
 running = True
 while running:
+    clock.tick()
+    if pygame.time.get_ticks() - last_config_poll >= CONFIG_POLL_MS:
+        last_config_poll = pygame.time.get_ticks()
+        reload_planets()
     button_rect = pygame.Rect(screen.get_width() - 110, 10, 100, 40)
     for event in pygame.event.get():
         if event.type == pygame.QUIT:
@@ -93,8 +145,6 @@ while running:
     pygame.draw.circle(screen, yellow, circle_pos, circle_radius)
     
     # First, draw all planet images and store their positions
-    planet_images = [pygame.transform.scale(pygame.image.load(icon), (int(plant_radii[i] * 2), int(plant_radii[i] * 2)))
-                     for i, icon in enumerate(icons)]
     planet_positions = []
     for i, distance in enumerate(planets_distances):
         x = distance + (circle_radius + 5) - plant_radii[i]
@@ -103,7 +153,7 @@ while running:
         screen.blit(planet_images[i], (x, y))
 
     mouse_pos = pygame.mouse.get_pos()
-    font = pygame.font.SysFont(None, 24)
+    font = get_font(24)
     for i, (x, y) in enumerate(planet_positions):
         rect = pygame.Rect(x, y, int(plant_radii[i] * 2), int(plant_radii[i] * 2))
         if rect.collidepoint(mouse_pos):
@@ -148,14 +198,15 @@ while running:
         # If destination planet is selected, add distance text in white at the middle of the red line.
         if destination_planet_index is not None:
             # Calculate the closest distance in AU, convert to km using AU_TO_KM.
-            distance_au = planets[selected_planet_index].find_closest_distance(planets[destination_planet_index])
-            distance_km = int(distance_au[0]) * AU_TO_KM
+            distance_au = get_pair_distance(selected_planet_index, destination_planet_index)
+            distance_km = distance_au[0] * AU_TO_KM
             distance_text = f"{distance_km:,.0f} km"
             text_surface = font.render(distance_text, True, (255, 255, 255))
             mid_x = (drag_start_x + end_x) // 2
             mid_y = drag_line_y - text_surface.get_height() - 5
             screen.blit(text_surface, (mid_x, mid_y))
 
+    draw_frame_stats(screen, clock)
     pygame.display.flip()
 
 pygame.quit()